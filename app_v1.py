@@ -1,10 +1,17 @@
 import pandas as pd
 import streamlit as st
 import logging
-from typing import List, Optional
+import os
+import time
+import uuid
+from typing import Optional
 from src.recipe_app.recipe_app import RecipeApp
 from src.app_manager.app_manager import AppManager
-from src.FindingCloseRecipes.run_recipe_finder import run_recipe_finder  # Import de la fonction pour la recherche de recettes proches
+from src.FindingCloseRecipes.search_executor import RecipeSearchExecutor, get_search_executor, get_text_search_executor
+from src.FindingCloseRecipes.config import COMBINED_WEIGHTS, TOP_N
+from src.app_manager.image_cache import get_default_image_cache
+from src.DataPreprocess.contributor_cube import ContributorCube
+from src.monitoring.metrics import METRICS_FILE, METRICS_PORT_ENV, get_registry, start_metrics_server, timed
 
 # Configurer les loggers
 logging.basicConfig(level=logging.DEBUG, filename='logs/debug.log', filemode='w',
@@ -14,6 +21,11 @@ error_handler = logging.FileHandler('logs/error.log')
 error_handler.setLevel(logging.ERROR)
 error_logger.addHandler(error_handler)
 
+# Matrice contributeur x ingrédient du tableau de bord : ingrédients bruts (id_ingredients_*.csv) des recettes
+# de base_light_V3.csv. Distincte de split_datasets/contributor_ingredients.npz du prétraitement, qui compte
+# les catégories d'ingrédients (après map_ingredients) des recettes conservées par le nettoyage.
+CONTRIBUTOR_INGREDIENTS_FILE = 'data/dashboard_contributor_ingredients.npz'
+
 class RecipeDashboard:
     def __init__(self):
         """
@@ -22,9 +34,27 @@ class RecipeDashboard:
         self.merged_clean_df: Optional[pd.DataFrame] = None
         self.ingredients_part1: Optional[pd.DataFrame] = None
         self.ingredients_part2: Optional[pd.DataFrame] = None
+        self.contributor_ingredients: Optional[ContributorCube] = None
         self.manager = AppManager()
+        self.setup_metrics()
         self.load_data()
 
+    @staticmethod
+    def setup_metrics():
+        """
+        Enregistre les collecteurs des caches partagés et démarre, si la variable d'environnement
+        RECIPE_METRICS_PORT est définie, le point d'accès HTTP local /metrics (format Prometheus).
+        """
+        registry = get_registry()
+        registry.register_collector("app_image_cache", get_default_image_cache().stats)
+        port = os.environ.get(METRICS_PORT_ENV)
+        if port:
+            try:
+                start_metrics_server(int(port))
+            except (OSError, ValueError) as e:
+                error_logger.error(f"Erreur lors du démarrage du point d'accès des métriques : {e}")
+
+    @timed("app_data_load_seconds", dataset="dashboard")
     def load_data(self):
         """
         Charge les datasets nécessaires pour l'application.
@@ -33,12 +63,34 @@ class RecipeDashboard:
             self.merged_clean_df = pd.read_csv('data/base_light_V3.csv', low_memory=False)
             self.ingredients_part1 = pd.read_csv('data/id_ingredients_up_to_207226.csv', low_memory=False)
             self.ingredients_part2 = pd.read_csv('data/id_ingredients_up_to_537716.csv', low_memory=False)
+            self.contributor_ingredients = self.load_contributor_ingredients()
             logging.info("Les données ont été chargées avec succès.")
         except Exception as e:
             error_logger.error(f"Erreur lors du chargement des données : {e}")
             st.error(f"Erreur lors du chargement des données : {e}")
             st.stop()
 
+    def load_contributor_ingredients(self) -> ContributorCube:
+        """
+        Charge la matrice contributeur x ingrédient pré-agrégée du tableau de bord. Au premier lancement,
+        elle est construite une fois à partir des données chargées (ingrédients bruts des recettes
+        de base_light_V3.csv), puis sauvegardée.
+
+        Returns:
+            ContributorCube: Nombres d'occurrences des ingrédients dans les recettes de chaque contributeur.
+        """
+        if os.path.exists(CONTRIBUTOR_INGREDIENTS_FILE):
+            return ContributorCube.load(CONTRIBUTOR_INGREDIENTS_FILE)
+        ingredients = pd.concat([self.ingredients_part1, self.ingredients_part2])
+        recipes = pd.merge(self.merged_clean_df[['id', 'contributor_id']].drop_duplicates('id'),
+                           ingredients[['id', 'ingredients']], on='id', how='inner')
+        cube = ContributorCube.from_recipes(recipes, 'ingredients')
+        try:
+            cube.save(CONTRIBUTOR_INGREDIENTS_FILE)
+        except OSError as e:
+            error_logger.error(f"Erreur lors de la sauvegarde des statistiques des contributeurs : {e}")
+        return cube
+
     def add_custom_styles(self):
         """
         Ajoute des styles personnalisés à l'application Streamlit.
@@ -164,8 +216,8 @@ class RecipeDashboard:
             st.subheader(f"Recettes pour le contributor_id {contributor_id} (max 20 recettes)")
             st.dataframe(display_data)
 
-            all_ingredients = merged_data['ingredients'].apply(eval).explode()
-            ingredient_counts = all_ingredients.value_counts().head(10).reset_index()
+            # Agrégats pré-calculés sur toutes les recettes du contributeur
+            ingredient_counts = self.contributor_ingredients.top_k(contributor_id, k=10)
             ingredient_counts.columns = ['Ingredient', 'Count']
 
             st.subheader(f"Top 10 des ingrédients les plus utilisés par {contributor_id}")
@@ -175,6 +227,80 @@ class RecipeDashboard:
             error_logger.error(f"Erreur lors de l'affichage des données du contributeur : {e}")
             st.error("Une erreur s'est produite lors de l'affichage des données du contributeur.")
 
+    def display_similarity_sliders(self):
+        """
+        Affiche les curseurs de réglage de la similarité (poids de chaque composante et nombre de résultats).
+
+        Returns:
+            Tuple[dict, int]: Les poids combinés choisis et le nombre de recettes à afficher.
+        """
+        labels = {
+            "alpha": "Nom",
+            "beta": "Tags",
+            "gamma": "Étapes",
+            "delta": "Ingrédients",
+            "epsilon": "Variables nutritionnelles",
+        }
+        with st.expander("Régler la similarité"):
+            combined_weights = {
+                name: st.slider(label, min_value=0.0, max_value=1.0, value=float(COMBINED_WEIGHTS[name]),
+                                step=0.05, key=f"weight_{name}")
+                for name, label in labels.items()
+            }
+            top_n = st.slider("Nombre de recettes", min_value=10, max_value=200, value=TOP_N, step=10)
+        return combined_weights, top_n
+
+    def display_recipe_search_page(self, poll_interval: float = 0.5):
+        """
+        Affiche la page de recherche des recettes proches d'une recette donnée ou d'un texte libre
+        (ingrédients, tags, nom de plat). La recherche est soumise à l'exécuteur partagé du processus
+        puis interrogée à chaque réexécution du script : l'interface ne bloque pas pendant le calcul.
+
+        Args:
+            poll_interval (float): Délai (en secondes) entre deux interrogations de la recherche en cours.
+        """
+        st.title("Recherche de Recettes Proches")
+
+        try:
+            if "search_session_key" not in st.session_state:
+                st.session_state["search_session_key"] = uuid.uuid4().hex
+            session_key = st.session_state["search_session_key"]
+
+            by_text = st.radio("Rechercher à partir :", options=[False, True], horizontal=True, key="search_by_text",
+                               format_func=lambda value: "d'un texte libre" if value else "d'une recette")
+            if by_text:
+                executor, state_key = get_text_search_executor(), "search_text_query"
+                query = st.text_input("Ingrédients, tags ou nom de plat :", placeholder="chicken garlic lemon quick")
+            else:
+                executor, state_key = get_search_executor(), "search_recipe_id"
+                query = int(st.number_input("Identifiant de la recette :", min_value=0, step=1, format="%d"))
+            combined_weights, top_n = self.display_similarity_sliders()
+            if st.button("Rechercher"):
+                st.session_state[state_key] = query.strip() if by_text else query
+
+            # Resoumettre à chaque changement des curseurs : une requête identique n'est pas relancée
+            if state_key in st.session_state:
+                executor.submit(session_key, st.session_state[state_key],
+                                combined_weights=combined_weights, top_n=top_n)
+
+            status, result = executor.poll(session_key)
+            if status == RecipeSearchExecutor.PENDING:
+                st.info("Recherche des recettes proches en cours...")
+                time.sleep(poll_interval)
+                st.rerun()
+            elif status == RecipeSearchExecutor.ERROR:
+                error_logger.error(f"Erreur lors de la recherche de recettes proches : {result}")
+                st.error(f"Erreur lors de la recherche : {result}")
+            elif status == RecipeSearchExecutor.DONE:
+                if result.empty:
+                    st.warning("Aucune recette proche trouvée.")
+                else:
+                    st.subheader(f"{len(result)} recettes les plus proches")
+                    st.dataframe(result[['id', 'name', 'combined_distance']], use_container_width=True)
+        except Exception as e:
+            error_logger.error(f"Erreur lors de l'affichage de la recherche de recettes : {e}")
+            st.error("Une erreur s'est produite lors de la recherche de recettes proches.")
+
     def run(self):
         """
         Lance l'application Streamlit.
@@ -195,6 +321,20 @@ class RecipeDashboard:
         except Exception as e:
             error_logger.error(f"Erreur générale de l'application : {e}")
             st.error("Une erreur critique s'est produite dans l'application.")
+        finally:
+            self.write_metrics()
+
+    @staticmethod
+    def write_metrics():
+        """
+        Écrit les métriques agrégées du processus (latences, compteurs, taux de succès des caches)
+        dans le fichier lu par le collecteur local, après chaque exécution du script.
+        """
+        try:
+            get_registry().inc("app_script_runs_total")
+            get_registry().write(METRICS_FILE)
+        except OSError as e:
+            error_logger.error(f"Erreur lors de l'écriture des métriques : {e}")
 
 if __name__ == "__main__":
     dashboard = RecipeDashboard()
@@ -0,0 +1,63 @@
+"""
+Benchmark de la recherche des deux points les plus éloignés d'une projection t-SNE.
+
+Compare l'approche historique (matrice dense n x n x 2 via `np.linalg.norm`) à
+`farthest_pair` (enveloppe convexe + rotating calipers).
+
+Usage :
+    python -m benchmarks.bench_farthest_pair --sizes 1000 5000 20000 100000
+"""
+import argparse
+import time
+import numpy as np
+from src.app_manager.geometry import farthest_pair
+
+# Au-delà de cette taille, la matrice dense dépasse plusieurs Go : l'approche historique n'est pas mesurée
+DENSE_MAX_POINTS = 8000
+
+
+def dense_farthest_pair(points: np.ndarray):
+    """Ancienne implémentation : distances de toutes les paires de points."""
+    distances = np.linalg.norm(points[:, np.newaxis] - points, axis=2)
+    np.fill_diagonal(distances, 0)
+    return np.unravel_index(np.argmax(distances), distances.shape)
+
+
+def time_call(func, points, repeat):
+    """Retourne le meilleur temps (en secondes) sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(points)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'n':>10} {'dense (s)':>12} {'dense (Mo)':>12} {'hull (s)':>12} {'accélération':>14}")
+    for n in args.sizes:
+        # Nuage proche d'une sortie t-SNE : plusieurs amas gaussiens
+        centers = rng.normal(scale=30, size=(10, 2))
+        points = centers[rng.integers(0, 10, n)] + rng.normal(scale=5, size=(n, 2))
+
+        hull_time = time_call(farthest_pair, points, args.repeat)
+        if n <= DENSE_MAX_POINTS:
+            dense_time = time_call(dense_farthest_pair, points, args.repeat)
+            dense_mb = n * n * 2 * 8 / 1e6
+            i, j = farthest_pair(points)
+            k, l = dense_farthest_pair(points)
+            assert np.isclose(np.linalg.norm(points[i] - points[j]), np.linalg.norm(points[k] - points[l]))
+            print(f"{n:>10} {dense_time:>12.4f} {dense_mb:>12.1f} {hull_time:>12.4f} {dense_time / hull_time:>13.1f}x")
+        else:
+            print(f"{n:>10} {'-':>12} {n * n * 2 * 8 / 1e6:>12.1f} {hull_time:>12.4f} {'-':>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Mesure le temps de démarrage à froid de l'application : l'import de `app_v1` (et des modules demandés)
+dans un interpréteur Python neuf, répété plusieurs fois, avec le détail de `python -X importtime`.
+
+Avec `--ref`, le même import est mesuré sur un autre commit (extrait dans un worktree git temporaire)
+pour comparer le démarrage avant et après une modification.
+
+Usage :
+    python -m benchmarks.bench_import_time --runs 5
+    python -m benchmarks.bench_import_time --ref HEAD~1 --output import_time.json
+    python -m benchmarks.bench_import_time --module src.DataPreprocess.vectorizer_preparator
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+DEFAULT_MODULES = ["app_v1"]
+# Ligne de `python -X importtime` : "import time: <self us> | <cumulé us> | <indentation><module>"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def import_once(module, cwd):
+    """
+    Importe `module` dans un nouvel interpréteur et retourne (durée totale en secondes,
+    {paquet : durée en secondes}), la durée d'un paquet (ex : 'matplotlib') étant la somme des durées
+    propres de ses modules.
+    """
+    environment = dict(os.environ, PYTHONPATH=cwd, PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=cwd,
+                               env=environment, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Échec de l'import de {module} :\n{completed.stderr[-2000:]}")
+    total, packages = 0.0, {}
+    for match in IMPORTTIME_LINE.finditer(completed.stderr):
+        own, cumulative, _, name = match.groups()
+        if name == module:
+            total = int(cumulative) / 1e6
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(own) / 1e6
+    return total, packages
+
+
+def measure(modules, cwd, runs, top):
+    """Retourne, pour chaque module, la médiane et le minimum des imports et les paquets les plus lents."""
+    results = {}
+    for module in modules:
+        # Premier import non compté : il compile les .pyc et charge les fichiers dans le cache du système
+        import_once(module, cwd)
+        totals, details = [], []
+        for _ in range(runs):
+            total, packages = import_once(module, cwd)
+            totals.append(total)
+            details.append(packages)
+        slowest = sorted(details[0], key=lambda name: -statistics.median(d.get(name, 0) for d in details))
+        results[module] = {
+            "median_seconds": statistics.median(totals),
+            "min_seconds": min(totals),
+            "slowest_packages": {name: statistics.median(d.get(name, 0) for d in details)
+                                for name in slowest[:top]},
+        }
+    return results
+
+
+def measure_ref(ref, modules, runs, top):
+    """Mesure les imports sur le commit `ref`, extrait dans un worktree git temporaire."""
+    with tempfile.TemporaryDirectory() as directory:
+        worktree = os.path.join(directory, "worktree")
+        subprocess.run(["git", "worktree", "add", "--detach", worktree, ref], check=True, capture_output=True)
+        try:
+            os.makedirs(os.path.join(worktree, "logs"), exist_ok=True)
+            return measure(modules, worktree, runs, top)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], check=False, capture_output=True)
+
+
+def print_results(label, results):
+    print(f"\n{label}")
+    for module, result in results.items():
+        print(f"  {module} : médiane {result['median_seconds']:.2f} s (min {result['min_seconds']:.2f} s)")
+        for name, seconds in result["slowest_packages"].items():
+            print(f"      {name:<45} {seconds:6.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", dest="modules", action="append",
+                        help="Module à importer (répétable, par défaut : app_v1).")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre d'imports mesurés par module.")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de paquets les plus lents affichés.")
+    parser.add_argument("--ref", help="Commit de comparaison (ex : HEAD~1).")
+    parser.add_argument("--output", help="Fichier JSON des résultats.")
+    args = parser.parse_args()
+    modules = args.modules or DEFAULT_MODULES
+
+    results = {"current": measure(modules, os.getcwd(), args.runs, args.top)}
+    print_results("Arbre de travail", results["current"])
+    if args.ref:
+        results[args.ref] = measure_ref(args.ref, modules, args.runs, args.top)
+        print_results(args.ref, results[args.ref])
+        for module in modules:
+            before, after = results[args.ref][module]["median_seconds"], results["current"][module]["median_seconds"]
+            print(f"\n{module} : {before:.2f} s -> {after:.2f} s ({(after / before - 1) * 100:+.1f} %)")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
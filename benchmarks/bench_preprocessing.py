@@ -0,0 +1,70 @@
+"""
+Benchmark du pipeline de prétraitement (DataPreprocessor) sur des recettes brutes synthétiques.
+
+Génère une table au format RAW_recipes.csv et son mapping d'ingrédients dans un dossier temporaire,
+exécute le pipeline complet (chargement, nettoyage, feature engineering, préparation NLTK,
+normalisation, séparation en datasets) et affiche le profil de chaque étape :
+temps écoulé, temps CPU, lignes en entrée et en sortie, pic de mémoire.
+
+Nécessite les ressources NLTK 'stopwords' et, avec le tokenizer NLTK, 'punkt_tab'
+(installation : python -m src.DataPreprocess.nltk_resources).
+
+Usage :
+    python -m benchmarks.bench_preprocessing --recipes 20000 --output preprocessing.json
+    python -m benchmarks.bench_preprocessing --recipes 5000 --trace-memory
+    python -m benchmarks.bench_preprocessing --recipes 20000 --workers 1   # exécution séquentielle
+    python -m benchmarks.bench_preprocessing --recipes 20000 --tokenizer regex
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.synthetic import make_synthetic_raw_recipes
+from src.DataPreprocess.data_preprocessor import DataPreprocessor
+from src.DataPreprocess.stage_profiler import StageProfiler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=20000, help="Taille de la table brute synthétique.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Mesurer le pic d'allocations de chaque étape avec tracemalloc : toutes les étapes "
+                             "avec --workers 1 ; sinon celles des processus workers et les étapes INLINE "
+                             "exécutées seules (les autres relèvent le pic RSS de leur processus).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Threads et processus du pipeline (par défaut : nombre de coeurs).")
+    parser.add_argument("--tokenizer", choices=("nltk", "regex"), default="nltk",
+                        help="Tokenizer des colonnes 'steps' et 'name'.")
+    parser.add_argument("--output", help="Fichier JSON du profil des étapes.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    raw_recipes, ingredient_map = make_synthetic_raw_recipes(args.recipes, seed=args.seed)
+    print(f"{args.recipes} recettes brutes générées en {time.perf_counter() - start:.1f} s")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        raw_path = os.path.join(work_dir, "Raw_recipes.csv")
+        map_path = os.path.join(work_dir, "ingr_map.csv")
+        raw_recipes.to_csv(raw_path, index=False)
+        ingredient_map.to_csv(map_path, index=False)
+
+        profiler = StageProfiler(trace_memory=args.trace_memory)
+        preprocessor = DataPreprocessor(raw_path, map_path, output_dir=os.path.join(work_dir, "split_datasets"),
+                                        profiler=profiler, tokenizer=args.tokenizer)
+        preprocessor.load_data()
+        start = time.perf_counter()
+        preprocessor.preprocess(n_workers=args.workers)
+        elapsed = time.perf_counter() - start
+        preprocessor.save_data(os.path.join(work_dir, "pp_recipes.csv"))
+
+    report = profiler.report()
+    print(profiler.summary())
+    print(f"Pipeline : {elapsed:.2f} s ; somme des étapes : {report['total_wall_seconds']:.2f} s "
+          f"({report['total_cpu_seconds']:.2f} s CPU), pic RSS {report['peak_rss_mb']:.0f} Mo")
+    if args.output:
+        profiler.save_report(args.output)
+
+
+if __name__ == "__main__":
+    main()
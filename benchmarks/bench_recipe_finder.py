@@ -0,0 +1,171 @@
+"""
+Suite de benchmarks du chemin critique de la recherche de recettes proches.
+
+Pour chaque taille de catalogue synthétique (10k, 100k, 1M recettes par défaut), mesure :
+  - le temps de construction de l'index (`RecipeFinder.preprocess`) ;
+  - la latence d'une requête unitaire (p50 / p99), sur des recettes distinctes (aucun succès de cache) ;
+  - le débit du mode batch (`find_similar_recipes_batch`) ;
+  - le pic de mémoire résidente du processus et la taille des matrices textuelles de l'index.
+
+Chaque taille est mesurée dans un processus neuf, pour que le pic de mémoire lui soit propre
+et qu'un manque de mémoire sur la plus grande taille n'interrompe pas les autres mesures.
+Les résultats (JSON) peuvent être comparés à ceux d'un autre commit avec `--compare`.
+
+Usage :
+    python -m benchmarks.bench_recipe_finder --output bench.json
+    python -m benchmarks.bench_recipe_finder --sizes 10000 100000 --mode hashing
+    python -m benchmarks.bench_recipe_finder --sizes 10000 --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+import numpy as np
+from benchmarks.synthetic import make_synthetic_recipes
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+# Métriques comparées par --compare : (nom, True si une valeur plus grande est meilleure)
+COMPARED_METRICS = [
+    ("build_seconds", False),
+    ("p50_ms", False),
+    ("p99_ms", False),
+    ("batch_queries_per_second", True),
+    ("peak_rss_mb", False),
+]
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus courant (Mo)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kilo-octets sous Linux
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def run_scale(n_recipes, mode, queries, batch_size, seed):
+    """
+    Mesure une taille de catalogue (exécuté dans un processus dédié).
+    """
+    # Import local : le processus parent n'a pas besoin de charger scikit-learn
+    from src.FindingCloseRecipes.recipe_finder import RecipeFinder
+
+    start = time.perf_counter()
+    recipes = make_synthetic_recipes(n_recipes, seed=seed)
+    generation_seconds = time.perf_counter() - start
+    rss_before_build = peak_rss_mb()
+
+    finder = RecipeFinder(recipes, vectorizer_mode=mode)
+    start = time.perf_counter()
+    finder.preprocess()
+    build_seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(seed)
+    recipe_ids = rng.choice(recipes["id"].values, size=min(2 * queries, n_recipes), replace=False).tolist()
+    single_ids, batch_ids = recipe_ids[:queries], recipe_ids[queries:]
+    finder.find_similar_recipes(single_ids[0])  # Échauffement (allocations, caches BLAS)
+    finder.result_cache.clear()
+
+    latencies = []
+    for recipe_id in single_ids:
+        start = time.perf_counter()
+        finder.find_similar_recipes(recipe_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    finder.find_similar_recipes_batch(batch_ids, batch_size=batch_size)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "recipes": n_recipes,
+        "generation_seconds": generation_seconds,
+        "build_seconds": build_seconds,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "batch_queries_per_second": len(batch_ids) / batch_seconds if batch_ids else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "build_peak_rss_increase_mb": peak_rss_mb() - rss_before_build,
+        "index_mb": sum(report["bytes"] for report in finder.vectorizer_report().to_dict(orient="index").values())
+        / 1e6,
+    }
+
+
+def environment():
+    """Description de la machine et du commit mesurés."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path):
+    """Affiche l'évolution de chaque métrique par rapport à un fichier de résultats de référence."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nComparaison avec {baseline_path} (commit {baseline['environment'].get('commit')}) :")
+    for size, current in results["scales"].items():
+        reference = baseline["scales"].get(size)
+        if reference is None or "error" in current or "error" in reference:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            if not reference.get(metric) or current.get(metric) is None:
+                continue
+            ratio = current[metric] / reference[metric]
+            better = ratio > 1 if higher_is_better else ratio < 1
+            print(f"{size:>9} {metric:<26} {reference[metric]:>10.2f} -> {current[metric]:>10.2f} "
+                  f"({(ratio - 1) * 100:+.1f} %{'' if abs(ratio - 1) < 0.05 else ', mieux' if better else ', pire'})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Tailles des catalogues.")
+    parser.add_argument("--mode", choices=["vocabulary", "hashing"], default="vocabulary",
+                        help="Mode de vectorisation du RecipeFinder.")
+    parser.add_argument("--queries", type=int, default=100, help="Requêtes unitaires (et batch) par taille.")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Fichier JSON des résultats.")
+    parser.add_argument("--compare", help="Fichier JSON de référence (ex : résultats d'un commit précédent).")
+    args = parser.parse_args()
+
+    results = {"environment": environment(), "mode": args.mode, "queries": args.queries,
+               "batch_size": args.batch_size, "scales": {}}
+    print(f"{'recettes':>9} {'build (s)':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'batch (req/s)':>14} "
+          f"{'pic RSS (Mo)':>13} {'index (Mo)':>11}")
+    for n_recipes in args.sizes:
+        # Un processus neuf par taille : pic de mémoire isolé, échec (ex : OOM) sans effet sur les autres tailles
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            try:
+                scale = executor.submit(run_scale, n_recipes, args.mode, args.queries, args.batch_size,
+                                        args.seed).result()
+            except (BrokenProcessPool, MemoryError) as error:
+                scale = {"recipes": n_recipes, "error": repr(error)}
+        results["scales"][str(n_recipes)] = scale
+        if "error" in scale:
+            print(f"{n_recipes:>9} échec : {scale['error']}")
+            continue
+        print(f"{n_recipes:>9} {scale['build_seconds']:>10.2f} {scale['p50_ms']:>10.1f} {scale['p99_ms']:>10.1f} "
+              f"{scale['batch_queries_per_second'] or 0:>14.1f} {scale['peak_rss_mb']:>13.0f} "
+              f"{scale['index_mb']:>11.1f}")
+
+    if args.compare:
+        compare(results, args.compare)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Mesure le passage à l'échelle de la recherche exacte répartie par blocs (ShardedScorer)
+en fonction du nombre de threads, sur le catalogue complet.
+
+Pour chaque nombre de threads, la latence d'une requête et le débit en mode batch sont mesurés
+sur des recettes distinctes (aucun succès de cache), puis comparés à la recherche séquentielle.
+L'accélération n'a de sens que si la machine dispose d'au moins autant de coeurs que de threads :
+les exécutions au-delà des coeurs disponibles sont signalées et marquées non vérifiées dans le JSON.
+
+Usage :
+    python -m benchmarks.bench_sharded_scoring --workers 1 2 4 8
+    python -m benchmarks.bench_sharded_scoring --real-data --output sharded.json
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+from src.FindingCloseRecipes.recipe_finder import RecipeFinder
+from src.FindingCloseRecipes.run_recipe_finder import reconstruct_pp_recipes
+from benchmarks.synthetic import make_synthetic_recipes
+
+# Taille du catalogue pp_recipes
+FULL_CATALOGUE = 231637
+
+
+def measure(finder, recipe_ids, batch_size):
+    """Latences (ms) des requêtes unitaires et débit (requêtes/s) du mode batch."""
+    half = len(recipe_ids) // 2
+    latencies = []
+    for recipe_id in recipe_ids[:half]:
+        start = time.perf_counter()
+        finder.find_similar_recipes(recipe_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    finder.find_similar_recipes_batch(recipe_ids[half:], batch_size=batch_size)
+    throughput = (len(recipe_ids) - half) / (time.perf_counter() - start)
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "batch_queries_per_second": throughput,
+    }
+
+
+def available_cores():
+    """Nombre de coeurs utilisables par le processus (affinité CPU), à défaut os.cpu_count()."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=FULL_CATALOGUE, help="Taille de la table synthétique.")
+    parser.add_argument("--real-data", action="store_true", help="Utiliser data/pp_recipes_*.csv.")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--output", help="Fichier JSON des résultats.")
+    args = parser.parse_args()
+
+    recipes = reconstruct_pp_recipes() if args.real_data else make_synthetic_recipes(args.recipes)
+    finder = RecipeFinder(recipes)
+    finder.preprocess()
+    rng = np.random.default_rng(0)
+    all_ids = rng.choice(recipes["id"].values, size=min(args.queries * len(args.workers), len(recipes)),
+                         replace=False)
+
+    cores = available_cores()
+    results = {"recipes": len(recipes), "cpu_count": os.cpu_count(), "available_cores": cores, "runs": {}}
+    if max(args.workers) > cores:
+        print(f"Attention : {cores} coeur(s) disponible(s) ; l'accélération au-delà de {cores} thread(s) "
+              f"n'est pas mesurable sur cette machine.")
+    print(f"{'threads':>8} {'p50 (ms)':>10} {'p99 (ms)':>10} {'batch (req/s)':>14} {'accélération':>13}")
+    for run, n_workers in enumerate(args.workers):
+        finder.n_workers = n_workers
+        recipe_ids = all_ids[run * args.queries:(run + 1) * args.queries].tolist()
+        results["runs"][n_workers] = measure(finder, recipe_ids, args.batch_size)
+        reference = results["runs"][args.workers[0]]
+        current = results["runs"][n_workers]
+        current["speedup"] = reference["p50_ms"] / current["p50_ms"]
+        current["batch_speedup"] = current["batch_queries_per_second"] / reference["batch_queries_per_second"]
+        current["verified"] = n_workers <= cores
+        print(f"{n_workers:>8} {current['p50_ms']:>10.1f} {current['p99_ms']:>10.1f} "
+              f"{current['batch_queries_per_second']:>14.1f} {current['speedup']:>12.2f}x"
+              f"{'' if current['verified'] else '  (non vérifié : plus de threads que de coeurs)'}")
+    finder.n_workers = 1
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
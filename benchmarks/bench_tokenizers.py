@@ -0,0 +1,94 @@
+"""
+Compare les tokenizers de VectorizerPreparator sur des étapes de recettes synthétiques :
+nltk.word_tokenize (référence) et l'expression régulière compilée de tokenizers.regex_tokenize.
+
+Les étapes mêlent des mots aux formes des instructions réelles (nombres, fractions, dimensions,
+contractions, ponctuation). Le benchmark mesure le débit de chaque tokenizer, suivi du filtre
+`str.isalnum` du prétraitement, et compte les textes dont les tokens diffèrent.
+Sans la ressource NLTK 'punkt_tab', la référence est le NLTKWordTokenizer appliqué phrase par phrase.
+
+Usage :
+    python -m benchmarks.bench_tokenizers --texts 20000 --output tokenizers.json
+"""
+import argparse
+import ast
+import json
+import re
+import time
+import nltk
+import numpy as np
+from nltk.tokenize.destructive import NLTKWordTokenizer
+from benchmarks.synthetic import make_synthetic_raw_recipes
+from src.DataPreprocess.tokenizers import regex_tokenize
+
+# Formes insérées entre les mots des étapes synthétiques
+DECORATIONS = [",", ".", ";", ":", "!", "?", "(", ")", "--", "...", "&", "'", '"', "350", "1/2", "2-3",
+               "9x13-inch", "1,000", "10:30", "don't", "it's", "can't", "cannot", "you're", "cook's", "f."]
+
+
+def make_step_texts(n_texts, seed=0, decoration_rate=0.2):
+    """Retourne `n_texts` textes d'étapes jointes, comme ceux tokenisés par process_steps."""
+    raw_recipes, _ = make_synthetic_raw_recipes(n_texts, seed=seed)
+    rng = np.random.default_rng(seed)
+    texts = []
+    for steps in raw_recipes["steps"]:
+        words = " ".join(ast.literal_eval(steps)).split()
+        decorated = rng.random(len(words)) < decoration_rate
+        choices = rng.integers(0, len(DECORATIONS), size=len(words))
+        texts.append(" ".join(f"{word} {DECORATIONS[choice]}" if decorate else word
+                              for word, decorate, choice in zip(words, decorated, choices)))
+    return texts
+
+
+def nltk_tokenizer():
+    """Retourne le tokenizer de référence et son nom."""
+    try:
+        nltk.data.find("tokenizers/punkt_tab/english/")
+        return nltk.word_tokenize, "nltk.word_tokenize"
+    except LookupError:
+        tokenizer = NLTKWordTokenizer()
+
+        def tokenize(text):
+            sentences = re.split(r"(?<=[.?!])\s+|(?<=[.?!][\"')\]»”’])\s+", text)
+            return [token for sentence in sentences for token in tokenizer.tokenize(sentence)]
+        return tokenize, "NLTKWordTokenizer (par phrase)"
+
+
+def measure(tokenize, texts):
+    """Tokenise tous les textes et retourne (tokens filtrés par texte, durée en secondes)."""
+    start = time.perf_counter()
+    tokens = [[token for token in tokenize(text) if token.isalnum()] for text in texts]
+    return tokens, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=20000, help="Nombre de textes d'étapes.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Fichier JSON des résultats.")
+    args = parser.parse_args()
+
+    texts = make_step_texts(args.texts, seed=args.seed)
+    n_chars = sum(len(text) for text in texts)
+    reference, reference_name = nltk_tokenizer()
+    results = {"texts": len(texts), "characters": n_chars, "reference": reference_name}
+
+    expected, results["nltk_seconds"] = measure(reference, texts)
+    found, results["regex_seconds"] = measure(regex_tokenize, texts)
+    results["tokens"] = sum(len(tokens) for tokens in expected)
+    results["speedup"] = results["nltk_seconds"] / results["regex_seconds"]
+    results["mismatched_texts"] = sum(a != b for a, b in zip(expected, found))
+
+    print(f"{len(texts)} textes, {n_chars / 1e6:.1f} M caractères, {results['tokens']} tokens conservés")
+    for name in ("nltk", "regex"):
+        seconds = results[f"{name}_seconds"]
+        print(f"{name:<6} {seconds:8.2f} s  {n_chars / seconds / 1e6:6.2f} M caractères/s")
+    print(f"Accélération : x{results['speedup']:.1f} ; textes différents : {results['mismatched_texts']} "
+          f"(référence : {reference_name})")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Mesure l'effet de l'élagage du vocabulaire (min_df / max_df / max_features) et du type float32
+sur la taille des matrices du RecipeFinder et sur le rappel des recettes proches.
+
+Le rappel@k est la proportion des k recettes proches de référence (vocabulaire complet, float64)
+retrouvées par la configuration élaguée.
+
+Usage :
+    python -m benchmarks.bench_vectorizer_pruning --recipes 50000 --steps-min-df 2 --steps-max-df 0.5
+    python -m benchmarks.bench_vectorizer_pruning --real-data
+"""
+import argparse
+import json
+import time
+import numpy as np
+from src.FindingCloseRecipes.recipe_finder import RecipeFinder
+from src.FindingCloseRecipes.run_recipe_finder import reconstruct_pp_recipes
+from benchmarks.synthetic import make_synthetic_recipes
+
+UNPRUNED = {field: {"min_df": 1, "max_df": 1.0, "max_features": None}
+            for field in ("name", "tags", "steps", "ingredients")}
+
+
+def build_finder(recipes, vectorizer_params, dtype):
+    finder = RecipeFinder(recipes, vectorizer_params=vectorizer_params, vectorizer_dtype=dtype)
+    start = time.perf_counter()
+    finder.preprocess()
+    return finder, time.perf_counter() - start
+
+
+def recall_at_k(reference, candidate, recipe_ids, k):
+    """Rappel moyen des k plus proches voisins de `candidate` par rapport à `reference`."""
+    recalls = []
+    for recipe_id in recipe_ids:
+        expected = set(reference.find_similar_recipes(recipe_id, top_n=k)['id'])
+        found = set(candidate.find_similar_recipes(recipe_id, top_n=k)['id'])
+        recalls.append(len(expected & found) / k)
+    return float(np.mean(recalls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=50000, help="Taille de la table synthétique.")
+    parser.add_argument("--real-data", action="store_true", help="Utiliser data/pp_recipes_*.csv.")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--steps-min-df", type=float, default=2)
+    parser.add_argument("--steps-max-df", type=float, default=1.0)
+    parser.add_argument("--steps-max-features", type=int, default=None)
+    parser.add_argument("--output", help="Fichier JSON des résultats.")
+    args = parser.parse_args()
+
+    recipes = reconstruct_pp_recipes() if args.real_data else make_synthetic_recipes(args.recipes)
+    min_df = int(args.steps_min_df) if args.steps_min_df >= 1 else args.steps_min_df
+    pruned_params = {"steps": {"min_df": min_df, "max_df": args.steps_max_df,
+                               "max_features": args.steps_max_features}}
+
+    reference, reference_time = build_finder(recipes, UNPRUNED, "float64")
+    pruned, pruned_time = build_finder(recipes, pruned_params, "float32")
+
+    rng = np.random.default_rng(0)
+    recipe_ids = rng.choice(recipes["id"].values, size=min(args.queries, len(recipes)), replace=False)
+    results = {
+        "recipes": len(recipes),
+        "params": pruned.vectorizer_params,
+        "build_seconds": {"reference": reference_time, "pruned": pruned_time},
+        "reference": reference.vectorizer_report().to_dict(orient="index"),
+        "pruned": pruned.vectorizer_report().to_dict(orient="index"),
+        f"recall_at_{args.k}": recall_at_k(reference, pruned, recipe_ids, args.k),
+    }
+
+    print(f"{'champ':<12} {'vocab ref':>10} {'vocab':>10} {'nnz ref':>12} {'nnz':>12} {'Mo ref':>8} {'Mo':>8}")
+    for field in results["reference"]:
+        ref, new = results["reference"][field], results["pruned"][field]
+        print(f"{field:<12} {ref['vocabulary']:>10} {new['vocabulary']:>10} {ref['nnz']:>12} {new['nnz']:>12} "
+              f"{ref['bytes'] / 1e6:>8.1f} {new['bytes'] / 1e6:>8.1f}")
+    print(f"Rappel@{args.k} : {results[f'recall_at_{args.k}']:.4f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Génération de tables de recettes synthétiques pour les benchmarks.
+
+Les tokens suivent une loi de Zipf (quelques termes très fréquents, une longue traîne de
+termes rares et d'hapax), comme les colonnes prétraitées de pp_recipes.
+"""
+import numpy as np
+import pandas as pd
+from src.FindingCloseRecipes.config import NUMERIC_FEATURES
+
+# (taille du vocabulaire, longueur minimale, longueur maximale, exposant de Zipf) par champ
+FIELD_SPECS = {
+    "name": (20000, 2, 6, 1.1),
+    "tags": (550, 8, 25, 0.9),
+    "steps": (60000, 40, 160, 1.05),
+    "ingredients": (4500, 4, 16, 1.0),
+}
+
+
+def _vocabulary(field, size):
+    """Vocabulaire artificiel : des mots distincts, non réduits par les tokenizers de scikit-learn."""
+    return np.array([f"{field[:2]}{index:x}" for index in range(size)], dtype=object)
+
+
+def _zipf_documents(rng, n_documents, vocabulary_size, min_length, max_length, exponent):
+    """Tire les identifiants de tokens de chaque document selon une loi de Zipf."""
+    ranks = np.arange(1, vocabulary_size + 1)
+    probabilities = 1.0 / ranks ** exponent
+    probabilities /= probabilities.sum()
+    lengths = rng.integers(min_length, max_length + 1, size=n_documents)
+    tokens = rng.choice(vocabulary_size, size=lengths.sum(), p=probabilities)
+    return np.split(tokens, np.cumsum(lengths)[:-1])
+
+
+def make_synthetic_recipes(n_recipes: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Génère une table de recettes prétraitées (colonnes id, name, tags, steps, ingredients
+    et variables numériques normalisées) de `n_recipes` lignes.
+    """
+    rng = np.random.default_rng(seed)
+    recipes = pd.DataFrame({
+        # Identifiants uniques, denses mais non contigus comme dans le dataset réel
+        "id": np.sort(rng.choice(np.arange(1, int(n_recipes * 2.35) + 2), size=n_recipes, replace=False)),
+    })
+    for field, (vocabulary_size, min_length, max_length, exponent) in FIELD_SPECS.items():
+        vocabulary = _vocabulary(field, vocabulary_size)
+        documents = _zipf_documents(rng, n_recipes, vocabulary_size, min_length, max_length, exponent)
+        recipes[field] = [" ".join(vocabulary[document]) for document in documents]
+    numeric = rng.standard_normal(size=(n_recipes, len(NUMERIC_FEATURES)))
+    recipes[NUMERIC_FEATURES] = numeric
+    return recipes
+
+
+def _word_vocabulary(size, seed):
+    """Vocabulaire de mots alphabétiques (conservés par les filtres `isalpha` du prétraitement)."""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    lengths = rng.integers(3, 10, size=size)
+    # Le rang est encodé en base 26 pour garantir des mots distincts, complété par des lettres aléatoires
+    words = []
+    for rank, length in enumerate(lengths):
+        prefix = ""
+        while True:
+            prefix += letters[rank % 26]
+            rank //= 26
+            if not rank:
+                break
+        words.append(prefix + "".join(rng.choice(letters, size=max(0, length - len(prefix)))))
+    return np.array(words, dtype=object)
+
+
+def make_synthetic_raw_recipes(n_recipes: int, seed: int = 0):
+    """
+    Génère une table de recettes brutes au format de RAW_recipes.csv (listes sérialisées pour
+    'tags', 'steps', 'ingredients' et 'nutrition') et le mapping des ingrédients associé
+    (format de ingr_map.csv), pour mesurer le pipeline de prétraitement.
+
+    :return: (recettes brutes, mapping des ingrédients)
+    """
+    rng = np.random.default_rng(seed)
+    words = _word_vocabulary(20000, seed)
+    ingredients = _word_vocabulary(4500, seed + 1)
+    tags = np.array([f"{word}-{other}" for word, other in zip(words[:550], words[550:1100])], dtype=object)
+
+    def documents(vocabulary, min_length, max_length, exponent):
+        return [vocabulary[document] for document in _zipf_documents(
+            rng, n_recipes, len(vocabulary), min_length, max_length, exponent)]
+
+    names = [" ".join(document) for document in documents(words, 2, 6, 1.1)]
+    # Étapes : phrases de 5 à 15 mots avec ponctuation, comme les instructions réelles
+    step_lists = [[" ".join(sentence) + "," for sentence in np.array_split(document, max(1, len(document) // 10))]
+                  for document in documents(words, 40, 160, 1.05)]
+    recipe_ingredients = documents(ingredients, 4, 16, 1.0)
+    # Durées log-normales, avec quelques 0 et quelques durées aberrantes comme dans le dataset réel
+    minutes = np.round(rng.lognormal(mean=3.6, sigma=0.9, size=n_recipes)).astype(int)
+    minutes[rng.random(n_recipes) < 0.005] = 0
+    minutes[rng.random(n_recipes) < 0.002] = 100000
+    nutrition = np.abs(rng.normal(loc=[400, 30, 60, 30, 35, 40, 12], scale=[300, 25, 80, 40, 30, 45, 10],
+                                  size=(n_recipes, 7))).round(1)
+
+    raw_recipes = pd.DataFrame({
+        "name": names,
+        "id": np.sort(rng.choice(np.arange(1, int(n_recipes * 2.35) + 2), size=n_recipes, replace=False)),
+        "minutes": minutes,
+        "contributor_id": rng.integers(1, max(2, n_recipes // 8), size=n_recipes),
+        "submitted": "2010-01-01",
+        "tags": [repr(list(document)) for document in documents(tags, 8, 25, 0.9)],
+        "nutrition": [repr(values) for values in nutrition.tolist()],
+        "n_steps": [len(step_list) for step_list in step_lists],
+        "steps": [repr(step_list) for step_list in step_lists],
+        "description": names,
+        "ingredients": [repr(list(document)) for document in recipe_ingredients],
+        "n_ingredients": [len(document) for document in recipe_ingredients],
+    })
+    # Mapping : chaque ingrédient brut est remplacé par l'un des 500 ingrédients les plus fréquents
+    ingredient_map = pd.DataFrame({
+        "raw_ingr": ingredients,
+        "replaced": ingredients[rng.integers(0, 500, size=len(ingredients))],
+    })
+    return raw_recipes, ingredient_map
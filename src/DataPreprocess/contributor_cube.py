@@ -0,0 +1,167 @@
+import ast
+import os
+import numpy as np
+import pandas as pd
+
+
+def _as_list(value):
+    """
+    Retourne les éléments d'une cellule : liste Python, liste sérialisée ("['a', 'b']") ou valeur manquante.
+    """
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return list(value)
+    if isinstance(value, str):
+        return list(ast.literal_eval(value)) if value.startswith("[") else [value]
+    return []
+
+
+class ContributorCube:
+    def __init__(self, contributors, items, indptr, indices, counts, recipe_counts=None):
+        """
+        Matrice creuse contributeur x élément (ingrédient, tag...) des nombres d'occurrences, au format CSR :
+        les éléments du contributeur de la ligne i sont `items[indices[indptr[i]:indptr[i + 1]]]`,
+        avec leurs nombres d'occurrences `counts[indptr[i]:indptr[i + 1]]`.
+        Les agrégats sont calculés au prétraitement et lus par les pages d'analyse, sans parcourir les recettes.
+        :param contributors: Identifiants des contributeurs (triés), un par ligne.
+        :param items: Noms des éléments (triés), un par colonne.
+        :param indptr: Début des éléments de chaque ligne (n_contributeurs + 1 valeurs).
+        :param indices: Colonnes des éléments de chaque ligne.
+        :param counts: Nombres d'occurrences de chaque élément.
+        :param recipe_counts: Nombre de recettes de chaque contributeur.
+        """
+        self.contributors = np.asarray(contributors, dtype=np.int64)
+        self.items = np.asarray(items, dtype=str)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.counts = np.asarray(counts, dtype=np.int32)
+        self.recipe_counts = (np.zeros(len(self.contributors), dtype=np.int32) if recipe_counts is None
+                              else np.asarray(recipe_counts, dtype=np.int32))
+        self._popularity = None
+
+    @classmethod
+    def from_recipes(cls, recipes, column, contributor_column="contributor_id"):
+        """
+        Construit la matrice à partir des recettes.
+        :param recipes: DataFrame avec une colonne des contributeurs et une colonne de listes d'éléments
+                        (listes Python ou sérialisées, comme dans RAW_recipes.csv).
+        :param column: Colonne des éléments (ex : 'ingredients', 'tags').
+        :param contributor_column: Colonne des identifiants des contributeurs.
+        """
+        recipes = recipes[[contributor_column, column]].dropna(subset=[contributor_column])
+        item_lists = [_as_list(value) for value in recipes[column]]
+        lengths = np.fromiter((len(items) for items in item_lists), dtype=np.int64, count=len(item_lists))
+        contributor_ids = recipes[contributor_column].to_numpy(dtype=np.int64)
+        contributors, contributor_codes = np.unique(contributor_ids, return_inverse=True)
+        items, item_codes = np.unique(np.array([item for items in item_lists for item in items], dtype=str),
+                                      return_inverse=True)
+
+        # Une entrée par (contributeur, élément) : les couples sont triés puis comptés en une passe
+        keys = np.repeat(contributor_codes, lengths) * max(len(items), 1) + item_codes
+        keys, counts = np.unique(keys, return_counts=True)
+        rows, indices = np.divmod(keys, max(len(items), 1))
+        indptr = np.zeros(len(contributors) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(contributors)), out=indptr[1:])
+        recipe_counts = np.bincount(contributor_codes, minlength=len(contributors))
+        return cls(contributors, items, indptr, indices, counts, recipe_counts)
+
+    def __len__(self):
+        return len(self.contributors)
+
+    @property
+    def nbytes(self):
+        """Taille des tableaux de la matrice (octets)."""
+        return sum(array.nbytes for array in (self.contributors, self.items, self.indptr, self.indices,
+                                              self.counts, self.recipe_counts))
+
+    def _row(self, contributor_id):
+        position = np.searchsorted(self.contributors, contributor_id)
+        if position < len(self.contributors) and self.contributors[position] == contributor_id:
+            return position
+        return None
+
+    @staticmethod
+    def _top(items, counts, k, column):
+        # Tri par nombre décroissant, puis par nom (les éléments sont triés par nom : ordre stable)
+        order = np.argsort(-counts, kind="stable")
+        if k is not None:
+            order = order[:k]
+        return pd.DataFrame({column: items[order], "count": counts[order]})
+
+    def top_k(self, contributor_id, k=10, column="item"):
+        """
+        Retourne les k éléments les plus fréquents des recettes d'un contributeur.
+        :param contributor_id: Identifiant du contributeur.
+        :param k: Nombre d'éléments (None : tous).
+        :param column: Nom de la colonne des éléments dans le résultat.
+        :return: DataFrame (column, 'count') trié par nombre décroissant, vide si le contributeur est inconnu.
+        """
+        row = self._row(contributor_id)
+        if row is None:
+            return pd.DataFrame({column: pd.Series(dtype=str), "count": pd.Series(dtype=np.int32)})
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self._top(self.items[self.indices[start:end]], self.counts[start:end], k, column)
+
+    def recipe_count(self, contributor_id):
+        """Retourne le nombre de recettes d'un contributeur (0 s'il est inconnu)."""
+        row = self._row(contributor_id)
+        return 0 if row is None else int(self.recipe_counts[row])
+
+    def popularity(self, k=None, column="item"):
+        """
+        Retourne la popularité globale des éléments : leur nombre d'occurrences, tous contributeurs confondus.
+        :param k: Nombre d'éléments (None : tous).
+        :param column: Nom de la colonne des éléments dans le résultat.
+        """
+        if self._popularity is None:
+            self._popularity = np.bincount(self.indices, weights=self.counts,
+                                           minlength=len(self.items)).astype(np.int64)
+        return self._top(self.items, self._popularity, k, column)
+
+    def save(self, path):
+        """
+        Sauvegarde la matrice dans un fichier .npz compressé.
+        :param path: Chemin vers le fichier de sortie.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(path, contributors=self.contributors, items=self.items, indptr=self.indptr,
+                            indices=self.indices, counts=self.counts, recipe_counts=self.recipe_counts)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Charge une matrice sauvegardée par `save`.
+        :param path: Chemin vers le fichier .npz.
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(arrays["contributors"], arrays["items"], arrays["indptr"], arrays["indices"],
+                       arrays["counts"], arrays["recipe_counts"])
+
+
+class ContributorCubeBuilder:
+    def __init__(self, data: pd.DataFrame, output_dir: str):
+        """
+        Classe pour pré-agréger les statistiques des contributeurs (étape du prétraitement).
+        :param data: DataFrame des recettes, avec la colonne 'contributor_id'.
+        :param output_dir: Dossier où sauvegarder les matrices.
+        """
+        self.data = data
+        self.output_dir = output_dir
+
+    def build_cubes(self, columns: list):
+        """
+        Construit et sauvegarde une matrice contributeur x élément par colonne,
+        dans `contributor_<colonne>.npz` (ex : contributor_ingredients.npz). Les éléments sont ceux
+        de `data` à cette étape : dans le pipeline, les catégories d'ingrédients (après map_ingredients)
+        des recettes conservées par le nettoyage.
+        :param columns: Colonnes de listes d'éléments (ex : ['ingredients', 'tags']).
+        """
+        for column in columns:
+            if column in self.data.columns:
+                output_path = os.path.join(self.output_dir, f"contributor_{column}.npz")
+                ContributorCube.from_recipes(self.data, column).save(output_path)
+                print(f"Fichier sauvegardé : {output_path}")
+            else:
+                print(f"Colonne non trouvée : {column}")
+        return self
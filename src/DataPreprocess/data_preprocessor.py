@@ -1,26 +1,58 @@
+import os
+from functools import partial
 import pandas as pd
-from src.DataPreprocess.normalizer import Normalizer
+from src.DataPreprocess.normalizer import Normalizer, NORMALIZER_FILE
 from src.DataPreprocess.feat_engineering import FeatEngineering
 from src.DataPreprocess.data_cleaning import DataCleaning
 from src.DataPreprocess.vectorizer_preparator import VectorizerPreparator
+from src.DataPreprocess import nltk_resources
 from src.DataPreprocess.split_dataset import DatasetSplitter
+from src.DataPreprocess.contributor_cube import ContributorCubeBuilder
+from src.DataPreprocess.stage_profiler import StageProfiler
+from src.DataPreprocess.pipeline import INLINE, PROCESS, Pipeline, Stage, builder_step
+
+NUTRITION_COLUMNS = ['calories', 'total fat (PDV%)', 'sugar (PDV%)', 'sodium (PDV%)',
+                     'protein (PDV%)', 'saturated fat (PDV%)', 'carbohydrates (PDV%)']
+USELESS_COLUMNS = ['submitted', 'nutrition', 'description', 'n_steps', 'n_ingredients']
+
+
+def _normalize(data, params_path=None):
+    """
+    Normalise les variables numériques (fonction de module, utilisable par le pipeline).
+    :param params_path: Fichier où sauvegarder les moyennes et écarts-types, réutilisés pour normaliser
+                        les recettes ajoutées ensuite à l'index (par défaut : non sauvegardés).
+    """
+    normalizer = Normalizer()
+    data = normalizer.normalize(data)
+    if params_path is not None:
+        normalizer.save(params_path)
+    return data
 
 class DataPreprocessor:
-    def __init__(self, file_path, ingredient_map_path):
+    def __init__(self, file_path, ingredient_map_path, output_dir="data/split_datasets", profiler=None,
+                 tokenizer="nltk"):
         """
         Classe pour charger, nettoyer, traiter et sauvegarder les données.
         :param file_path: Chemin vers le fichier de données brut
         :param ingredient_map_path: Chemin vers le fichier de mapping des ingrédients
+        :param output_dir: Dossier des datasets séparés (par colonne et en parties)
+        :param profiler: StageProfiler mesurant chaque étape (par défaut : temps et lignes, sans tracemalloc)
+        :param tokenizer: Tokenizer des colonnes 'steps' et 'name' : "nltk" ou "regex" (voir VectorizerPreparator)
         """
         self.file_path = file_path
         self.ingredient_map_path = ingredient_map_path
+        self.output_dir = output_dir
+        self.profiler = profiler if profiler is not None else StageProfiler()
+        self.tokenizer = tokenizer
         self.data = None
 
     def load_data(self):
         """
         Charge les données depuis le fichier CSV.
         """
-        self.data = pd.read_csv(self.file_path)
+        with self.profiler.stage("load_data") as stage:
+            self.data = pd.read_csv(self.file_path)
+            stage.rows_out = len(self.data)
         return self.data
 
     def save_data(self, output_path):
@@ -28,87 +60,111 @@ class DataPreprocessor:
         Sauvegarde les données prétraitées dans un fichier CSV.
         :param output_path: Chemin vers le fichier de sortie
         """
-        self.data.to_csv(output_path, index=False)
+        with self.profiler.stage("save_data", rows_in=len(self.data)) as stage:
+            self.data.to_csv(output_path, index=False)
+            stage.rows_out = len(self.data)
 
-    def preprocess(self):
+    def build_pipeline(self):
         """
-        Pipeline complet de prétraitement.
-        Étapes : Nettoyage des données, Feature Engineering, Préparation pour la vectorisation, Normalisation.
+        Définit le pipeline de prétraitement : un DAG d'étapes décrites par les colonnes qu'elles lisent
+        et écrivent. Les étapes indépendantes s'exécutent en parallèle : la préparation NLTK des colonnes
+        'steps' et 'name' dans un pool de processus, les autres étapes dans un pool de threads.
+        Étapes : Nettoyage des données, Feature Engineering, Statistiques des contributeurs,
+        Préparation pour la vectorisation, Normalisation.
+        :return: Le Pipeline, dans l'ordre d'une exécution séquentielle.
         """
-        # Étape 1 : Nettoyage des données préliminaire
-        cleaner = DataCleaning(self.data)
-        self.data = (
-            cleaner
-            .replace_zero_minutes(replacement_minutes=8)         # Remplace les 0 dans 'minutes'
-            .remove_long_recipes(max_minutes=24*60)            # Supprime les recettes avec un temps de préparation > 1 semaine
-            .map_ingredients(self.ingredient_map_path)         # Remplace les noms d'ingrédients par des catégories
-            .get_cleaned_data()
-        )
-
-        # Étape 2 : Feature engineering
-        feat_engineer = FeatEngineering(self.data)
-        self.data = (
-            feat_engineer
-            .extract_nutrition_features()                       # Crée les colonnes nutritionnelles
-            .drop_useless_features()                            # Supprime les colonnes inutiles
-            .log_transform_minutes()                            # Transforme 'minutes' en 'log_minutes'
-            .get_preprocessed_data()
-        )
-
-        # Supprime les lignes contenant des NaN après le Feature Engineering
-        cleaner = DataCleaning(self.data)
-        self.data = cleaner.handle_missing_values().get_cleaned_data()
-
-        # Étape 3 : Suppression des recettes riches en calories (après création des colonnes nutritionnelles)
-        self.data = (
-            DataCleaning(self.data)
-            .remove_high_calories_recipes(max_calories=10000)   # Supprime les recettes avec des calories > 10,000
-            .get_cleaned_data()
-        )
-
-        # Étape 4 : Préparation pour la vectorisation
-        vectorizer = VectorizerPreparator(self.data)
-        self.data = (
-            vectorizer
-            .process_ingredients()
-            .process_steps()
-            .process_name()
-            .process_tags()
-            .get_prepared_data()
-        )
-
-        # Étape 5 : Normalisation
-        normalizer = Normalizer()
-        self.data = normalizer.normalize(self.data)
-
-        # Supprime les lignes contenant des NaN à la toute fin du pipeline
-        cleaner = DataCleaning(self.data)
-        self.data = cleaner.handle_missing_values().get_cleaned_data()
-
-        # Étape finale : Séparation des colonnes en plusieurs datasets
-        splitter = DatasetSplitter(self.data, output_dir="data/split_datasets")
-        splitter.split_by_column(["tags", "steps", "ingredients", "name"])
-        
         numeric_columns = ["log_minutes", "calories", "total fat (PDV%)", "sugar (PDV%)",
                            "sodium (PDV%)", "protein (PDV%)", "saturated fat (PDV%)", "carbohydrates (PDV%)"]
-        
-        splitter.split_by_numeric_columns(numeric_columns)
-        # Liste des fichiers générés
-        datasets = [
-            "data/split_datasets/pp_recipes_tags.csv",
-            "data/split_datasets/pp_recipes_steps.csv",
-            "data/split_datasets/pp_recipes_ingredients.csv",
-            "data/split_datasets/pp_recipes_name.csv",
-            "data/split_datasets/pp_recipes_numerics.csv",
+        text_columns = ["tags", "steps", "ingredients", "name"]
+        splitter = partial(DatasetSplitter, output_dir=self.output_dir)
+        cube_builder = partial(ContributorCubeBuilder, output_dir=self.output_dir)
+        preparator = partial(VectorizerPreparator, tokenizer=self.tokenizer)
+        normalize = partial(_normalize, params_path=os.path.join(self.output_dir, NORMALIZER_FILE))
+
+        stages = [
+            # Étape 1 : Nettoyage des données préliminaire
+            Stage("cleaning.replace_zero_minutes",                      # Remplace les 0 dans 'minutes'
+                  builder_step(DataCleaning, "replace_zero_minutes", replacement_minutes=8),
+                  inputs=["minutes"], outputs=["minutes"], executor=INLINE),
+            Stage("cleaning.remove_long_recipes",                       # Supprime les recettes avec un temps de préparation > 1 jour
+                  builder_step(DataCleaning, "remove_long_recipes", max_minutes=24*60),
+                  inputs=["minutes"], filters_rows=True, executor=INLINE),
+            Stage("cleaning.map_ingredients",                           # Remplace les noms d'ingrédients par des catégories
+                  builder_step(DataCleaning, "map_ingredients", self.ingredient_map_path),
+                  inputs=["ingredients"], outputs=["ingredients"]),
+
+            # Étape 2 : Feature engineering
+            Stage("features.extract_nutrition_features",                # Crée les colonnes nutritionnelles
+                  builder_step(FeatEngineering, "extract_nutrition_features"),
+                  inputs=["nutrition"], outputs=NUTRITION_COLUMNS),
+            Stage("features.drop_useless_features",                     # Supprime les colonnes inutiles
+                  builder_step(FeatEngineering, "drop_useless_features"),
+                  inputs=[], drops=USELESS_COLUMNS, executor=INLINE),
+            Stage("features.log_transform_minutes",                     # Transforme 'minutes' en 'log_minutes'
+                  builder_step(FeatEngineering, "log_transform_minutes"),
+                  inputs=["minutes"], outputs=["log_minutes"], drops=["minutes"], executor=INLINE),
+
+            # Supprime les lignes contenant des NaN après le Feature Engineering (toutes les colonnes : barrière)
+            Stage("cleaning.handle_missing_values", builder_step(DataCleaning, "handle_missing_values"),
+                  inputs=None, filters_rows=True),
+
+            # Étape 3 : Suppression des recettes riches en calories (après création des colonnes nutritionnelles)
+            Stage("cleaning.remove_high_calories_recipes",              # Supprime les recettes avec des calories > 10,000
+                  builder_step(DataCleaning, "remove_high_calories_recipes", max_calories=10000),
+                  inputs=["calories"], filters_rows=True, executor=INLINE),
+
+            # Statistiques pré-agrégées des contributeurs (catégories d'ingrédients et tags des recettes nettoyées,
+            # avant leur jointure) : contributor_ingredients.npz et contributor_tags.npz
+            Stage("analytics.contributor_cubes", builder_step(cube_builder, "build_cubes", ["ingredients", "tags"]),
+                  inputs=["contributor_id", "ingredients", "tags"], row_wise=False),
+
+            # Étape 4 : Préparation pour la vectorisation (colonnes indépendantes)
+            Stage("vectorizer.process_ingredients", builder_step(preparator, "process_ingredients"),
+                  inputs=["ingredients"], outputs=["ingredients"]),
+            Stage("vectorizer.process_steps", builder_step(preparator, "process_steps"),
+                  inputs=["steps"], outputs=["steps"], executor=PROCESS),
+            Stage("vectorizer.process_name", builder_step(preparator, "process_name"),
+                  inputs=["name"], outputs=["name"], executor=PROCESS),
+            Stage("vectorizer.process_tags", builder_step(preparator, "process_tags"),
+                  inputs=["tags"], outputs=["tags"]),
+
+            # Étape 5 : Normalisation (statistiques calculées sur les lignes restantes, sauvegardées avec les datasets)
+            Stage("normalizer.normalize", normalize,
+                  inputs=numeric_columns, outputs=numeric_columns, row_wise=False),
+
+            # Supprime les lignes contenant des NaN à la toute fin du pipeline
+            Stage("cleaning.handle_missing_values_final", builder_step(DataCleaning, "handle_missing_values"),
+                  inputs=None, filters_rows=True),
         ]
 
-        # Diviser chaque dataset en 4 parties
-        for dataset_file in datasets:
-            splitter.split_into_parts(input_file=dataset_file, num_parts=4)
-
+        # Étape finale : Séparation des colonnes en plusieurs datasets, puis de chaque dataset en 4 parties
+        for column in text_columns:
+            stages.append(Stage(f"split.by_column.{column}", builder_step(splitter, "split_by_column", [column]),
+                                inputs=["id", column], row_wise=False))
+        stages.append(Stage("split.by_numeric_columns",
+                            builder_step(splitter, "split_by_numeric_columns", numeric_columns),
+                            inputs=["id"] + numeric_columns, row_wise=False))
+        for name in text_columns + ["numerics"]:
+            dataset_file = os.path.join(self.output_dir, f"pp_recipes_{name}.csv")
+            source = "split.by_numeric_columns" if name == "numerics" else f"split.by_column.{name}"
+            stages.append(Stage(f"split.into_parts.{os.path.basename(dataset_file)}",
+                                builder_step(splitter, "split_into_parts", input_file=dataset_file, num_parts=4),
+                                inputs=[], row_wise=False, after=[source]))
+        return Pipeline(stages)
+
+    def preprocess(self, stages=None, n_workers=None):
+        """
+        Pipeline complet de prétraitement (voir `build_pipeline`).
+        Chaque étape est mesurée par `self.profiler` (voir `self.profiler.report()`).
+        :param stages: Noms des étapes à exécuter, avec les étapes dont elles dépendent (par défaut : toutes).
+        :param n_workers: Nombre de threads et de processus (par défaut : nombre de coeurs ; 1 : exécution séquentielle).
+        :raises LookupError: Si une ressource NLTK de la préparation textuelle n'est pas installée,
+                             avant l'exécution de la première étape.
+        """
+        pipeline = self.build_pipeline()
+        if stages is not None:
+            pipeline = pipeline.subset(stages)
+        if any(stage.name in ("vectorizer.process_steps", "vectorizer.process_name") for stage in pipeline.stages):
+            nltk_resources.require("stopwords", *(["punkt_tab"] if self.tokenizer == "nltk" else []))
+        self.data = pipeline.run(self.data, n_workers=n_workers, profiler=self.profiler)
         return self.data
-
-
-
-
-
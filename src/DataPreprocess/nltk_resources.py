@@ -0,0 +1,79 @@
+# Ressources NLTK du prétraitement (stop words, modèle de découpage en phrases Punkt), lues localement
+# sans accès réseau : d'abord dans data/nltk_data (ou le dossier de la variable RECIPE_NLTK_DATA), puis
+# dans les dossiers standards de NLTK. Installation, une fois, avec accès réseau :
+#     python -m src.DataPreprocess.nltk_resources
+import os
+import sys
+import threading
+import nltk
+
+# Dossier local des ressources NLTK du projet
+NLTK_DATA_ENV = "RECIPE_NLTK_DATA"
+LOCAL_NLTK_DATA = os.path.join("data", "nltk_data")
+
+# Ressources utilisées : nom du paquet NLTK -> chemin recherché dans les dossiers de données
+RESOURCES = {
+    "stopwords": "corpora/stopwords",
+    "punkt_tab": "tokenizers/punkt_tab/english/",  # nltk.word_tokenize (découpage en phrases)
+}
+
+_lock = threading.Lock()
+_stop_words = None
+
+
+def local_data_dir():
+    """
+    Retourne le dossier local des ressources NLTK du projet.
+    """
+    return os.environ.get(NLTK_DATA_ENV, LOCAL_NLTK_DATA)
+
+
+def require(*names):
+    """
+    Vérifie que les ressources NLTK sont installées, sans accès réseau.
+    :param names: Noms des ressources (clés de RESOURCES).
+    :raises LookupError: Si une ressource est absente, avec la commande pour l'installer.
+    """
+    directory = os.path.abspath(local_data_dir())
+    if directory not in nltk.data.path:
+        nltk.data.path.insert(0, directory)
+    missing = []
+    for name in names:
+        try:
+            nltk.data.find(RESOURCES[name])
+        except LookupError:
+            missing.append(name)
+    if missing:
+        raise LookupError(
+            f"Ressources NLTK manquantes : {', '.join(missing)}. "
+            f"Installez-les dans {directory} avec : python -m src.DataPreprocess.nltk_resources"
+        )
+
+
+def stop_words():
+    """
+    Retourne l'ensemble des stop words anglais, chargé une seule fois par processus.
+    :raises LookupError: Si la ressource 'stopwords' est absente.
+    """
+    global _stop_words
+    with _lock:
+        if _stop_words is None:
+            require("stopwords")
+            from nltk.corpus import stopwords
+            _stop_words = frozenset(stopwords.words("english"))
+        return _stop_words
+
+
+def download(directory=None):
+    """
+    Télécharge les ressources NLTK du projet dans le dossier local (étape d'installation explicite).
+    :param directory: Dossier de destination (par défaut : `local_data_dir()`).
+    :return: True si toutes les ressources ont été installées.
+    """
+    directory = directory or local_data_dir()
+    os.makedirs(directory, exist_ok=True)
+    return all(nltk.download(name, download_dir=directory, quiet=True) for name in RESOURCES)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if download() else 1)
@@ -1,13 +1,131 @@
-from sklearn.preprocessing import StandardScaler
+import os
+import numpy as np
+
+# Variables numériques normalisées (centrées réduites)
+COLUMNS_TO_NORMALIZE = [
+    'log_minutes', 'calories', 'total fat (PDV%)', 'sugar (PDV%)',
+    'sodium (PDV%)', 'protein (PDV%)', 'saturated fat (PDV%)', 'carbohydrates (PDV%)'
+]
+
+# Fichier des paramètres de normalisation, sauvegardé avec les datasets prétraités
+NORMALIZER_FILE = "normalizer.npz"
+
 
 class Normalizer:
-    def __init__(self):
-        self.scaler = StandardScaler()
-
-    def normalize(self, data):
-        columns_to_normalize = [
-            'log_minutes', 'calories', 'total fat (PDV%)', 'sugar (PDV%)',
-            'sodium (PDV%)', 'protein (PDV%)', 'saturated fat (PDV%)', 'carbohydrates (PDV%)'
-        ]
-        data[columns_to_normalize] = self.scaler.fit_transform(data[columns_to_normalize])
-        return data
\ No newline at end of file
+    def __init__(self, columns=None):
+        """
+        Normalisation incrémentale des variables numériques : (x - moyenne) / écart-type, comme StandardScaler.
+        Les statistiques sont accumulées par lots (`partial_fit`, sans garder la table entière en mémoire),
+        sauvegardées avec les données prétraitées et réutilisées pour normaliser de nouvelles recettes.
+        :param columns: Colonnes à normaliser (par défaut : COLUMNS_TO_NORMALIZE).
+        """
+        self.columns = list(COLUMNS_TO_NORMALIZE if columns is None else columns)
+        self.n_samples = np.zeros(len(self.columns), dtype=np.int64)
+        self.mean = np.zeros(len(self.columns))
+        self._m2 = np.zeros(len(self.columns))  # Somme des carrés des écarts à la moyenne
+
+    @property
+    def var(self):
+        """Variance (biaisée, comme StandardScaler) de chaque colonne."""
+        return np.divide(self._m2, self.n_samples, out=np.zeros_like(self._m2), where=self.n_samples > 0)
+
+    @property
+    def scale(self):
+        """Écart-type de chaque colonne (1 pour une colonne constante, comme StandardScaler)."""
+        scale = np.sqrt(self.var)
+        scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+        return scale
+
+    def partial_fit(self, data):
+        """
+        Met à jour la moyenne et la variance avec un lot de lignes (fusion des statistiques par lot,
+        algorithme de Chan). Les valeurs manquantes sont ignorées.
+        :param data: DataFrame contenant les colonnes à normaliser.
+        """
+        values = data[self.columns].to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        n_batch = present.sum(axis=0)
+        if not n_batch.any():
+            return self
+        mean_batch = np.divide(np.nansum(values, axis=0), n_batch, out=np.zeros(len(self.columns)),
+                               where=n_batch > 0)
+        m2_batch = np.nansum((values - mean_batch) ** 2, axis=0)
+
+        n_total = self.n_samples + n_batch
+        delta = mean_batch - self.mean
+        ratio = np.divide(n_batch, n_total, out=np.zeros(len(self.columns)), where=n_total > 0)
+        self.mean = self.mean + delta * ratio
+        self._m2 = self._m2 + m2_batch + delta ** 2 * self.n_samples * ratio
+        self.n_samples = n_total
+        return self
+
+    def fit(self, chunks):
+        """
+        Calcule les statistiques sur une suite de lots, ex : `pd.read_csv(path, chunksize=100_000)`.
+        :param chunks: Itérable de DataFrames.
+        """
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    def transform(self, data):
+        """
+        Normalise les colonnes avec les statistiques apprises, en float32 : le calcul se fait sur place,
+        dans une seule copie float32 des colonnes.
+        :param data: DataFrame contenant les colonnes à normaliser (modifié).
+        :raises ValueError: Si les statistiques n'ont pas été calculées.
+        """
+        if not self.n_samples.any():
+            raise ValueError("Normalizer non entraîné : appelez partial_fit() ou chargez des paramètres.")
+        values = data[self.columns].to_numpy(dtype=np.float32, copy=True)
+        values -= self.mean.astype(np.float32)
+        values /= self.scale.astype(np.float32)
+        for position, column in enumerate(self.columns):
+            data[column] = values[:, position]
+        return data
+
+    def transform_value(self, column, value):
+        """
+        Normalise une valeur isolée d'une colonne (ex : une borne de filtre exprimée en unités brutes),
+        avec les mêmes opérations float32 que `transform` : une valeur égale à une donnée transformée
+        donne exactement la même valeur normalisée.
+        :param column: Colonne normalisée.
+        :param value: Valeur dans les unités de la colonne avant normalisation.
+        """
+        position = self.columns.index(column)
+        normalized = (np.float32(value) - np.float32(self.mean[position])) / np.float32(self.scale[position])
+        return float(normalized)
+
+    def normalize(self, data, chunk_size=None):
+        """
+        Calcule les statistiques sur les données (par lots de `chunk_size` lignes) puis les normalise.
+        :param data: DataFrame contenant les colonnes à normaliser (modifié).
+        :param chunk_size: Taille des lots de `partial_fit` (par défaut : un seul lot).
+        """
+        chunk_size = chunk_size or max(len(data), 1)
+        self.fit(data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+        return self.transform(data)
+
+    def save(self, path):
+        """
+        Sauvegarde les paramètres de normalisation dans un fichier .npz.
+        :param path: Chemin vers le fichier de sortie.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, columns=np.asarray(self.columns, dtype=str), n_samples=self.n_samples,
+                 mean=self.mean, m2=self._m2)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Charge des paramètres sauvegardés par `save` (un nouvel appel à `partial_fit` les complète).
+        :param path: Chemin vers le fichier .npz.
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            normalizer = cls(arrays["columns"].tolist())
+            normalizer.n_samples = arrays["n_samples"]
+            normalizer.mean = arrays["mean"]
+            normalizer._m2 = arrays["m2"]
+        return normalizer
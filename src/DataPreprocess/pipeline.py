@@ -0,0 +1,293 @@
+import os
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from src.DataPreprocess.stage_profiler import StageProfiler
+
+# Modes d'exécution d'une étape
+INLINE = "inline"      # Dans le thread de l'ordonnanceur (étapes très courtes)
+THREAD = "thread"      # Pool de threads (pandas, entrées/sorties)
+PROCESS = "process"    # Pool de processus (étapes en Python pur, comme la tokenisation NLTK)
+
+
+def _run_builder(builder_cls, method, args, kwargs, frame):
+    """
+    Exécute une méthode d'une classe de traitement (DataCleaning, FeatEngineering, VectorizerPreparator...)
+    sur un DataFrame et retourne son attribut `data`. Fonction de module : sérialisable pour le pool de processus.
+    """
+    builder = builder_cls(frame)
+    getattr(builder, method)(*args, **kwargs)
+    return builder.data
+
+
+def builder_step(builder_cls, method, *args, **kwargs):
+    """
+    Retourne la fonction d'une étape appelant `builder_cls(frame).method(*args, **kwargs)`.
+    :param builder_cls: Classe de traitement prenant un DataFrame et exposant un attribut `data`.
+    :param method: Nom de la méthode à exécuter.
+    """
+    return partial(_run_builder, builder_cls, method, args, kwargs)
+
+
+def _timed_call(func, frame, trace_memory=False):
+    """
+    Exécute la fonction d'une étape et mesure son temps écoulé, son temps CPU (du thread exécutant)
+    et le pic de mémoire résidente du processus exécutant (le processus principal ou un worker).
+    :param trace_memory: Si True, mesure aussi le pic d'allocations de l'étape avec tracemalloc (Mo).
+                         tracemalloc suit tout le processus : à n'activer que si aucune autre étape
+                         ne s'exécute en même temps dans ce processus.
+    :return: (résultat, temps écoulé, temps CPU, pic RSS, pic tracemalloc ou None).
+    """
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+    try:
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        result = func(frame)
+        wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+        peak_traced = (tracemalloc.get_traced_memory()[1] - traced_before) / 1e6 if trace_memory else None
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return result, wall, cpu, StageProfiler.peak_rss_mb(), peak_traced
+
+
+class Stage:
+    def __init__(self, name, func, inputs=None, outputs=(), drops=(), filters_rows=False, row_wise=True,
+                 after=(), executor=THREAD):
+        """
+        Étape du pipeline de prétraitement, définie par les colonnes qu'elle lit et qu'elle produit.
+        :param name: Nom unique de l'étape.
+        :param func: Fonction DataFrame -> DataFrame appliquée aux colonnes `inputs`.
+        :param inputs: Colonnes lues. None : toutes les colonnes (l'étape est alors une barrière
+                       qui attend toutes les étapes précédentes et que toutes les suivantes attendent).
+        :param outputs: Colonnes produites ou modifiées, reprises du résultat.
+        :param drops: Colonnes supprimées du DataFrame après l'étape.
+        :param filters_rows: Si True, l'étape supprime des lignes : seules les lignes du résultat sont conservées.
+        :param row_wise: False si le résultat dépend de l'ensemble des lignes (ex : une normalisation,
+                         l'écriture d'un fichier) : l'étape attend alors les filtres de lignes précédents.
+        :param after: Noms d'étapes à attendre en plus des dépendances déduites des colonnes.
+        :param executor: Mode d'exécution : INLINE, THREAD ou PROCESS.
+        """
+        if executor not in (INLINE, THREAD, PROCESS):
+            raise ValueError(f"Mode d'exécution inconnu : {executor}")
+        self.name = name
+        self.func = func
+        self.inputs = None if inputs is None else list(inputs)
+        self.outputs = list(outputs)
+        self.drops = list(drops)
+        self.filters_rows = filters_rows
+        self.row_wise = row_wise and not filters_rows
+        self.after = list(after)
+        self.executor = executor
+
+    @property
+    def is_barrier(self):
+        return self.inputs is None
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+class Pipeline:
+    def __init__(self, stages):
+        """
+        Pipeline de prétraitement sous forme de graphe orienté acyclique (DAG) d'étapes.
+
+        Les dépendances sont déduites de l'ordre de déclaration et des colonnes lues et écrites :
+        une étape attend la dernière étape ayant écrit une colonne qu'elle lit ou écrit, et les étapes
+        ayant lu une colonne qu'elle écrit ou supprime. Les étapes indépendantes (ex : les traitements
+        des colonnes 'steps' et 'name') s'exécutent en parallèle. Le résultat est identique à celui
+        d'une exécution séquentielle dans l'ordre de déclaration.
+        :param stages: Liste des étapes, dans l'ordre d'une exécution séquentielle.
+        :raises ValueError: Si deux étapes ont le même nom ou si une dépendance explicite est inconnue.
+        """
+        self.stages = list(stages)
+        self.by_name = {stage.name: stage for stage in self.stages}
+        if len(self.by_name) != len(self.stages):
+            raise ValueError("Les noms des étapes doivent être uniques.")
+        self.dependencies = self._resolve_dependencies()
+
+    def _resolve_dependencies(self):
+        """
+        Retourne, pour chaque étape, l'ensemble des noms des étapes qu'elle doit attendre.
+        """
+        dependencies = {}
+        last_writer = {}        # colonne -> dernière étape l'ayant écrite ou supprimée
+        readers = {}            # colonne -> étapes l'ayant lue depuis sa dernière écriture
+        last_barrier = None
+        filters = []            # filtres de lignes déclarés depuis la dernière barrière
+        whole_frame = []        # étapes non ligne à ligne déclarées depuis le dernier filtre
+        previous = []
+        for stage in self.stages:
+            unknown = [name for name in stage.after if name not in self.by_name]
+            if unknown:
+                raise ValueError(f"Dépendances inconnues pour {stage.name} : {unknown}")
+            depends = set(stage.after)
+            if stage.is_barrier:
+                depends.update(previous)
+            else:
+                if last_barrier is not None:
+                    depends.add(last_barrier)
+                for column in stage.inputs:
+                    if column in last_writer:
+                        depends.add(last_writer[column])
+                for column in stage.outputs + stage.drops:
+                    if column in last_writer:
+                        depends.add(last_writer[column])
+                    depends.update(readers.get(column, ()))
+                if stage.filters_rows:
+                    # Les filtres restent ordonnés entre eux et ne réduisent pas les lignes
+                    # d'une étape non ligne à ligne déclarée avant eux
+                    depends.update(filters[-1:])
+                    depends.update(whole_frame)
+                elif not stage.row_wise:
+                    depends.update(filters)
+            depends.discard(stage.name)
+            dependencies[stage.name] = depends
+
+            if stage.is_barrier:
+                last_barrier = stage.name
+                last_writer, readers, filters, whole_frame = {}, {}, [], []
+                if stage.filters_rows:
+                    filters = [stage.name]
+            else:
+                for column in stage.inputs:
+                    readers.setdefault(column, []).append(stage.name)
+                for column in stage.outputs + stage.drops:
+                    last_writer[column] = stage.name
+                    readers[column] = []
+                if stage.filters_rows:
+                    filters.append(stage.name)
+                    whole_frame = []
+                elif not stage.row_wise:
+                    whole_frame.append(stage.name)
+            previous.append(stage.name)
+        return dependencies
+
+    def subset(self, names, include_dependencies=True):
+        """
+        Retourne un pipeline limité à certaines étapes.
+        :param names: Noms des étapes à exécuter.
+        :param include_dependencies: Si True, ajoute les étapes dont elles dépendent (transitivement).
+                                     Sinon, le DataFrame fourni à `run` doit déjà contenir leurs entrées.
+        :raises ValueError: Si un nom d'étape est inconnu.
+        """
+        unknown = [name for name in names if name not in self.by_name]
+        if unknown:
+            raise ValueError(f"Étapes inconnues : {unknown}")
+        selected = set(names)
+        if include_dependencies:
+            pending = list(names)
+            while pending:
+                for dependency in self.dependencies[pending.pop()]:
+                    if dependency not in selected:
+                        selected.add(dependency)
+                        pending.append(dependency)
+        return Pipeline([stage for stage in self.stages if stage.name in selected])
+
+    def levels(self):
+        """
+        Retourne les étapes regroupées par niveau : les étapes d'un même niveau sont indépendantes.
+        """
+        depth = {}
+        for stage in self.stages:
+            depth[stage.name] = 1 + max((depth[name] for name in self.dependencies[stage.name]), default=-1)
+        levels = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for stage in self.stages:
+            levels[depth[stage.name]].append(stage.name)
+        return levels
+
+    @staticmethod
+    def _merge(data, stage, result):
+        """
+        Intègre le résultat d'une étape au DataFrame (alignement sur l'index des lignes restantes).
+        """
+        if stage.filters_rows:
+            data = data[data.index.isin(result.index)].copy()
+        for column in stage.outputs:
+            data[column] = result[column]
+        if stage.drops:
+            data = data.drop(columns=stage.drops, errors="ignore")
+        return data
+
+    def column_order(self, columns):
+        """
+        Retourne l'ordre des colonnes après une exécution séquentielle, pour un résultat
+        indépendant de l'ordre de fin des étapes parallèles.
+        """
+        order = list(columns)
+        for stage in self.stages:
+            order += [column for column in stage.outputs if column not in order]
+            order = [column for column in order if column not in stage.drops]
+        return order
+
+    def run(self, data, n_workers=None, profiler=None):
+        """
+        Exécute le pipeline : chaque étape est lancée dès que ses dépendances sont terminées,
+        dans le pool correspondant à son mode d'exécution.
+        :param data: DataFrame d'entrée.
+        :param n_workers: Taille des pools de threads et de processus (par défaut : nombre de coeurs).
+                          Avec 1, les étapes sont exécutées séquentiellement dans l'ordre de déclaration.
+        :param profiler: StageProfiler recevant les mesures de chaque étape. Avec `trace_memory=True`, le pic
+                         d'allocations (tracemalloc) est mesuré pour les étapes exécutées seules dans leur
+                         processus : toutes en exécution séquentielle ; sinon les étapes des processus
+                         workers et les étapes INLINE lancées quand aucune autre étape n'est en cours.
+        :return: Le DataFrame transformé.
+        """
+        profiler = profiler if profiler is not None else StageProfiler()
+        n_workers = n_workers or os.cpu_count() or 1
+        data = data.copy()  # Les fusions modifient le DataFrame en place
+        columns = list(data.columns)
+        if n_workers == 1:
+            for stage in self.stages:
+                frame = data if stage.is_barrier else data[stage.inputs]
+                result, wall, cpu, peak, traced = _timed_call(stage.func, frame, profiler.trace_memory)
+                data = self._merge(data, stage, result)
+                profiler.record(stage.name, len(frame), len(data), wall, cpu, peak, traced)
+            return data[[column for column in self.column_order(columns) if column in data.columns]]
+
+        pools = {THREAD: ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="preprocess")}
+        if any(stage.executor == PROCESS for stage in self.stages):
+            pools[PROCESS] = ProcessPoolExecutor(max_workers=n_workers)
+        remaining = {stage.name: set(self.dependencies[stage.name]) for stage in self.stages}
+        running = {}
+        try:
+            while remaining or running:
+                ready = [stage for stage in self.stages
+                         if stage.name in remaining and not remaining[stage.name]]
+                for stage in ready:
+                    del remaining[stage.name]
+                    # Copie des colonnes d'entrée : l'étape ne voit pas les fusions des étapes concurrentes
+                    frame = data.copy() if stage.is_barrier else data[stage.inputs].copy()
+                    if stage.executor == INLINE:
+                        # Pic d'allocations mesurable seulement si aucune étape ne tourne en parallèle
+                        result, wall, cpu, peak, traced = _timed_call(stage.func, frame,
+                                                                      profiler.trace_memory and not running)
+                        data = self._merge(data, stage, result)
+                        profiler.record(stage.name, len(frame), len(data), wall, cpu, peak, traced)
+                        for dependencies in remaining.values():
+                            dependencies.discard(stage.name)
+                    else:
+                        # Un worker de processus n'exécute qu'une étape à la fois : pic d'allocations mesurable
+                        future = pools[stage.executor].submit(_timed_call, stage.func, frame,
+                                                              profiler.trace_memory and stage.executor == PROCESS)
+                        running[future] = (stage, len(frame))
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, rows_in = running.pop(future)
+                    result, wall, cpu, peak, traced = future.result()
+                    data = self._merge(data, stage, result)
+                    profiler.record(stage.name, rows_in, len(data), wall, cpu, peak, traced)
+                    for dependencies in remaining.values():
+                        dependencies.discard(stage.name)
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True, cancel_futures=True)
+        return data[[column for column in self.column_order(columns) if column in data.columns]]
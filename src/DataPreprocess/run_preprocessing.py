@@ -4,10 +4,14 @@ if __name__ == "__main__":
     file_path = "data/Raw_recipes.csv"
     ingredient_map_path = "data/ingr_map.csv"
     output_path = "data/pp_recipes.csv"
+    profile_path = "data/preprocessing_profile.json"
 
     preprocessor = DataPreprocessor(file_path, ingredient_map_path)
     preprocessor.load_data()
     preprocessor.preprocess()
     preprocessor.save_data(output_path)
+    preprocessor.profiler.save_report(profile_path)
 
-    print("Préprocessing terminé. Données sauvegardées dans :", output_path)
\ No newline at end of file
+    print("Préprocessing terminé. Données sauvegardées dans :", output_path)
+    print(preprocessor.profiler.summary())
+    print("Profil des étapes sauvegardé dans :", profile_path)
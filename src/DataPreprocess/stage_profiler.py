@@ -0,0 +1,147 @@
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class StageRecord:
+    def __init__(self, name, rows_in=None):
+        """
+        Mesures d'une étape du pipeline de prétraitement.
+        :param name: Nom de l'étape (ex : 'cleaning.remove_long_recipes').
+        :param rows_in: Nombre de lignes en entrée de l'étape.
+        """
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.peak_traced_mb = None
+        self.peak_rss_mb = None
+
+    def to_dict(self):
+        """
+        Retourne les mesures de l'étape sous forme de dictionnaire (sérialisable en JSON).
+        """
+        return {
+            "stage": self.name,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "peak_traced_mb": self.peak_traced_mb,
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+
+
+class StageProfiler:
+    def __init__(self, trace_memory=False):
+        """
+        Classe pour profiler les étapes du pipeline de prétraitement : temps écoulé, temps CPU,
+        lignes en entrée et en sortie, et pic de mémoire de chaque étape.
+        :param trace_memory: Si True, mesure le pic d'allocations de chaque étape avec tracemalloc
+                             (précis, mais ralentit les étapes en Python pur comme la tokenisation).
+                             Sinon, seul le pic de mémoire résidente du processus est relevé.
+        """
+        self.trace_memory = trace_memory
+        self.records = []
+
+    @staticmethod
+    def peak_rss_mb():
+        """
+        Retourne le pic de mémoire résidente du processus depuis son démarrage (Mo).
+        """
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sous macOS, en kilo-octets sous Linux
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """
+        Mesure le bloc de code d'une étape. Le nombre de lignes en sortie est à renseigner
+        dans l'enregistrement retourné (`stage.rows_out = len(data)`).
+        :param name: Nom de l'étape.
+        :param rows_in: Nombre de lignes en entrée de l'étape.
+        """
+        record = StageRecord(name, rows_in)
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - wall_start
+            record.cpu_seconds = time.process_time() - cpu_start
+            if self.trace_memory:
+                record.peak_traced_mb = (tracemalloc.get_traced_memory()[1] - traced_before) / 1e6
+            if started_tracing:
+                tracemalloc.stop()
+            record.peak_rss_mb = self.peak_rss_mb()
+            self.records.append(record)
+
+    def run(self, name, builder, method, *args, **kwargs):
+        """
+        Exécute une méthode d'une classe de traitement qui transforme son attribut `data`
+        (DataCleaning, FeatEngineering, VectorizerPreparator) et mesure l'étape.
+        :param name: Nom de l'étape.
+        :param builder: Instance de la classe de traitement.
+        :param method: Nom de la méthode à exécuter.
+        :return: Le résultat de la méthode (le builder, pour chaîner les appels).
+        """
+        with self.stage(name, rows_in=len(builder.data)) as record:
+            result = getattr(builder, method)(*args, **kwargs)
+            record.rows_out = len(builder.data)
+        return result
+
+    def record(self, name, rows_in, rows_out, wall_seconds, cpu_seconds, peak_rss_mb=None, peak_traced_mb=None):
+        """
+        Enregistre une étape mesurée ailleurs (ex : dans un thread ou un processus du pipeline).
+        Le temps CPU est celui du thread ayant exécuté l'étape, le pic de mémoire celui de son processus
+        (par défaut : le processus courant) et, s'il a été mesuré, le pic d'allocations de l'étape (tracemalloc).
+        """
+        record = StageRecord(name, rows_in)
+        record.rows_out = rows_out
+        record.wall_seconds = wall_seconds
+        record.cpu_seconds = cpu_seconds
+        record.peak_rss_mb = self.peak_rss_mb() if peak_rss_mb is None else peak_rss_mb
+        record.peak_traced_mb = peak_traced_mb
+        self.records.append(record)
+        return record
+
+    def report(self):
+        """
+        Retourne le rapport du profilage : les mesures de chaque étape et les totaux.
+        """
+        stages = [record.to_dict() for record in self.records]
+        return {
+            "stages": stages,
+            "total_wall_seconds": sum(stage["wall_seconds"] for stage in stages),
+            "total_cpu_seconds": sum(stage["cpu_seconds"] for stage in stages),
+            "peak_rss_mb": max((stage["peak_rss_mb"] for stage in stages), default=None),
+        }
+
+    def save_report(self, output_path):
+        """
+        Sauvegarde le rapport du profilage dans un fichier JSON.
+        :param output_path: Chemin vers le fichier de sortie.
+        """
+        with open(output_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def summary(self):
+        """
+        Retourne un tableau texte des étapes, triées dans l'ordre d'exécution.
+        """
+        lines = [f"{'étape':<45} {'lignes':>17} {'temps (s)':>10} {'CPU (s)':>9} {'pic (Mo)':>9}"]
+        for record in self.records:
+            rows = f"{record.rows_in}->{record.rows_out}" if record.rows_in is not None else ""
+            peak = record.peak_traced_mb if record.peak_traced_mb is not None else record.peak_rss_mb
+            lines.append(f"{record.name:<45} {rows:>17} {record.wall_seconds:>10.3f} "
+                         f"{record.cpu_seconds:>9.3f} {peak:>9.1f}")
+        return "\n".join(lines)
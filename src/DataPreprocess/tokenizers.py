@@ -0,0 +1,51 @@
+import re
+
+# Caractères que le tokenizer de NLTK isole toujours (ponctuation, parenthèses, guillemets, tirets longs)
+_SEPARATORS = r"""\s;@#$%&?!*()\[\]{}<>"`«“‘„»”’‒-―"""
+
+# Début d'un séparateur : un mot qui le précède immédiatement reste un token distinct
+_BOUNDARY = (
+    rf"(?:$|[{_SEPARATORS}]"
+    r"|--|\.\.|''"                                  # tiret double, points de suspension, guillemets doubles
+    r"|[,:](?!\d)"                                  # virgule et deux-points, sauf entre chiffres (1,5 ; 10:30)
+    r"|\.[\]\)}>\"'»”’]*(?:\s|$))"                  # point final de phrase
+)
+
+# Fin d'un séparateur : un mot qui le suit immédiatement reste un token distinct
+_LEFT_BOUNDARY = (
+    rf"(?:(?<![^{_SEPARATORS}])"                    # début du texte ou séparateur
+    r"|(?<=--)|(?<=\.\.)|(?<='')"
+    r"|(?<=[,:])(?!\d)"
+    r"|(?<=(?<!\w)')(?!(?:re|ve|ll|m|t|s|d|n)\b))"  # apostrophe ouvrante (hors contractions)
+)
+
+_TOKEN = re.compile(
+    # Contractions sans apostrophe (MacIntyre) découpées par NLTK entre deux limites de mot : cannot -> can not
+    rf"\b((?i:cannot|gimme|gonna|gotta|lemme)(?:\b|(?=n't|N'T))|(?i:wanna)(?={_BOUNDARY}))"
+    rf"|{_LEFT_BOUNDARY}(?:"
+    rf"([^\W_]+?)(?=(?:n't|N'T)'?{_BOUNDARY})"                                # do|n't
+    rf"|([^\W_]+)(?={_BOUNDARY}|'(?:[sSmMdD]|ll|LL|re|RE|ve|VE)?'?{_BOUNDARY})"  # it|'s, cooks|'
+    r")"
+)
+
+
+def regex_tokenize(text):
+    """
+    Découpe un texte en tokens alphanumériques en une seule passe d'expression régulière compilée.
+
+    Le résultat est celui de `nltk.word_tokenize` suivi du filtre `str.isalnum` de VectorizerPreparator :
+    la ponctuation isolée par NLTK sépare les mots, alors qu'un mot collé à un tiret simple, une barre
+    ou un point interne forme avec eux un token non alphanumérique, écarté (ex : '9x13-inch', '1/2').
+    Une fin de phrase est un point suivi d'un espace ; les abréviations reconnues par le modèle Punkt
+    ne sont pas distinguées, pas plus que quelques formes collées sans usage dans une recette
+    (ex : "gonna'tis", "it's'" en fin de ligne).
+    :param text: Texte à découper.
+    :return: Liste des tokens alphanumériques, dans l'ordre du texte.
+    """
+    tokens = []
+    for contraction, before_contraction, word in _TOKEN.findall(text):
+        if contraction:
+            tokens += [contraction[:3], contraction[3:]]
+        else:
+            tokens.append(before_contraction or word)
+    return tokens
@@ -1,21 +1,32 @@
 import ast
 import nltk
+import pandas as pd
 from nltk.stem import SnowballStemmer
-from nltk.corpus import stopwords
+from src.DataPreprocess import nltk_resources
+from src.DataPreprocess.tokenizers import regex_tokenize
 
-# Télécharger les stop words si nécessaire
-nltk.download("stopwords")
-nltk.download("punkt")
+# Tokenizers disponibles : découpage NLTK de référence, ou expression régulière compilée équivalente
+# après le filtre de la ponctuation (voir tokenizers.regex_tokenize), plusieurs fois plus rapide
+TOKENIZERS = ("nltk", "regex")
 
 class VectorizerPreparator:
-    def __init__(self, data):
+    def __init__(self, data, tokenizer="nltk"):
         """
         Classe pour préparer les données textuelles pour la vectorisation.
         :param data: DataFrame contenant les colonnes textuelles à transformer.
+        :param tokenizer: Tokenizer des colonnes 'steps' et 'name' : "nltk" (nltk.word_tokenize)
+                          ou "regex" (mêmes tokens alphanumériques en une seule passe).
+        :raises ValueError: Si le tokenizer est inconnu.
+        :raises LookupError: Si une ressource NLTK nécessaire n'est pas installée (voir nltk_resources).
         """
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Tokenizer inconnu : {tokenizer} (valeurs possibles : {', '.join(TOKENIZERS)})")
+        if tokenizer == "nltk":
+            nltk_resources.require("punkt_tab")
         self.data = data.copy()
+        self.tokenize = regex_tokenize if tokenizer == "regex" else nltk.word_tokenize
         self.stemmer = SnowballStemmer("english")
-        self.stop_words = set(stopwords.words("english"))
+        self.stop_words = nltk_resources.stop_words()
 
     def process_ingredients(self):
         """
@@ -37,7 +48,7 @@ class VectorizerPreparator:
                 # Joindre les étapes
                 text = " ".join(list_text)
                 # Tokeniser
-                tokens = nltk.word_tokenize(text)
+                tokens = self.tokenize(text)
                 # Filtrer les stop words et la ponctuation, mais garder les nombres
                 filtered_tokens = [
                     word for word in tokens 
@@ -62,7 +73,7 @@ class VectorizerPreparator:
         if "name" in self.data.columns:
             def process_name_stemming(string_name):
                 # Tokeniser
-                tokens = nltk.word_tokenize(string_name)
+                tokens = self.tokenize(string_name)
                 # Supprimer les stop words et la ponctuation
                 filtered_tokens = [word for word in tokens if word.isalpha() and word not in self.stop_words]
                 # Appliquer le stemming
@@ -81,6 +92,34 @@ class VectorizerPreparator:
             self.data["tags"] = self.data["tags"].apply(lambda x: " ".join(ast.literal_eval(x)))
         return self
 
+    @classmethod
+    def prepare_query(cls, query, tokenizer="nltk"):
+        """
+        Applique à une requête en texte libre la même normalisation que celle des recettes
+        (stemming et stop words pour 'name' et 'steps', texte brut pour 'tags' et 'ingredients').
+        :param query: Texte libre appliqué à tous les champs, ou dictionnaire {champ: texte}.
+        :param tokenizer: Tokenizer utilisé au prétraitement des recettes ("nltk" ou "regex").
+        :return: Dictionnaire {champ: texte normalisé}.
+        """
+        fields = query if isinstance(query, dict) else dict.fromkeys(("name", "tags", "steps", "ingredients"), query)
+        # Mise au format des colonnes brutes : listes sérialisées pour 'steps' et 'tags', liste pour 'ingredients'
+        raw = {
+            "name": lambda text: text,
+            "steps": lambda text: repr([text]),
+            "tags": lambda text: repr([text]),
+            "ingredients": lambda text: [text],
+        }
+        data = pd.DataFrame({field: [raw[field](text)] for field, text in fields.items() if field in raw})
+        prepared = (
+            cls(data, tokenizer=tokenizer)
+            .process_name()
+            .process_steps()
+            .process_tags()
+            .process_ingredients()
+            .get_prepared_data()
+        )
+        return prepared.iloc[0].to_dict()
+
     def get_prepared_data(self):
         """
         Retourne le DataFrame préparé pour la vectorisation.
@@ -31,3 +31,33 @@ COMBINED_WEIGHTS = {
 
 TOP_N = 100  # Nombre de recettes similaires
 
+# Paramètres des vectoriseurs par champ (élagage du vocabulaire et type des valeurs).
+# min_df=2 supprime les hapax : un terme présent dans une seule recette ne contribue
+# à aucune similarité entre deux recettes différentes.
+VECTORIZER_PARAMS = {
+    "name": {"min_df": 1, "max_df": 1.0, "max_features": None},
+    "tags": {"min_df": 1, "max_df": 1.0, "max_features": None},
+    "steps": {"min_df": 2, "max_df": 1.0, "max_features": None},
+    "ingredients": {"min_df": 1, "max_df": 1.0, "max_features": None},
+}
+VECTORIZER_DTYPE = "float32"
+
+# Mode de vectorisation du RecipeFinder :
+# - "vocabulary" : vocabulaire appris (TfidfVectorizer / CountVectorizer), à réentraîner pour tout ajout ;
+# - "hashing" : hachage des termes et IDF incrémental, permet l'ajout de recettes sans réentraînement.
+VECTORIZER_MODE = "vocabulary"
+HASHING_FEATURES = 2 ** 20
+
+# Nombre de threads de la recherche exacte répartie par blocs de lignes (1 : recherche séquentielle,
+# None : un thread par coeur). Désactivée par défaut : l'accélération multi-coeurs reste à mesurer
+# (python -m benchmarks.bench_sharded_scoring) sur la machine de production avant de l'activer.
+SCORING_WORKERS = 1
+
+# Signatures MinHash des ensembles d'ingrédients, construites pendant preprocess() et utilisées
+# comme préfiltre LSH des candidats (find_similar_recipes(..., prefilter=True)). 0 : désactivé.
+MINHASH_PERMUTATIONS = 0
+MINHASH_BANDS = 32
+
+# Moyennes et écarts-types des variables numériques calculés au prétraitement (Normalizer) :
+# les recettes ajoutées à l'index (ingest_recipes) sont normalisées comme celles du dataset
+NORMALIZER_PATH = "data/split_datasets/normalizer.npz"
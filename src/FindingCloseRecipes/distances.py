@@ -13,6 +13,67 @@ class DistanceCalculator:
         weighted_squared_diff = squared_diff * weights_array
         return np.sqrt(np.sum(weighted_squared_diff, axis=1))
 
+    @staticmethod
+    def squared_norms(matrix):
+        """
+        Calcule la norme euclidienne au carré de chaque ligne d'une matrice dense.
+        """
+        return np.einsum("ij,ij->i", matrix, matrix)
+
+    @staticmethod
+    def scaled_euclidean_distance(scaled_matrix, squared_norms, query_indices, start=0, stop=None):
+        """
+        Calcule la distance euclidienne pondérée entre des recettes requêtes et toutes les recettes,
+        pour une matrice déjà multipliée par la racine des poids.
+
+        Utilise le développement ||a - b||² = ||a||² + ||b||² - 2 a.b : le produit scalaire est
+        un seul produit matriciel (GEMM, BLAS) et aucun tableau (n, d) temporaire n'est créé.
+
+        :param scaled_matrix: Matrice (n, d) contiguë des variables multipliées par sqrt(poids).
+        :param squared_norms: Normes au carré des lignes de `scaled_matrix` (précalculées).
+        :param query_indices: Indice (int) ou indices (tableau) des recettes requêtes.
+        :param start: Première ligne du bloc de recettes comparées (par défaut : 0).
+        :param stop: Fin (exclue) du bloc de recettes comparées (par défaut : n).
+        :return: Distances de forme (m,) pour un indice, (len(query_indices), m) pour plusieurs,
+                 où m = stop - start.
+        """
+        single = np.isscalar(query_indices)
+        query_indices = np.atleast_1d(query_indices)
+        queries = scaled_matrix[query_indices]
+        squared = scaled_matrix[start:stop] @ queries.T           # (m, b) : GEMM
+        squared *= -2
+        squared += squared_norms[start:stop, np.newaxis]
+        squared += squared_norms[query_indices][np.newaxis, :]
+        np.maximum(squared, 0, out=squared)                       # Erreurs d'arrondi négatives
+        distances = np.sqrt(squared, out=squared).T
+        return distances[0] if single else distances
+
+    @staticmethod
+    def weighted_euclidean_distance(matrix, squared_matrix, query_indices, weights_array, start=0, stop=None):
+        """
+        Calcule la distance euclidienne pondérée pour des poids quelconques, sans remettre à l'échelle la matrice :
+        ||a - b||²_w = (a²).w + (b²).w - 2 (a * w).b, soit deux produits matrice-vecteur et un GEMM.
+
+        :param matrix: Matrice (n, d) contiguë des variables numériques.
+        :param squared_matrix: Carrés terme à terme de `matrix` (précalculés).
+        :param query_indices: Indice (int) ou indices (tableau) des recettes requêtes.
+        :param weights_array: Poids (d,) de chaque variable.
+        :param start: Première ligne du bloc de recettes comparées (par défaut : 0).
+        :param stop: Fin (exclue) du bloc de recettes comparées (par défaut : n).
+        :return: Distances de forme (m,) pour un indice, (len(query_indices), m) pour plusieurs.
+        """
+        single = np.isscalar(query_indices)
+        query_indices = np.atleast_1d(query_indices)
+        weights_array = np.asarray(weights_array, dtype=matrix.dtype)
+        queries = matrix[query_indices]
+        squared = matrix[start:stop] @ (queries * weights_array).T  # (m, b) : GEMM
+        squared *= -2
+        squared += (squared_matrix[start:stop] @ weights_array)[:, np.newaxis]
+        squared += (squared_matrix[query_indices] @ weights_array)[np.newaxis, :]
+        np.maximum(squared, 0, out=squared)
+        distances = np.sqrt(squared, out=squared).T
+        return distances[0] if single else distances
+
     @staticmethod
     def cosine_distance_sparse(recipe_id, tfidf_matrix, id_to_index, index_to_id):
         """
@@ -35,6 +96,46 @@ class DistanceCalculator:
         distances = 1 - cosine_similarities
 
         return distances
-    
-    
 
+    @staticmethod
+    def cosine_distance_rows(tfidf_matrix, row_indices, start=0, stop=None):
+        """
+        Calcule la distance cosinus entre plusieurs lignes d'une matrice creuse et toutes ses lignes.
+
+        :param tfidf_matrix: Matrice creuse (n, v).
+        :param row_indices: Indices des lignes requêtes.
+        :param start: Première ligne du bloc comparé (par défaut : 0).
+        :param stop: Fin (exclue) du bloc comparé (par défaut : n).
+        :return: Matrice dense (len(row_indices), stop - start) des distances.
+        """
+        block = tfidf_matrix if start == 0 and stop is None else tfidf_matrix[start:stop]
+        return 1 - cosine_similarity(tfidf_matrix[row_indices], block)
+
+    @staticmethod
+    def cosine_distance_to(tfidf_matrix, row_index, candidate_rows):
+        """
+        Calcule la distance cosinus entre une ligne d'une matrice creuse et des lignes candidates.
+
+        :return: Distances de forme (len(candidate_rows),).
+        """
+        return 1 - cosine_similarity(tfidf_matrix[[row_index]], tfidf_matrix[candidate_rows])[0]
+
+    @staticmethod
+    def weighted_euclidean_distance_to(matrix, row_index, candidate_rows, weights_array):
+        """
+        Calcule la distance euclidienne pondérée entre une recette et des recettes candidates.
+
+        :return: Distances de forme (len(candidate_rows),).
+        """
+        differences = matrix[candidate_rows] - matrix[row_index]
+        return np.sqrt((differences * differences) @ np.asarray(weights_array, dtype=matrix.dtype))
+
+    @staticmethod
+    def cosine_distance_queries(query_matrix, tfidf_matrix):
+        """
+        Calcule la distance cosinus entre des vecteurs requêtes hors index (ex : texte libre vectorisé)
+        et toutes les lignes d'une matrice creuse.
+
+        :return: Matrice dense (b, n) des distances.
+        """
+        return 1 - cosine_similarity(query_matrix, tfidf_matrix)
@@ -0,0 +1,110 @@
+# filters.py
+import numpy as np
+from src.FindingCloseRecipes.config import NUMERIC_FEATURES
+
+# Variables brutes dont la variable de l'index est une transformation (voir FeatEngineering.log_transform_minutes)
+RAW_FEATURES = {"minutes": ("log_minutes", np.log)}
+
+
+class RecipeFilter:
+    """
+    Prédicats de filtrage des recettes proches : intervalles sur les variables numériques,
+    ingrédients et tags requis ou exclus.
+
+    Le filtre est converti en masque booléen sur les lignes de l'index (voir `RecipeIndex.filter_mask`),
+    appliqué avant la sélection des top_n : une recherche filtrée retourne les top_n recettes
+    les plus proches parmi celles qui respectent le filtre, et non un sous-ensemble des top_n.
+    """
+
+    def __init__(self, numeric_ranges=None, required_ingredients=None, excluded_ingredients=None,
+                 required_tags=None, excluded_tags=None):
+        """
+        :param numeric_ranges: Dictionnaire {variable: (min, max)} sur NUMERIC_FEATURES, bornes incluses
+                               (None : pas de borne). Les valeurs sont dans les unités du dataset de l'index
+                               (variables normalisées pour pp_recipes).
+        :param required_ingredients: Ingrédients que chaque recette doit contenir (tous).
+        :param excluded_ingredients: Ingrédients qu'aucune recette ne doit contenir.
+        :param required_tags: Tags que chaque recette doit porter (tous).
+        :param excluded_tags: Tags qu'aucune recette ne doit porter.
+        :raises ValueError: Si une variable numérique est inconnue ou si un intervalle est vide.
+
+        Pour exprimer les intervalles en unités brutes (minutes, % des apports journaliers), voir `from_raw_ranges`.
+        """
+        self.numeric_ranges = {}
+        for feature, (low, high) in (numeric_ranges or {}).items():
+            if feature not in NUMERIC_FEATURES:
+                raise ValueError(f"Variable numérique inconnue : {feature}")
+            if low is not None and high is not None and low > high:
+                raise ValueError(f"Intervalle vide pour {feature} : ({low}, {high})")
+            self.numeric_ranges[feature] = (low, high)
+        self.required_ingredients = tuple(sorted(set(required_ingredients or ())))
+        self.excluded_ingredients = tuple(sorted(set(excluded_ingredients or ())))
+        self.required_tags = tuple(sorted(set(required_tags or ())))
+        self.excluded_tags = tuple(sorted(set(excluded_tags or ())))
+
+    @classmethod
+    def from_raw_ranges(cls, raw_ranges, normalizer, **filters):
+        """
+        Construit un filtre à partir d'intervalles en unités brutes, ex : {"minutes": (None, 30)}
+        pour les recettes de moins de 30 minutes. Les bornes sont converties dans les unités de l'index :
+        logarithme pour 'minutes' (-> 'log_minutes'), puis normalisation avec les paramètres du prétraitement.
+        :param raw_ranges: Dictionnaire {variable: (min, max)}, variables de NUMERIC_FEATURES ou 'minutes'.
+        :param normalizer: Normalizer du dataset de l'index (voir run_recipe_finder.load_normalizer).
+        :param filters: Autres critères du filtre (required_ingredients, excluded_tags...).
+        :raises ValueError: Si une variable est inconnue, si un intervalle est vide ou si une durée
+                            n'est pas strictement positive.
+        """
+        numeric_ranges = {}
+        for feature, bounds in raw_ranges.items():
+            feature, transform = RAW_FEATURES.get(feature, (feature, None))
+            if feature not in NUMERIC_FEATURES:
+                raise ValueError(f"Variable numérique inconnue : {feature}")
+            converted = []
+            for bound in bounds:
+                if bound is not None and transform is not None:
+                    if bound <= 0:
+                        raise ValueError(f"La borne de {feature} doit être strictement positive : {bound}")
+                    bound = transform(bound)
+                converted.append(None if bound is None else normalizer.transform_value(feature, bound))
+            numeric_ranges[feature] = tuple(converted)
+        return cls(numeric_ranges=numeric_ranges, **filters)
+
+    def terms(self):
+        """Retourne les termes par champ textuel : {champ: (requis, exclus)}."""
+        return {
+            "ingredients": (self.required_ingredients, self.excluded_ingredients),
+            "tags": (self.required_tags, self.excluded_tags),
+        }
+
+    def key(self):
+        """Clé hashable et canonique du filtre (cache des masques et des résultats)."""
+        return (
+            tuple(sorted(self.numeric_ranges.items())),
+            self.required_ingredients,
+            self.excluded_ingredients,
+            self.required_tags,
+            self.excluded_tags,
+        )
+
+    def is_empty(self):
+        return not any(self.key())
+
+    def __eq__(self, other):
+        return isinstance(other, RecipeFilter) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"RecipeFilter{self.key()}"
+
+    def numeric_mask(self, numeric_matrix):
+        """Masque des lignes dont les variables numériques sont dans les intervalles."""
+        mask = np.ones(len(numeric_matrix), dtype=bool)
+        for feature, (low, high) in self.numeric_ranges.items():
+            column = numeric_matrix[:, NUMERIC_FEATURES.index(feature)]
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        return mask
@@ -0,0 +1,132 @@
+# id_lookup.py
+import numpy as np
+
+
+class IdLookup:
+    """
+    Correspondance identifiant de recette -> position de ligne dans les matrices de l'index.
+
+    Les identifiants étant des entiers assez denses, la correspondance est un tableau NumPy
+    à adressage direct (`table[recipe_id] = ligne`, -1 si absent). Si les identifiants sont
+    trop épars (ou négatifs), une recherche dichotomique sur un tableau trié est utilisée.
+    Les recherches sont vectorisées : un lot d'identifiants est résolu en une seule opération.
+    """
+
+    def __init__(self, ids, rows=None, max_direct_ratio=4):
+        """
+        :param ids: Identifiants des recettes (entiers, sans doublon).
+        :param rows: Position de ligne de chaque identifiant (par défaut : 0..n-1).
+        :param max_direct_ratio: Rapport maximal (plus grand identifiant / nombre d'identifiants)
+                                 pour utiliser l'adressage direct.
+        :raises ValueError: Si les identifiants contiennent des doublons.
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.rows = np.arange(len(self.ids), dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        self.max_direct_ratio = max_direct_ratio
+        self._table = None
+        self._sorted_ids = None
+        self._sorted_rows = None
+
+        n = len(self.ids)
+        if n and self.ids.min() >= 0 and self.ids.max() < max_direct_ratio * max(n, 256):
+            row_dtype = np.int32 if n and self.rows.max() <= np.iinfo(np.int32).max else np.int64
+            self._table = np.full(int(self.ids.max()) + 1, -1, dtype=row_dtype)
+            self._table[self.ids] = self.rows
+            duplicated = np.count_nonzero(self._table >= 0) != n
+        else:
+            order = np.argsort(self.ids, kind="stable")
+            self._sorted_ids = self.ids[order]
+            self._sorted_rows = self.rows[order]
+            duplicated = bool(np.any(self._sorted_ids[1:] == self._sorted_ids[:-1]))
+        if duplicated:
+            raise ValueError("Les identifiants de recette doivent être uniques.")
+
+    @property
+    def direct(self):
+        """True si la correspondance utilise l'adressage direct."""
+        return self._table is not None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def lookup(self, recipe_ids):
+        """
+        Retourne les positions de lignes d'un lot d'identifiants (-1 pour les identifiants absents).
+        """
+        recipe_ids = np.asarray(recipe_ids)
+        if recipe_ids.dtype.kind not in "iu":
+            if recipe_ids.dtype.kind != "f" or not np.all(np.mod(recipe_ids, 1) == 0):
+                return np.full(recipe_ids.shape, -1, dtype=np.int64)
+        recipe_ids = recipe_ids.astype(np.int64, copy=False)
+
+        if self._table is not None:
+            in_range = (recipe_ids >= 0) & (recipe_ids < len(self._table))
+            return np.where(in_range, self._table[np.where(in_range, recipe_ids, 0)], -1).astype(np.int64)
+        if not len(self._sorted_ids):
+            return np.full(recipe_ids.shape, -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self._sorted_ids, recipe_ids), len(self._sorted_ids) - 1)
+        found = self._sorted_ids[positions] == recipe_ids
+        return np.where(found, self._sorted_rows[positions], -1)
+
+    def contains(self, recipe_ids):
+        """Masque booléen des identifiants présents."""
+        return self.lookup(recipe_ids) >= 0
+
+    def __contains__(self, recipe_id):
+        return np.ndim(recipe_id) == 0 and bool(self.lookup(recipe_id) >= 0)
+
+    def rows_of(self, recipe_ids):
+        """
+        Retourne les positions de lignes d'un lot d'identifiants, validés en une seule fois.
+
+        :raises ValueError: Si un identifiant est introuvable.
+        """
+        rows = self.lookup(recipe_ids)
+        missing = rows < 0
+        if np.any(missing):
+            unknown = np.asarray(recipe_ids)[missing]
+            raise ValueError(f"Identifiants de recette introuvables : {unknown.tolist()}")
+        return rows
+
+    def row(self, recipe_id):
+        """
+        Retourne la position de ligne d'un identifiant.
+
+        :raises ValueError: Si l'identifiant est introuvable.
+        """
+        if self._table is not None and isinstance(recipe_id, (int, np.integer)) and 0 <= recipe_id < len(self._table):
+            row = self._table[recipe_id]  # Accès direct, sans conversion en tableau
+        else:
+            row = self.lookup(recipe_id) if np.ndim(recipe_id) == 0 else -1
+        if row < 0:
+            raise ValueError("Identifiant de recette introuvable.")
+        return int(row)
+
+    def __getitem__(self, recipe_ids):
+        if np.ndim(recipe_ids) == 0:
+            return self.row(recipe_ids)
+        return self.rows_of(recipe_ids)
+
+    def with_added(self, recipe_ids, rows):
+        """Retourne une nouvelle correspondance complétée par des identifiants et leurs lignes."""
+        return IdLookup(np.concatenate([self.ids, np.asarray(recipe_ids, dtype=np.int64)]),
+                        np.concatenate([self.rows, np.asarray(rows, dtype=np.int64)]),
+                        self.max_direct_ratio)
+
+    def without(self, recipe_ids):
+        """
+        Retourne une nouvelle correspondance sans les identifiants donnés.
+        Les structures de recherche existantes sont reprises (table copiée, tableau trié filtré) : pas de nouveau tri.
+        """
+        recipe_ids = np.asarray(recipe_ids, dtype=np.int64)
+        lookup = IdLookup.__new__(IdLookup)
+        keep = ~np.isin(self.ids, recipe_ids)
+        lookup.ids, lookup.rows, lookup.max_direct_ratio = self.ids[keep], self.rows[keep], self.max_direct_ratio
+        lookup._table = lookup._sorted_ids = lookup._sorted_rows = None
+        if self._table is not None:
+            lookup._table = self._table.copy()
+            lookup._table[recipe_ids[(recipe_ids >= 0) & (recipe_ids < len(self._table))]] = -1
+        else:
+            sorted_keep = ~np.isin(self._sorted_ids, recipe_ids)
+            lookup._sorted_ids, lookup._sorted_rows = self._sorted_ids[sorted_keep], self._sorted_rows[sorted_keep]
+        return lookup
@@ -0,0 +1,189 @@
+# minhash.py
+import numpy as np
+
+# Valeur d'une signature pour un ensemble vide
+EMPTY_SIGNATURE = np.iinfo(np.uint32).max
+# Multiplicateur FNV-1a 64 bits, pour combiner les valeurs d'une bande en une clé
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+class MinHashLSH:
+    """
+    Signatures MinHash d'ensembles (ex : les ingrédients d'une recette) et clés de bandes LSH.
+
+    La similarité de Jaccard entre deux ensembles est estimée par la proportion de composantes
+    égales de leurs signatures. Chaque permutation est une fonction de hachage universelle
+    multiply-shift : h(x) = ((a * x + b) mod 2^64) >> 32.
+
+    Les signatures sont découpées en `n_bands` bandes : deux ensembles sont candidats
+    s'ils ont au moins une bande identique, ce qui arrive avec une forte probabilité
+    au-delà d'une similarité d'environ (1 / n_bands) ** (1 / lignes par bande).
+    """
+
+    def __init__(self, n_permutations=128, n_bands=32, seed=0):
+        """
+        :param n_permutations: Largeur des signatures (nombre de fonctions de hachage).
+        :param n_bands: Nombre de bandes LSH (doit diviser n_permutations).
+        :param seed: Graine des fonctions de hachage : les signatures ne sont comparables qu'à graine égale.
+        """
+        if n_permutations < 1 or n_bands < 1 or n_permutations % n_bands:
+            raise ValueError("n_bands doit diviser n_permutations.")
+        self.n_permutations = n_permutations
+        self.n_bands = n_bands
+        self.rows_per_band = n_permutations // n_bands
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2 ** 63, size=n_permutations, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=n_permutations, dtype=np.uint64)
+        self._band_seeds = rng.integers(0, 2 ** 63, size=n_bands, dtype=np.uint64)
+
+    @property
+    def threshold(self):
+        """Similarité de Jaccard approximative à partir de laquelle deux ensembles deviennent candidats."""
+        return (1 / self.n_bands) ** (1 / self.rows_per_band)
+
+    def hash_values(self, token_hashes):
+        """
+        Valeurs (len(token_hashes), n_permutations) uint32 des permutations pour chaque jeton.
+        """
+        token_hashes = np.asarray(token_hashes, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            return ((token_hashes[:, np.newaxis] * self._a + self._b) >> np.uint64(32)).astype(np.uint32)
+
+    def _signatures(self, token_hashes, indptr, max_buffer=16_000_000):
+        """
+        Signatures (n, n_permutations) uint32 à partir des hachages des jetons de chaque ensemble,
+        au format CSR (`token_hashes[indptr[i]:indptr[i + 1]]` pour l'ensemble i).
+        """
+        n_sets = len(indptr) - 1
+        signatures = np.full((n_sets, self.n_permutations), EMPTY_SIGNATURE, dtype=np.uint32)
+        non_empty = np.flatnonzero(np.diff(indptr) > 0)
+        if not len(non_empty):
+            return signatures
+        # Les permutations ne sont évaluées qu'une fois par jeton distinct (vocabulaire réduit)
+        unique_tokens, token_ids = np.unique(np.asarray(token_hashes, dtype=np.uint64), return_inverse=True)
+        values = self.hash_values(unique_tokens)
+
+        # Ensembles traités par paquets pour borner la mémoire temporaire (jetons x permutations)
+        rows_per_chunk = max(1, int(max_buffer // self.n_permutations * len(non_empty) // len(token_ids)))
+        for first in range(0, len(non_empty), rows_per_chunk):
+            rows = non_empty[first:first + rows_per_chunk]
+            begin, end = indptr[rows[0]], indptr[rows[-1] + 1]
+            signatures[rows] = np.minimum.reduceat(values[token_ids[begin:end]], indptr[rows] - begin, axis=0)
+        return signatures
+
+    def signatures_from_matrix(self, matrix):
+        """
+        Signatures des lignes d'une matrice creuse : l'ensemble d'une ligne est celui de ses colonnes non nulles
+        (ex : la matrice sac de mots des ingrédients).
+        """
+        matrix = matrix.tocsr()
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+        return self._signatures(matrix.indices, matrix.indptr)
+
+    def signatures_from_sets(self, token_sets):
+        """
+        Signatures d'ensembles de chaînes (ex : les listes d'ingrédients brutes).
+        """
+        # Import local : scikit-learn (et SciPy) n'est chargé qu'au premier calcul de signatures
+        from sklearn.utils import murmurhash3_32
+        token_sets = [set(tokens) for tokens in token_sets]
+        lengths = np.array([len(tokens) for tokens in token_sets], dtype=np.int64)
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        hashes = np.array([murmurhash3_32(token, seed=self.seed, positive=True)
+                           for tokens in token_sets for token in tokens], dtype=np.uint64)
+        return self._signatures(hashes, indptr)
+
+    def band_keys(self, signatures):
+        """
+        Clés (n, n_bands) uint64 : hachage FNV-1a des valeurs de chaque bande.
+        """
+        signatures = np.atleast_2d(signatures)
+        keys = np.empty((len(signatures), self.n_bands), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for band in range(self.n_bands):
+                key = np.full(len(signatures), self._band_seeds[band], dtype=np.uint64)
+                for column in range(band * self.rows_per_band, (band + 1) * self.rows_per_band):
+                    key ^= signatures[:, column].astype(np.uint64)
+                    key *= _FNV_PRIME
+                keys[:, band] = key
+        return keys
+
+
+class MinHashIndex:
+    """
+    Index LSH immuable de signatures MinHash : pour chaque bande, les clés sont triées
+    et les candidats d'une requête sont obtenus par recherche dichotomique.
+    """
+
+    def __init__(self, lsh, signatures):
+        """
+        :param lsh: Paramètres MinHashLSH ayant produit les signatures.
+        :param signatures: Signatures (n, n_permutations) uint32, une ligne par ensemble.
+        """
+        self.lsh = lsh
+        self.signatures = np.ascontiguousarray(signatures, dtype=np.uint32)
+        # Une ligne par bande (n_bands, n) : clés triées et lignes correspondantes
+        keys = np.ascontiguousarray(lsh.band_keys(self.signatures).T)
+        self._order = np.argsort(keys, axis=1).astype(np.int32)
+        self._sorted_keys = np.take_along_axis(keys, self._order, axis=1)
+
+    def __len__(self):
+        return len(self.signatures)
+
+    @property
+    def nbytes(self):
+        """Mémoire occupée par les signatures et les tables de bandes."""
+        return self.signatures.nbytes + self._order.nbytes + self._sorted_keys.nbytes
+
+    def with_signatures(self, signatures):
+        """Retourne un nouvel index complété par des signatures (nouvelles lignes en fin d'index)."""
+        return MinHashIndex(self.lsh, np.concatenate([self.signatures, signatures]))
+
+    def subset(self, rows):
+        """Retourne un nouvel index limité aux lignes données (renumérotées)."""
+        return MinHashIndex(self.lsh, self.signatures[rows])
+
+    def candidates(self, signature):
+        """
+        Lignes partageant au moins une bande avec la signature, triées et sans doublon.
+        """
+        keys = self.lsh.band_keys(signature)[0]
+        matches = []
+        for band, key in enumerate(keys):
+            sorted_keys = self._sorted_keys[band]
+            low, high = np.searchsorted(sorted_keys, key, side="left"), np.searchsorted(sorted_keys, key, side="right")
+            if high > low:
+                matches.append(self._order[band, low:high])
+        if not matches:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(matches))
+
+    def jaccard(self, signature, rows=None):
+        """
+        Similarité de Jaccard estimée entre la signature et les lignes données (par défaut : toutes).
+        """
+        signatures = self.signatures if rows is None else self.signatures[rows]
+        return np.count_nonzero(signatures == np.asarray(signature, dtype=np.uint32), axis=1) \
+            / self.lsh.n_permutations
+
+    def query(self, signature, top_n, exclude=None, alive=None, exhaustive_fallback=True):
+        """
+        Retourne les top_n lignes les plus similaires (Jaccard estimé décroissant) parmi les candidats LSH.
+
+        :param exclude: Ligne à ignorer (ex : l'ensemble requête lui-même).
+        :param alive: Masque booléen optionnel des lignes utilisables.
+        :param exhaustive_fallback: Si les candidats sont moins de top_n, comparer à toutes les lignes.
+        :return: (lignes, similarités) triés par similarité décroissante.
+        """
+        rows = self.candidates(signature)
+        usable = np.ones(len(self), dtype=bool) if alive is None else alive.copy()
+        if exclude is not None:
+            usable[exclude] = False
+        rows = rows[usable[rows]]
+        if len(rows) < top_n and exhaustive_fallback:
+            rows = np.flatnonzero(usable)
+        similarities = self.jaccard(signature, rows)
+        order = np.lexsort((rows, -similarities))[:top_n]
+        return rows[order], similarities[order]
@@ -1,80 +1,479 @@
 # recipe_finder.py
+import threading
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
-from src.FindingCloseRecipes.config import NUMERIC_FEATURES, DEFAULT_WEIGHTS, COMBINED_WEIGHTS, TOP_N
-from src.FindingCloseRecipes.distances import DistanceCalculator
-from src.FindingCloseRecipes.vectorizers import Vectorizer
+from src.FindingCloseRecipes.config import (
+    NUMERIC_FEATURES, DEFAULT_WEIGHTS, COMBINED_WEIGHTS, TOP_N, VECTORIZER_PARAMS, VECTORIZER_DTYPE,
+    VECTORIZER_MODE, HASHING_FEATURES, SCORING_WORKERS, MINHASH_PERMUTATIONS, MINHASH_BANDS
+)
+from src.FindingCloseRecipes.id_lookup import IdLookup
+from src.FindingCloseRecipes.minhash import MinHashLSH
+from src.FindingCloseRecipes.result_cache import ResultCache
+from src.FindingCloseRecipes.recipe_index import RecipeIndex, TEXT_FIELDS
+from src.FindingCloseRecipes.sharded_scorer import ShardedScorer
 
 class RecipeFinder:
-    def __init__(self, recipes_df):
-        self.recipes_df = recipes_df
-        self.id_to_index = pd.Series(recipes_df.index, index=recipes_df['id'])
+    def __init__(self, recipes_df, result_cache=None, vectorizer_params=None, vectorizer_dtype=VECTORIZER_DTYPE,
+                 vectorizer_mode=VECTORIZER_MODE, hashing_features=HASHING_FEATURES, compaction_threshold=0.2,
+                 n_workers=SCORING_WORKERS, minhash_permutations=MINHASH_PERMUTATIONS, minhash_bands=MINHASH_BANDS,
+                 query_preparator=None, normalizer=None):
+        if vectorizer_mode not in ("vocabulary", "hashing"):
+            raise ValueError(f"Mode de vectorisation inconnu : {vectorizer_mode}")
+        self._source_df = recipes_df
+        self.vectorizer_mode = vectorizer_mode
+        self.hashing_features = hashing_features
+        # Proportion de recettes supprimées au-delà de laquelle l'index est compacté automatiquement
+        self.compaction_threshold = compaction_threshold
+        # Paramètres d'élagage par champ (surcharge partielle de VECTORIZER_PARAMS)
+        self.vectorizer_params = {field: dict(params) for field, params in VECTORIZER_PARAMS.items()}
+        for field, params in (vectorizer_params or {}).items():
+            if field not in TEXT_FIELDS:
+                raise ValueError(f"Champ textuel inconnu dans vectorizer_params : {field}")
+            self.vectorizer_params[field].update(params)
+        self.vectorizer_dtype = np.dtype(vectorizer_dtype)
+        self.weights_array = np.array([DEFAULT_WEIGHTS[feature] for feature in NUMERIC_FEATURES])
+        # Normalisation des requêtes en texte libre : {champ: texte} -> {champ: texte normalisé}
+        # (par défaut : VectorizerPreparator.prepare_query, la normalisation du prétraitement)
+        self.query_preparator = query_preparator
+        # Paramètres de normalisation du dataset (Normalizer), appliqués aux recettes ajoutées non normalisées
+        self.normalizer = normalizer
+        # Signatures MinHash des ingrédients (préfiltre LSH des candidats), construites par preprocess()
+        self.minhash = MinHashLSH(minhash_permutations, minhash_bands) if minhash_permutations else None
+        # Instantané courant de l'index : remplacé en bloc à chaque mise à jour
+        self._index = None
+        self._version = 0
+        self._write_lock = threading.Lock()
+        # Cache des résultats (ids, distances), invalidé par la version de l'index
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        # Cache LRU des distances par champ textuel, pour changer les poids sans tout recalculer
+        self.components_cache_size = 8
+        self._components_cache = OrderedDict()
+        self._components_lock = threading.Lock()
+        # Cache LRU des masques de filtres (RecipeFilter) par version de l'index
+        self.filter_masks_cache_size = 16
+        self._filter_masks = OrderedDict()
+        # Recherche exacte répartie sur plusieurs coeurs (None : recherche séquentielle)
+        self.scorer = None
+        self.n_workers = n_workers
+
+    @property
+    def n_workers(self):
+        """Nombre de threads utilisés pour évaluer les blocs de lignes de l'index."""
+        return 1 if self.scorer is None else self.scorer.n_workers
+
+    @n_workers.setter
+    def n_workers(self, n_workers):
+        if n_workers is not None and n_workers < 1:
+            raise ValueError("n_workers doit être supérieur ou égal à 1.")
+        if self.scorer is not None:
+            self.scorer.shutdown()
+        # None : un thread par coeur
+        self.scorer = None if n_workers == 1 else ShardedScorer(n_workers)
+
+    @property
+    def index(self):
+        """Instantané courant de l'index (RecipeIndex)."""
+        if self._index is None:
+            raise ValueError("L'index n'est pas construit : appelez preprocess().")
+        return self._index
+
+    @property
+    def recipes_df(self):
+        return self._source_df if self._index is None else self._index.recipes_df
+
+    @property
+    def id_to_index(self):
+        if self._index is None:
+            return IdLookup(self._source_df['id'].to_numpy())
+        return self._index.id_to_index
+
+    @property
+    def index_version(self):
+        return self._version
 
     def preprocess(self):
-        self.numeric_df = self.recipes_df[NUMERIC_FEATURES]
-        self.weights_array = np.array([DEFAULT_WEIGHTS[feature] for feature in NUMERIC_FEATURES])
-        
-        self.tfidf_name, _ = Vectorizer.tfidf_vectorize(self.recipes_df['name'])
-        self.tfidf_tags, _ = Vectorizer.tfidf_vectorize(self.recipes_df['tags'])
-        self.tfidf_steps, _ = Vectorizer.tfidf_vectorize(self.recipes_df['steps'])
-        self.bow_ingredients, _ = Vectorizer.bow_vectorize(self.recipes_df['ingredients'])
-
-    def find_similar_recipes(self, recipe_id):
-        if recipe_id not in self.id_to_index:
-            raise ValueError("Identifiant de recette introuvable.")
-        
-        recipe_index = self.id_to_index[recipe_id]
-        
-        # Calculer les distances avec les matrices creuses
-        distance_name = DistanceCalculator.cosine_distance_sparse(
-            recipe_id=recipe_id,
-            tfidf_matrix=self.tfidf_name,
-            id_to_index=self.id_to_index,
-            index_to_id=self.id_to_index.index
-        )
-        distance_tags = DistanceCalculator.cosine_distance_sparse(
-            recipe_id=recipe_id,
-            tfidf_matrix=self.tfidf_tags,
-            id_to_index=self.id_to_index,
-            index_to_id=self.id_to_index.index
-        )
-        distance_steps = DistanceCalculator.cosine_distance_sparse(
-            recipe_id=recipe_id,
-            tfidf_matrix=self.tfidf_steps,
-            id_to_index=self.id_to_index,
-            index_to_id=self.id_to_index.index
+        with self._write_lock:
+            self._version += 1
+            self._index = RecipeIndex.build(
+                self.recipes_df, self.weights_array, self.vectorizer_mode, self.vectorizer_params,
+                self.vectorizer_dtype, self.hashing_features, self._version, self.minhash
+            )
+            self.vectorizers = self._index.vectorizers
+        with self._components_lock:
+            self._components_cache.clear()
+            self._filter_masks.clear()
+
+    def vectorizer_report(self):
+        """
+        Retourne, pour chaque champ, la taille du vocabulaire, le nombre de valeurs non nulles
+        et les octets occupés par la matrice creuse.
+        """
+        return pd.DataFrame(self.index.report()).T
+
+    def _publish(self, update):
+        """
+        Construit un nouvel instantané avec `update(index, version)` puis le publie.
+        Les requêtes en cours continuent sur l'instantané qu'elles ont récupéré.
+        """
+        with self._write_lock:
+            index = update(self.index, self._version + 1)
+            self._version += 1
+            self._index = index
+        with self._components_lock:
+            self._components_cache.clear()
+            self._filter_masks.clear()
+        return self
+
+    def add_recipes(self, new_recipes_df, normalized=True):
+        """
+        Ajoute de nouvelles recettes à l'index sans réentraîner les vectoriseurs ni réécrire
+        les matrices existantes (mode "hashing" uniquement) : un bloc de lignes est ajouté par champ
+        et les statistiques IDF sont mises à jour.
+
+        :param new_recipes_df: Recettes prétraitées (mêmes colonnes que le dataset de l'index).
+        :param normalized: Si False, les variables numériques sont brutes : elles sont normalisées avec
+                           les moyennes et écarts-types du dataset (`self.normalizer`), pas avec ceux du lot.
+        :raises ValueError: Hors mode "hashing", si un identifiant est déjà indexé, ou pour des variables
+                            numériques brutes sans paramètres de normalisation.
+        """
+        if new_recipes_df.empty:
+            return self
+        if not normalized:
+            if self.normalizer is None:
+                raise ValueError("Aucun paramètre de normalisation : impossible de normaliser les recettes ajoutées.")
+            new_recipes_df = self.normalizer.transform(new_recipes_df.copy())
+        return self._publish(lambda index, version: index.with_added(new_recipes_df, version))
+
+    def delete_recipes(self, recipe_ids):
+        """
+        Supprime des recettes de l'index (tombstones) : elles ne sont plus retournées ni interrogeables.
+        L'index est compacté quand la proportion de recettes supprimées dépasse `compaction_threshold`.
+
+        :raises ValueError: Si un identifiant est introuvable.
+        """
+        self._publish(lambda index, version: index.with_deleted(recipe_ids, version))
+        if self.index.n_deleted > self.compaction_threshold * len(self.index):
+            self.compact()
+        return self
+
+    def compact(self):
+        """
+        Retire physiquement les recettes supprimées des matrices.
+        """
+        return self._publish(lambda index, version: index.compacted(version))
+
+    def _resolve_weights(self, combined_weights=None, numeric_weights=None, top_n=None):
+        """
+        Fusionne les surcharges de la requête avec les poids par défaut de la configuration.
+        """
+        resolved_combined = dict(COMBINED_WEIGHTS)
+        resolved_numeric = dict(DEFAULT_WEIGHTS)
+        for overrides, resolved in ((combined_weights, resolved_combined), (numeric_weights, resolved_numeric)):
+            for name, weight in (overrides or {}).items():
+                if name not in resolved:
+                    raise ValueError(f"Poids inconnu : {name}")
+                if weight < 0:
+                    raise ValueError(f"Le poids {name} doit être positif ou nul.")
+                resolved[name] = float(weight)
+        top_n = TOP_N if top_n is None else int(top_n)
+        if top_n < 1:
+            raise ValueError("top_n doit être supérieur ou égal à 1.")
+        return resolved_combined, resolved_numeric, top_n
+
+    @staticmethod
+    def _cache_key(index, recipe_id, combined_weights, numeric_weights, top_n, prefilter=False, recipe_filter=None):
+        return (
+            recipe_id,
+            tuple(sorted(combined_weights.items())),
+            tuple(sorted(numeric_weights.items())),
+            top_n,
+            index.version,
+            prefilter,
+            None if recipe_filter is None else recipe_filter.key(),
         )
-        distance_ingredients = DistanceCalculator.cosine_distance_sparse(
-            recipe_id=recipe_id,
-            tfidf_matrix=self.bow_ingredients,
-            id_to_index=self.id_to_index,
-            index_to_id=self.id_to_index.index
+
+    def cache_stats(self):
+        """
+        Retourne les métriques du cache de résultats (taux de succès, taille en octets...).
+        """
+        return self.result_cache.stats()
+
+    def _filter_mask(self, index, recipe_filter):
+        """
+        Retourne le masque des lignes éligibles (non supprimées et respectant le filtre) et leur nombre.
+        Les masques des filtres récents sont conservés par version de l'index.
+        """
+        if recipe_filter is None or recipe_filter.is_empty():
+            return index.alive, len(index) - index.n_deleted
+        key = (recipe_filter.key(), index.version)
+        with self._components_lock:
+            entry = self._filter_masks.get(key)
+            if entry is not None:
+                self._filter_masks.move_to_end(key)
+                return entry
+        mask = index.filter_mask(recipe_filter)
+        entry = (mask, int(np.count_nonzero(mask)))
+        with self._components_lock:
+            self._filter_masks[key] = entry
+            while len(self._filter_masks) > self.filter_masks_cache_size:
+                self._filter_masks.popitem(last=False)
+        return entry
+
+    def find_similar_recipes(self, recipe_id, combined_weights=None, numeric_weights=None, top_n=None,
+                             prefilter=False, recipe_filter=None):
+        """
+        Trouve les recettes les plus proches d'une recette.
+
+        Les poids peuvent être surchargés par requête sans revectoriser : les distances
+        par champ textuel sont mises en cache par recette, seule leur combinaison est recalculée.
+
+        :param recipe_id: Identifiant de la recette de référence.
+        :param combined_weights: Surcharge partielle de COMBINED_WEIGHTS (ex : {"gamma": 0.1}).
+        :param numeric_weights: Surcharge partielle de DEFAULT_WEIGHTS pour les variables numériques.
+        :param top_n: Nombre de recettes à retourner (par défaut : TOP_N).
+        :param prefilter: Ne scorer que les recettes dont les ingrédients sont candidats LSH (signatures MinHash).
+                          Recherche approchée ; si les candidats sont moins de top_n, la recherche exacte est utilisée.
+        :param recipe_filter: RecipeFilter appliqué avant la sélection des top_n (moins de top_n recettes
+                              sont retournées si le filtre en retient moins).
+        """
+        index = self.index  # Instantané cohérent pour toute la requête
+        combined_weights, numeric_weights, top_n = self._resolve_weights(combined_weights, numeric_weights, top_n)
+        key = self._cache_key(index, recipe_id, combined_weights, numeric_weights, top_n, prefilter, recipe_filter)
+        cached = self.result_cache.get(key)
+        if cached is None:
+            similar_ids, distances = self._score_similar_recipes(
+                index, recipe_id, combined_weights, numeric_weights, top_n, prefilter, recipe_filter
+            )
+            cached = self.result_cache.put(key, similar_ids, distances)
+        return self._materialize(index, *cached)
+
+    def _prepare_query(self, query):
+        """
+        Normalise une requête en texte libre et retourne les champs textuels non vides.
+        """
+        if isinstance(query, dict):
+            unknown = set(query) - set(TEXT_FIELDS)
+            if unknown:
+                raise ValueError(f"Champs de requête inconnus : {sorted(unknown)}")
+        preparator = self.query_preparator
+        if preparator is None:
+            # Import local : NLTK n'est chargé que pour les requêtes en texte libre
+            from src.DataPreprocess.vectorizer_preparator import VectorizerPreparator
+            preparator = VectorizerPreparator.prepare_query
+        prepared = preparator(query)
+        return {field: text for field, text in prepared.items() if field in TEXT_FIELDS and str(text).strip()}
+
+    def find_recipes_by_text(self, query, combined_weights=None, top_n=None, recipe_filter=None):
+        """
+        Trouve les recettes les plus proches d'une requête en texte libre (ex : "chicken garlic lemon quick").
+
+        La requête est normalisée comme les recettes (stemming, stop words), vectorisée par les vectoriseurs
+        déjà entraînés (`transform`) puis comparée aux matrices de l'index : aucun parcours du DataFrame.
+        Les variables numériques ne participent pas au score.
+
+        :param query: Texte appliqué à tous les champs textuels, ou dictionnaire {champ: texte}
+                      (ex : {"ingredients": "chicken garlic", "tags": "easy"}).
+        :param combined_weights: Surcharge partielle de COMBINED_WEIGHTS (seuls alpha à delta sont utilisés).
+        :param top_n: Nombre de recettes à retourner (par défaut : TOP_N).
+        :param recipe_filter: RecipeFilter appliqué avant la sélection des top_n.
+        :raises ValueError: Si la requête ne contient aucun terme après normalisation.
+        """
+        index = self.index
+        combined_weights, numeric_weights, top_n = self._resolve_weights(combined_weights, None, top_n)
+        fields = self._prepare_query(query)
+        if not fields:
+            raise ValueError("La requête ne contient aucun terme exploitable.")
+        query_key = ("text", tuple(sorted(fields.items())))
+        key = self._cache_key(index, query_key, combined_weights, numeric_weights, top_n, recipe_filter=recipe_filter)
+        cached = self.result_cache.get(key)
+        if cached is None:
+            mask, n_eligible = self._filter_mask(index, recipe_filter)
+            combined_distance = np.zeros(len(index), dtype=np.float32)
+            for field, text in fields.items():
+                combined_distance += combined_weights[TEXT_FIELDS[field]] * index.query_distances(field, text)
+            combined_distance[~mask] = np.inf
+            top_n_indices = self._select_top_n(combined_distance, top_n, n_eligible + 1)
+            cached = self.result_cache.put(
+                key, index.recipes_df['id'].values[top_n_indices], combined_distance[top_n_indices]
+            )
+        return self._materialize(index, *cached)
+
+    def find_similar_recipes_batch(self, recipe_ids, combined_weights=None, numeric_weights=None, top_n=None,
+                                   batch_size=32, recipe_filter=None):
+        """
+        Trouve les recettes les plus proches de plusieurs recettes à la fois.
+
+        Les recettes absentes du cache sont traitées par paquets de `batch_size` : une seule
+        multiplication creuse par champ et un seul GEMM pour les variables numériques par paquet.
+
+        :return: Dictionnaire {recipe_id: DataFrame des recettes proches}.
+        """
+        index = self.index
+        combined_weights, numeric_weights, top_n = self._resolve_weights(combined_weights, numeric_weights, top_n)
+        unique_ids = list(dict.fromkeys(recipe_ids))
+        # Validation et résolution des lignes en une seule recherche vectorisée
+        rows = dict(zip(unique_ids, index.id_to_index.rows_of(unique_ids).tolist()))
+        mask, n_eligible = self._filter_mask(index, recipe_filter)
+
+        def cache_key(recipe_id):
+            return self._cache_key(index, recipe_id, combined_weights, numeric_weights, top_n,
+                                   recipe_filter=recipe_filter)
+
+        results, missing = {}, []
+        for recipe_id in unique_ids:
+            cached = self.result_cache.get(cache_key(recipe_id))
+            if cached is None:
+                missing.append(recipe_id)
+            else:
+                results[recipe_id] = cached
+
+        for start in range(0, len(missing), batch_size):
+            batch_ids = missing[start:start + batch_size]
+            batch_indices = np.array([rows[recipe_id] for recipe_id in batch_ids])
+            if self.scorer is not None:
+                top_rows, top_distances = self.scorer.score(
+                    index, batch_indices, combined_weights, numeric_weights, top_n, mask=mask
+                )
+            else:
+                combined_distance = combined_weights["epsilon"] * self._numeric_distances(
+                    index, batch_indices, numeric_weights
+                )
+                for field, weight_name in TEXT_FIELDS.items():
+                    combined_distance += combined_weights[weight_name] * index.field_distances(field, batch_indices)
+                combined_distance[:, ~mask] = np.inf
+                combined_distance[np.arange(len(batch_indices)), batch_indices] = np.inf
+                top_rows = self._select_top_n(combined_distance, top_n, n_eligible + 1)
+                top_distances = np.take_along_axis(combined_distance, top_rows, axis=1)
+            for row, recipe_id in enumerate(batch_ids):
+                # Les distances infinies correspondent à des lignes non éligibles (moins de top_n recettes)
+                finite = np.isfinite(top_distances[row])
+                results[recipe_id] = self.result_cache.put(
+                    cache_key(recipe_id),
+                    index.recipes_df['id'].values[top_rows[row][finite]],
+                    top_distances[row][finite],
+                )
+
+        return {recipe_id: self._materialize(index, *results[recipe_id]) for recipe_id in unique_ids}
+
+    @staticmethod
+    def _select_top_n(combined_distance, top_n, n_alive=None):
+        """
+        Sélectionne, pour chaque ligne, les indices des top_n plus petites distances triées (sans tri complet).
+        Au plus `n_alive - 1` indices sont retournés (recettes non supprimées, hors recette requête).
+        """
+        n_alive = combined_distance.shape[-1] if n_alive is None else n_alive
+        top_n = min(top_n, n_alive - 1)
+        if top_n <= 0:
+            return np.empty(combined_distance.shape[:-1] + (0,), dtype=int)
+        top_indices = np.argpartition(combined_distance, top_n - 1, axis=-1)[..., :top_n]
+        order = np.argsort(np.take_along_axis(combined_distance, top_indices, axis=-1), axis=-1, kind="stable")
+        return np.take_along_axis(top_indices, order, axis=-1)
+
+    @staticmethod
+    def _materialize(index, similar_ids, distances):
+        """
+        Reconstruit le DataFrame des recettes proches à partir des identifiants et distances compacts.
+        """
+        similar_recipes = index.recipes_df.iloc[index.id_to_index.lookup(similar_ids)].copy()
+        similar_recipes['combined_distance'] = distances.astype(np.float64)
+        return similar_recipes
+
+    def _cached_text_distances(self, index, recipe_id):
+        """
+        Retourne les distances par champ textuel d'une recette depuis le cache des composantes, ou None.
+        """
+        key = (recipe_id, index.version)
+        with self._components_lock:
+            components = self._components_cache.get(key)
+            if components is not None:
+                self._components_cache.move_to_end(key)
+            return components
+
+    def _remember_text_distances(self, index, recipe_id, components):
+        with self._components_lock:
+            self._components_cache[(recipe_id, index.version)] = components
+            while len(self._components_cache) > self.components_cache_size:
+                self._components_cache.popitem(last=False)
+
+    def _text_distances(self, index, recipe_id, recipe_index):
+        """
+        Retourne les distances cosinus (name, tags, steps, ingredients) d'une recette à toutes les autres,
+        depuis le cache des composantes ou en les calculant. `recipe_index` est la ligne déjà validée.
+        """
+        components = self._cached_text_distances(index, recipe_id)
+        if components is None:
+            components = {
+                field: index.field_distances(field, [recipe_index])[0].astype(np.float32)
+                for field in TEXT_FIELDS
+            }
+            self._remember_text_distances(index, recipe_id, components)
+        return components
+
+    @staticmethod
+    def _numeric_distances(index, recipe_indices, numeric_weights):
+        """
+        Distances euclidiennes pondérées des variables numériques pour un ou plusieurs indices de recettes.
+        """
+        return index.numeric_distances(recipe_indices, numeric_weights)
+
+    def _score_candidates(self, index, recipe_index, candidates, combined_weights, numeric_weights, top_n):
+        """
+        Distances combinées entre une recette et des lignes candidates seulement, et top_n parmi elles.
+        """
+        combined_distance = combined_weights["epsilon"] * index.numeric_distances_to(
+            recipe_index, candidates, numeric_weights
         )
+        for field, weight_name in TEXT_FIELDS.items():
+            combined_distance += combined_weights[weight_name] * index.field_distances_to(
+                field, recipe_index, candidates
+            )
+        top = self._select_top_n(combined_distance, top_n, len(candidates) + 1)
+        return index.recipes_df['id'].values[candidates[top]], combined_distance[top]
+
+    def _score_similar_recipes(self, index, recipe_id, combined_weights, numeric_weights, top_n, prefilter=False,
+                               recipe_filter=None):
+        """
+        Calcule les distances combinées et retourne les identifiants et distances des top_n plus proches.
+        """
+        # Identifiant validé une seule fois pour tous les champs
+        recipe_index = index.id_to_index.row(recipe_id)
+        # Lignes éligibles : non supprimées et respectant le filtre (masque précalculé)
+        mask, n_eligible = self._filter_mask(index, recipe_filter)
+
+        # Préfiltre MinHash/LSH : seules les recettes aux ingrédients proches sont scorées
+        if prefilter:
+            candidates = index.minhash_candidates(recipe_index)
+            candidates = candidates[mask[candidates]]
+            if len(candidates) >= top_n:
+                return self._score_candidates(index, recipe_index, candidates, combined_weights, numeric_weights, top_n)
+
+        # Recherche répartie par blocs : les distances par champ sont conservées pour les changements de poids
+        if self.scorer is not None and self._cached_text_distances(index, recipe_id) is None:
+            components = {field: np.empty((1, len(index)), dtype=np.float32) for field in TEXT_FIELDS}
+            top_rows, top_distances = self.scorer.score(
+                index, [recipe_index], combined_weights, numeric_weights, top_n, components, mask
+            )
+            self._remember_text_distances(index, recipe_id, {field: c[0] for field, c in components.items()})
+            finite = np.isfinite(top_distances[0])
+            return index.recipes_df['id'].values[top_rows[0][finite]], top_distances[0][finite]
+        
+        # Distances des matrices creuses (mises en cache par recette)
+        text_distances = self._text_distances(index, recipe_id, recipe_index)
         
         # Calculer les distances pour les variables numériques
-        distance_numeric = DistanceCalculator.euclidean_distance(
-            self.numeric_df, recipe_index, self.weights_array
-        )
+        distance_numeric = self._numeric_distances(index, recipe_index, numeric_weights)
 
         # Combiner les distances avec les poids
-        combined_distance = (
-            COMBINED_WEIGHTS["alpha"] * distance_name +
-            COMBINED_WEIGHTS["beta"] * distance_tags +
-            COMBINED_WEIGHTS["gamma"] * distance_steps +
-            COMBINED_WEIGHTS["delta"] * distance_ingredients +
-            COMBINED_WEIGHTS["epsilon"] * distance_numeric
-        )
-        
-        # Trier les indices par distance combinée croissante
-        sorted_indices = np.argsort(combined_distance)
-        sorted_indices = sorted_indices[sorted_indices != recipe_index]
-        
-        # Récupérer les recettes les plus proches
-        top_n_indices = sorted_indices[:TOP_N]
-        similar_recipes = self.recipes_df.iloc[top_n_indices].copy()
-        similar_recipes['combined_distance'] = combined_distance[top_n_indices]
+        combined_distance = combined_weights["epsilon"] * distance_numeric
+        for field, weight_name in TEXT_FIELDS.items():
+            combined_distance += combined_weights[weight_name] * text_distances[field]
         
-        return similar_recipes
-
-
+        # Exclure la recette elle-même et les recettes non éligibles, puis sélectionner les top_n sans tri complet
+        combined_distance[~mask] = np.inf
+        combined_distance[recipe_index] = np.inf
+        top_n_indices = self._select_top_n(combined_distance, top_n, n_eligible + 1)
+        top_n_indices = top_n_indices[np.isfinite(combined_distance[top_n_indices])]
 
+        similar_ids = index.recipes_df['id'].values[top_n_indices]
+        return similar_ids, combined_distance[top_n_indices]
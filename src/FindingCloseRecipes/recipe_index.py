@@ -0,0 +1,323 @@
+# recipe_index.py
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from src.FindingCloseRecipes.config import NUMERIC_FEATURES, DEFAULT_WEIGHTS
+from src.FindingCloseRecipes.distances import DistanceCalculator
+from src.FindingCloseRecipes.id_lookup import IdLookup
+from src.FindingCloseRecipes.minhash import MinHashIndex
+from src.FindingCloseRecipes.vectorizers import Vectorizer, IncrementalHashingVectorizer
+
+# Champs textuels et poids associé dans COMBINED_WEIGHTS
+TEXT_FIELDS = {
+    "name": "alpha",
+    "tags": "beta",
+    "steps": "gamma",
+    "ingredients": "delta",
+}
+
+
+class RecipeIndex:
+    """
+    Instantané immuable de l'index de similarité : recettes, matrices textuelles,
+    bloc numérique et masque des recettes supprimées (tombstones).
+
+    Les modifications (`with_added`, `with_deleted`, `compacted`) ne modifient jamais l'instantané
+    courant : elles retournent un nouvel instantané. Une requête qui a récupéré un instantané
+    le voit donc cohérent jusqu'à la fin de son calcul, même si l'index est mis à jour entre-temps.
+    """
+
+    def __init__(self, recipes_df, id_to_index, text, numeric_matrix, weights_array, alive, version,
+                 vectorizer_mode, vectorizers=None, ingredient_minhash=None, numeric_derived=None):
+        """
+        :param numeric_derived: Tableaux dérivés du bloc numérique déjà calculés (voir `_derive_numeric`),
+                                repris d'un instantané précédent pour ne pas les recalculer sur toutes les lignes.
+        """
+        self.recipes_df = recipes_df
+        self.id_to_index = id_to_index
+        self.text = text
+        self.vectorizer_mode = vectorizer_mode
+        self.vectorizers = vectorizers or {}
+        self.weights_array = weights_array
+        # Bloc numérique float32 contigu, et sa version pré-multipliée par sqrt(poids par défaut)
+        self.numeric_matrix = numeric_matrix
+        if numeric_derived is None:
+            numeric_derived = self._derive_numeric(numeric_matrix, weights_array)
+        self.numeric_squared, self.scaled_numeric, self.scaled_numeric_norms = numeric_derived
+        self.alive = alive
+        self.version = version
+        # Signatures MinHash des ingrédients et tables LSH (None si désactivé)
+        self.ingredient_minhash = ingredient_minhash
+        # Listes inversées terme -> lignes (CSC) des champs filtrables, construites au premier filtre
+        self._postings = {}
+
+    @classmethod
+    def build(cls, recipes_df, weights_array, vectorizer_mode, vectorizer_params, vectorizer_dtype,
+              hashing_features, version, minhash=None):
+        """
+        Construit un index complet (vectorisation de tous les champs textuels et, si `minhash`
+        (MinHashLSH) est fourni, signatures MinHash des ingrédients).
+        """
+        recipes_df = recipes_df.reset_index(drop=True)
+        vectorizers = {}
+        if vectorizer_mode == "hashing":
+            # Vectoriseurs sans état : de nouvelles recettes pourront être ajoutées sans réentraînement
+            text = {
+                field: IncrementalHashingVectorizer(
+                    n_features=hashing_features, use_idf=field != "ingredients", dtype=vectorizer_dtype
+                ).partial_fit(recipes_df[field])
+                for field in TEXT_FIELDS
+            }
+        else:
+            text = {}
+            for field in TEXT_FIELDS:
+                vectorize = Vectorizer.bow_vectorize if field == "ingredients" else Vectorizer.tfidf_vectorize
+                text[field], vectorizers[field] = vectorize(
+                    recipes_df[field], dtype=vectorizer_dtype, **vectorizer_params[field]
+                )
+        numeric_matrix = np.ascontiguousarray(recipes_df[NUMERIC_FEATURES].to_numpy(dtype=np.float32))
+        ingredient_minhash = None
+        if minhash is not None:
+            ingredient_minhash = MinHashIndex(minhash, minhash.signatures_from_matrix(cls._counts(text["ingredients"])))
+        return cls(
+            recipes_df=recipes_df,
+            id_to_index=IdLookup(recipes_df['id'].to_numpy()),
+            text=text,
+            numeric_matrix=numeric_matrix,
+            weights_array=weights_array,
+            alive=np.ones(len(recipes_df), dtype=bool),
+            version=version,
+            vectorizer_mode=vectorizer_mode,
+            vectorizers=vectorizers,
+            ingredient_minhash=ingredient_minhash,
+        )
+
+    @staticmethod
+    def _derive_numeric(numeric_matrix, weights_array):
+        """
+        Tableaux dérivés d'un bloc numérique : carrés des valeurs, valeurs pré-multipliées
+        par sqrt(poids par défaut) et normes au carré de ces lignes.
+        """
+        scaled_numeric = numeric_matrix * np.sqrt(weights_array).astype(np.float32)
+        return numeric_matrix * numeric_matrix, scaled_numeric, DistanceCalculator.squared_norms(scaled_numeric)
+
+    @property
+    def _numeric_derived(self):
+        return self.numeric_squared, self.scaled_numeric, self.scaled_numeric_norms
+
+    @staticmethod
+    def _counts(matrix_or_vectorizer):
+        """Matrice creuse d'un champ, quel que soit le mode de vectorisation."""
+        if isinstance(matrix_or_vectorizer, IncrementalHashingVectorizer):
+            return matrix_or_vectorizer.counts()
+        return matrix_or_vectorizer
+
+    def __len__(self):
+        return len(self.recipes_df)
+
+    @property
+    def n_deleted(self):
+        return int(len(self.alive) - np.count_nonzero(self.alive))
+
+    def field_distances(self, field, row_indices, start=0, stop=None):
+        """
+        Distances cosinus (len(row_indices), stop - start) d'un champ textuel entre les lignes requêtes
+        et le bloc de lignes [start, stop) (par défaut : toutes), selon le mode de vectorisation.
+        """
+        if self.vectorizer_mode == "hashing":
+            return self.text[field].cosine_distance_rows(row_indices, start, stop)
+        return DistanceCalculator.cosine_distance_rows(self.text[field], row_indices, start, stop)
+
+    def field_distances_to(self, field, row_index, candidate_rows):
+        """
+        Distances cosinus (len(candidate_rows),) d'un champ textuel entre une ligne et des lignes candidates.
+        """
+        if self.vectorizer_mode == "hashing":
+            return self.text[field].cosine_distance_to(row_index, candidate_rows)
+        return DistanceCalculator.cosine_distance_to(self.text[field], row_index, candidate_rows)
+
+    def query_distances(self, field, text):
+        """
+        Distances cosinus (n,) entre un texte normalisé, vectorisé par le vectoriseur du champ
+        (`transform`, sans réentraînement), et toutes les lignes de l'index.
+        """
+        if self.vectorizer_mode == "hashing":
+            vectorizer = self.text[field]
+            return vectorizer.cosine_distance_counts(vectorizer.transform([text]))[0]
+        query = self.vectorizers[field].transform([text]).astype(self.text[field].dtype)
+        return DistanceCalculator.cosine_distance_queries(query, self.text[field])[0]
+
+    def numeric_distances(self, row_indices, numeric_weights, start=0, stop=None):
+        """
+        Distances euclidiennes pondérées des variables numériques entre les lignes requêtes
+        et le bloc de lignes [start, stop). Les poids par défaut utilisent le bloc pré-mis à l'échelle,
+        les autres le développement pondéré.
+        """
+        if numeric_weights == DEFAULT_WEIGHTS:
+            return DistanceCalculator.scaled_euclidean_distance(
+                self.scaled_numeric, self.scaled_numeric_norms, row_indices, start, stop
+            )
+        weights_array = np.array([numeric_weights[feature] for feature in NUMERIC_FEATURES])
+        return DistanceCalculator.weighted_euclidean_distance(
+            self.numeric_matrix, self.numeric_squared, row_indices, weights_array, start, stop
+        )
+
+    def numeric_distances_to(self, row_index, candidate_rows, numeric_weights):
+        """
+        Distances euclidiennes pondérées (len(candidate_rows),) entre une ligne et des lignes candidates.
+        """
+        weights_array = np.array([numeric_weights[feature] for feature in NUMERIC_FEATURES])
+        return DistanceCalculator.weighted_euclidean_distance_to(
+            self.numeric_matrix, row_index, candidate_rows, weights_array
+        )
+
+    def term_columns(self, field, term):
+        """Colonnes de la matrice d'un champ correspondant aux mots d'un terme (ex : "baking powder")."""
+        vectorizer = self.text[field] if self.vectorizer_mode == "hashing" else self.vectorizers[field]
+        return np.unique(vectorizer.transform([term]).indices)
+
+    def postings(self, field):
+        """Matrice CSC d'un champ : pour chaque colonne, les lignes qui contiennent le terme."""
+        postings = self._postings.get(field)
+        if postings is None:
+            postings = sparse.csc_matrix(self._counts(self.text[field]))
+            postings.eliminate_zeros()
+            self._postings[field] = postings
+        return postings
+
+    def term_mask(self, field, term):
+        """Masque des lignes dont le champ contient tous les mots du terme."""
+        columns = self.term_columns(field, term)
+        if not len(columns):
+            return np.zeros(len(self), dtype=bool)  # Terme absent du vocabulaire
+        postings = self.postings(field)
+        rows = np.concatenate([postings.indices[postings.indptr[column]:postings.indptr[column + 1]]
+                               for column in columns])
+        return np.bincount(rows, minlength=len(self)) == len(columns)
+
+    def filter_mask(self, recipe_filter):
+        """
+        Masque des lignes non supprimées qui respectent un RecipeFilter.
+        """
+        mask = self.alive & recipe_filter.numeric_mask(self.numeric_matrix)
+        for field, (required, excluded) in recipe_filter.terms().items():
+            for term in required:
+                mask &= self.term_mask(field, term)
+            for term in excluded:
+                mask &= ~self.term_mask(field, term)
+        return mask
+
+    def minhash_candidates(self, row_index):
+        """
+        Lignes non supprimées dont les ingrédients partagent au moins une bande LSH avec la ligne donnée
+        (hors la ligne elle-même).
+
+        :raises ValueError: Si les signatures MinHash n'ont pas été construites.
+        """
+        if self.ingredient_minhash is None:
+            raise ValueError("Les signatures MinHash des ingrédients ne sont pas construites.")
+        candidates = self.ingredient_minhash.candidates(self.ingredient_minhash.signatures[row_index])
+        return candidates[self.alive[candidates] & (candidates != row_index)]
+
+    def report(self):
+        """
+        Taille de la matrice de chaque champ textuel (voir `Vectorizer.matrix_report`).
+        """
+        if self.vectorizer_mode == "hashing":
+            return {field: vectorizer.report() for field, vectorizer in self.text.items()}
+        return {field: Vectorizer.matrix_report(matrix) for field, matrix in self.text.items()}
+
+    def with_added(self, new_recipes_df, version):
+        """
+        Retourne un nouvel instantané contenant les recettes ajoutées (mode "hashing" uniquement).
+        Les blocs de comptages existants sont partagés, seuls de nouveaux blocs sont créés.
+        """
+        if self.vectorizer_mode != "hashing":
+            raise ValueError("L'ajout incrémental de recettes nécessite le mode de vectorisation 'hashing'.")
+        new_ids = new_recipes_df['id'].to_numpy()
+        duplicated = new_recipes_df['id'][self.id_to_index.contains(new_ids) | new_recipes_df['id'].duplicated()]
+        if not duplicated.empty:
+            raise ValueError(f"Identifiants de recette déjà présents : {duplicated.tolist()}")
+
+        text = {field: vectorizer.copy().partial_fit(new_recipes_df[field])
+                for field, vectorizer in self.text.items()}
+        new_numeric = new_recipes_df[NUMERIC_FEATURES].to_numpy(dtype=np.float32)
+        # Seules les nouvelles lignes sont dérivées, puis ajoutées aux tableaux existants
+        numeric_derived = tuple(
+            np.ascontiguousarray(np.concatenate([current, new]))
+            for current, new in zip(self._numeric_derived, self._derive_numeric(new_numeric, self.weights_array))
+        )
+        ingredient_minhash = self.ingredient_minhash
+        if ingredient_minhash is not None:
+            # Seul le nouveau bloc de comptages est signé
+            new_signatures = ingredient_minhash.lsh.signatures_from_matrix(text["ingredients"].blocks[-1])
+            ingredient_minhash = ingredient_minhash.with_signatures(new_signatures)
+        start = len(self.recipes_df)
+        return RecipeIndex(
+            recipes_df=pd.concat([self.recipes_df, new_recipes_df], ignore_index=True),
+            id_to_index=self.id_to_index.with_added(new_ids, np.arange(start, start + len(new_ids))),
+            text=text,
+            numeric_matrix=np.ascontiguousarray(np.concatenate([self.numeric_matrix, new_numeric])),
+            weights_array=self.weights_array,
+            alive=np.concatenate([self.alive, np.ones(len(new_recipes_df), dtype=bool)]),
+            version=version,
+            vectorizer_mode=self.vectorizer_mode,
+            vectorizers=self.vectorizers,
+            ingredient_minhash=ingredient_minhash,
+            numeric_derived=numeric_derived,
+        )
+
+    def with_deleted(self, recipe_ids, version):
+        """
+        Retourne un nouvel instantané où les recettes sont marquées supprimées (tombstones).
+        Les lignes restent dans les matrices jusqu'au compactage mais ne sont plus jamais retournées.
+        En mode "hashing", les fréquences documentaires sont décrémentées pour que l'IDF reste exact.
+        """
+        recipe_ids = pd.unique(np.asarray(recipe_ids))
+        rows = self.id_to_index.rows_of(recipe_ids)
+        alive = self.alive.copy()
+        alive[rows] = False
+
+        text = self.text
+        if self.vectorizer_mode == "hashing":
+            text = {field: vectorizer.copy().forget_rows(rows) for field, vectorizer in self.text.items()}
+        return RecipeIndex(
+            recipes_df=self.recipes_df,
+            id_to_index=self.id_to_index.without(recipe_ids),
+            text=text,
+            numeric_matrix=self.numeric_matrix,
+            weights_array=self.weights_array,
+            alive=alive,
+            version=version,
+            vectorizer_mode=self.vectorizer_mode,
+            vectorizers=self.vectorizers,
+            ingredient_minhash=self.ingredient_minhash,
+            numeric_derived=self._numeric_derived,
+        )
+
+    def compacted(self, version):
+        """
+        Retourne un nouvel instantané sans les lignes supprimées (positions renumérotées).
+        """
+        keep = np.flatnonzero(self.alive)
+        recipes_df = self.recipes_df.iloc[keep].reset_index(drop=True)
+        if self.vectorizer_mode == "hashing":
+            text = {field: vectorizer.compacted(keep) for field, vectorizer in self.text.items()}
+        else:
+            text = {field: sparse.csr_matrix(matrix[keep]) for field, matrix in self.text.items()}
+        ingredient_minhash = self.ingredient_minhash
+        if ingredient_minhash is not None:
+            ingredient_minhash = ingredient_minhash.subset(keep)
+        return RecipeIndex(
+            recipes_df=recipes_df,
+            id_to_index=IdLookup(recipes_df['id'].to_numpy()),
+            text=text,
+            numeric_matrix=np.ascontiguousarray(self.numeric_matrix[keep]),
+            weights_array=self.weights_array,
+            alive=np.ones(len(recipes_df), dtype=bool),
+            version=version,
+            vectorizer_mode=self.vectorizer_mode,
+            vectorizers=self.vectorizers,
+            ingredient_minhash=ingredient_minhash,
+            numeric_derived=tuple(np.ascontiguousarray(array[keep]) for array in self._numeric_derived),
+        )
@@ -0,0 +1,101 @@
+# result_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+import numpy as np
+
+
+class ResultCache:
+    """
+    Cache LRU/TTL des résultats de recherche de recettes proches.
+
+    Chaque entrée ne stocke que deux tableaux compacts : les identifiants des recettes
+    proches et leurs distances combinées. La taille totale est bornée en octets.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param max_bytes: Taille maximale des tableaux stockés, en octets (par défaut : 32 Mo).
+        :param ttl: Durée de vie d'une entrée en secondes (None : pas d'expiration).
+        :param clock: Horloge utilisée pour l'expiration (injectable pour les tests).
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[np.ndarray, np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_bytes(ids: np.ndarray, distances: np.ndarray) -> int:
+        return ids.nbytes + distances.nbytes
+
+    def _drop(self, key: Hashable):
+        ids, distances, _ = self._entries.pop(key)
+        self.current_bytes -= self._entry_bytes(ids, distances)
+
+    def get(self, key: Hashable) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Retourne (ids, distances) pour une clé, ou None si absente ou expirée.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and self.clock() - entry[2] > self.ttl:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, key: Hashable, ids: np.ndarray, distances: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stocke un résultat. Les tableaux sont convertis en types compacts
+        (int32 pour les identifiants si possible, float32 pour les distances) et figés en lecture seule.
+        :return: Les tableaux compacts, identiques à ceux que retournera `get`.
+        """
+        ids = np.asarray(ids)
+        fits_int32 = ids.size and ids.max() <= np.iinfo(np.int32).max and ids.min() >= np.iinfo(np.int32).min
+        ids = np.array(ids, dtype=np.int32 if fits_int32 else ids.dtype)
+        distances = np.array(distances, dtype=np.float32)
+        ids.setflags(write=False)
+        distances.setflags(write=False)
+
+        size = self._entry_bytes(ids, distances)
+        if size > self.max_bytes:
+            return ids, distances
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (ids, distances, self.clock())
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return ids, distances
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les métriques du cache : taille, succès, échecs, évictions et taux de succès."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
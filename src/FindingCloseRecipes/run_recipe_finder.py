@@ -1,6 +1,12 @@
 import pandas as pd
-from src.FindingCloseRecipes.recipe_finder import RecipeFinder
+from src.DataPreprocess.normalizer import Normalizer
+from src.FindingCloseRecipes.config import NORMALIZER_PATH
+from src.monitoring.metrics import get_registry, timed
 import os
+import threading
+
+_finder = None
+_finder_lock = threading.Lock()
 
 def reconstruct_pp_recipes():
     datasets = {}
@@ -31,6 +37,90 @@ def reconstruct_pp_recipes():
 
     return pp_recipes
 
+def load_normalizer():
+    """
+    Charge les paramètres de normalisation sauvegardés par le prétraitement (None s'ils sont absents).
+    """
+    if not os.path.exists(NORMALIZER_PATH):
+        print(f"Fichier manquant : {NORMALIZER_PATH}")
+        return None
+    return Normalizer.load(NORMALIZER_PATH)
+
+def load_recipe_finder():
+    """
+    Retourne le RecipeFinder partagé par le processus.
+    Le dataset est chargé et vectorisé une seule fois, au premier appel.
+    """
+    global _finder
+    with _finder_lock:
+        if _finder is None:
+            # Import local : scikit-learn et SciPy ne sont chargés qu'à la première recherche,
+            # pas au démarrage de l'application
+            from src.FindingCloseRecipes.recipe_finder import RecipeFinder
+            with get_registry().timer("recipe_finder_build_seconds"):
+                finder = RecipeFinder(reconstruct_pp_recipes(), normalizer=load_normalizer())
+                finder.preprocess()
+            get_registry().register_collector("recipe_finder_result_cache", finder.cache_stats)
+            _finder = finder
+        return _finder
+
+@timed("recipe_finder_query_seconds", mode="recipe")
+def find_similar_recipes(recipe_id, combined_weights=None, numeric_weights=None, top_n=None, recipe_filter=None):
+    """
+    Trouve les recettes les plus proches d'une recette avec le RecipeFinder partagé.
+    Les poids et top_n surchargent ceux de la configuration pour cette requête uniquement.
+    Le filtre optionnel (RecipeFilter) restreint les recettes proches (durée, ingrédients, tags...).
+    
+    Raises:
+        ValueError: Si l'identifiant de recette est introuvable ou si un poids est invalide.
+    """
+    return load_recipe_finder().find_similar_recipes(
+        recipe_id, combined_weights=combined_weights, numeric_weights=numeric_weights, top_n=top_n,
+        recipe_filter=recipe_filter
+    )
+
+@timed("recipe_finder_query_seconds", mode="text")
+def search_recipes_by_text(query, combined_weights=None, top_n=None, recipe_filter=None):
+    """
+    Trouve les recettes les plus proches d'une requête en texte libre avec le RecipeFinder partagé.
+    
+    Args:
+        query (str | dict): Texte libre, ou dictionnaire {champ: texte}.
+    
+    Raises:
+        ValueError: Si la requête ne contient aucun terme exploitable ou si un poids est invalide.
+    """
+    return load_recipe_finder().find_recipes_by_text(
+        query, combined_weights=combined_weights, top_n=top_n, recipe_filter=recipe_filter
+    )
+
+def ingest_recipes(new_recipes, normalized=True):
+    """
+    Ajoute un lot de nouvelles recettes prétraitées (ingestion delta nocturne) au RecipeFinder partagé,
+    sans réentraîner les vectoriseurs. Nécessite VECTORIZER_MODE = "hashing" dans la configuration.
+    
+    Args:
+        new_recipes (pd.DataFrame): Recettes à ajouter, avec les mêmes colonnes que pp_recipes.
+        normalized (bool): True (par défaut) si les variables numériques sont normalisées, comme dans
+            pp_recipes : elles sont indexées telles quelles. False pour des variables brutes (log_minutes
+            et valeurs nutritionnelles avant normalisation) : elles sont normalisées avec les paramètres
+            du dataset (NORMALIZER_PATH), et non avec les statistiques du lot.
+    
+    Raises:
+        ValueError: Si les paramètres de normalisation sont absents pour des variables brutes.
+    """
+    load_recipe_finder().add_recipes(new_recipes, normalized=normalized)
+
+def remove_recipes(recipe_ids):
+    """
+    Supprime des recettes du RecipeFinder partagé (tombstones, compactage périodique automatique).
+    Les recherches en cours terminent sur l'instantané de l'index qu'elles ont commencé à utiliser.
+    
+    Args:
+        recipe_ids (list): Identifiants des recettes à retirer du catalogue.
+    """
+    load_recipe_finder().delete_recipes(recipe_ids)
+
 def run_recipe_finder(recipe_id):
     """
     Trouve les 100 recettes les plus proches d'une recette donnée par son ID.
@@ -41,12 +131,9 @@ def run_recipe_finder(recipe_id):
     Returns:
         pd.DataFrame: Les 100 recettes les plus proches avec leurs distances combinées.
     """
-    # Charger le dataset
-    pp_recipes = reconstruct_pp_recipes()  # Remplacez par le chemin de votre fichier
-
-    # Initialiser le RecipeFinder
-    finder = RecipeFinder(pp_recipes)
-    finder.preprocess()  # Cette étape inclut désormais des matrices creuses
+    # Charger le RecipeFinder (dataset chargé et vectorisé une seule fois par processus)
+    finder = load_recipe_finder()
+    pp_recipes = finder.recipes_df
 
     # Trouver les recettes similaires
     try:
@@ -0,0 +1,162 @@
+# search_executor.py
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+import pandas as pd
+from src.FindingCloseRecipes.run_recipe_finder import find_similar_recipes, search_recipes_by_text
+
+
+def _freeze(value):
+    """Rend hashable un argument de recherche (les dictionnaires de poids deviennent des tuples triés)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+class RecipeSearchExecutor:
+    """
+    Exécute les recherches de recettes proches en arrière-plan, hors du thread du script Streamlit.
+
+    - Les requêtes identiques en cours (même clé de requête) sont fusionnées : une seule exécution
+      est partagée par toutes les sessions qui l'attendent.
+    - Une nouvelle requête d'une session remplace la précédente : si plus personne n'attend
+      l'ancienne et qu'elle n'a pas encore démarré, elle est annulée.
+    - Seules les `max_sessions` sessions les plus récemment actives gardent leur dernière recherche
+      (et son résultat) : au-delà, la moins récente est oubliée (LRU).
+    """
+
+    PENDING = "pending"
+    DONE = "done"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+
+    def __init__(self, search_fn: Callable[..., pd.DataFrame], max_workers: Optional[int] = None,
+                 max_sessions: int = 256):
+        """
+        :param search_fn: Fonction de recherche appelée avec les arguments de `submit`.
+        :param max_workers: Nombre de threads du pool (par défaut : nombre de coeurs).
+        :param max_sessions: Nombre maximal de sessions dont la dernière recherche est conservée.
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions doit être supérieur ou égal à 1.")
+        self.search_fn = search_fn
+        self.max_sessions = max_sessions
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1,
+                                        thread_name_prefix="recipe-search")
+        # Réentrant : les callbacks d'un Future terminé ou annulé s'exécutent dans le thread appelant
+        self._lock = threading.RLock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._subscribers: Dict[Hashable, Set[Hashable]] = {}
+        self._sessions: "OrderedDict[Hashable, Tuple[Hashable, Future]]" = OrderedDict()
+
+    def submit(self, session_key: Hashable, recipe_id: int, **search_kwargs) -> Future:
+        """
+        Soumet une recherche pour une session et retourne le Future associé.
+        :param session_key: Identifiant de la session utilisateur.
+        :param recipe_id: Identifiant de la recette de référence (ou requête, pour une recherche en texte libre).
+        :param search_kwargs: Arguments supplémentaires de la recherche (poids, top_n...).
+        """
+        request_key = (_freeze(recipe_id), _freeze(search_kwargs))
+        with self._lock:
+            previous = self._sessions.get(session_key)
+            if previous is not None and previous[0] == request_key:
+                self._sessions.move_to_end(session_key)
+                return previous[1]
+            if previous is not None:
+                self._release(session_key, previous[0])
+
+            future = self._inflight.get(request_key)
+            if future is None:
+                future = self._pool.submit(self.search_fn, recipe_id, **search_kwargs)
+                self._inflight[request_key] = future
+                future.add_done_callback(lambda f, key=request_key: self._forget(key, f))
+            self._subscribers.setdefault(request_key, set()).add(session_key)
+            self._sessions[session_key] = (request_key, future)
+            self._sessions.move_to_end(session_key)
+            while len(self._sessions) > self.max_sessions:
+                evicted_key, (evicted_request, _) = self._sessions.popitem(last=False)
+                self._release(evicted_key, evicted_request)
+            return future
+
+    def _release(self, session_key: Hashable, request_key: Hashable):
+        """Désabonne une session d'une requête et annule la requête si plus personne ne l'attend."""
+        subscribers = self._subscribers.get(request_key)
+        if subscribers is None:
+            return
+        subscribers.discard(session_key)
+        if not subscribers:
+            del self._subscribers[request_key]
+            future = self._inflight.get(request_key)
+            if future is not None and future.cancel():
+                self._inflight.pop(request_key, None)
+
+    def _forget(self, request_key: Hashable, future: Future):
+        """Retire une requête terminée des requêtes en cours (les sessions gardent leur Future)."""
+        with self._lock:
+            if self._inflight.get(request_key) is future:
+                del self._inflight[request_key]
+                self._subscribers.pop(request_key, None)
+
+    def poll(self, session_key: Hashable) -> Tuple[Optional[str], Optional[object]]:
+        """
+        Retourne l'état de la dernière recherche d'une session, sans bloquer.
+        :return: (statut, résultat) où le résultat est le DataFrame si la recherche est terminée,
+                 l'exception si elle a échoué, et None sinon. (None, None) si aucune recherche.
+        """
+        with self._lock:
+            entry = self._sessions.get(session_key)
+            if entry is not None:
+                self._sessions.move_to_end(session_key)
+        if entry is None:
+            return None, None
+        future = entry[1]
+        if future.cancelled():
+            return self.CANCELLED, None
+        if not future.done():
+            return self.PENDING, None
+        exception = future.exception()
+        if exception is not None:
+            return self.ERROR, exception
+        return self.DONE, future.result()
+
+    def cancel(self, session_key: Hashable):
+        """Abandonne la recherche en cours d'une session."""
+        with self._lock:
+            entry = self._sessions.pop(session_key, None)
+            if entry is not None:
+                self._release(session_key, entry[0])
+
+    def shutdown(self, wait: bool = True):
+        """Arrête le pool de threads."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_default_executor: Optional[RecipeSearchExecutor] = None
+_text_executor: Optional[RecipeSearchExecutor] = None
+_default_executor_lock = threading.Lock()
+
+
+def get_search_executor() -> RecipeSearchExecutor:
+    """
+    Retourne l'exécuteur de recherches partagé par le processus (créé au premier appel),
+    commun à toutes les sessions Streamlit.
+    """
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = RecipeSearchExecutor(find_similar_recipes)
+        return _default_executor
+
+
+def get_text_search_executor() -> RecipeSearchExecutor:
+    """
+    Retourne l'exécuteur des recherches en texte libre partagé par le processus (créé au premier appel) :
+    `submit(session_key, query, ...)` appelle `search_recipes_by_text(query, ...)`.
+    """
+    global _text_executor
+    with _default_executor_lock:
+        if _text_executor is None:
+            _text_executor = RecipeSearchExecutor(search_recipes_by_text)
+        return _text_executor
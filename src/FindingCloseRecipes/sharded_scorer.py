@@ -0,0 +1,89 @@
+# sharded_scorer.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.FindingCloseRecipes.recipe_index import TEXT_FIELDS
+
+
+class ShardedScorer:
+    """
+    Recherche exacte des recettes proches répartie sur plusieurs coeurs.
+
+    Les lignes de l'index sont découpées en blocs contigus (shards). Chaque bloc est évalué
+    dans un thread : les produits creux (scipy) et le GEMM numérique (BLAS) libèrent le GIL.
+    Chaque bloc ne garde que ses top_n meilleures recettes, puis les listes locales sont fusionnées.
+    """
+
+    def __init__(self, n_workers=None, min_shard_rows=16384):
+        """
+        :param n_workers: Nombre de threads (par défaut : nombre de coeurs).
+        :param min_shard_rows: Taille minimale d'un bloc, pour ne pas découper les petits index.
+        """
+        self.n_workers = max(1, n_workers or os.cpu_count() or 1)
+        self.min_shard_rows = min_shard_rows
+        self._pool = ThreadPoolExecutor(max_workers=self.n_workers, thread_name_prefix="recipe-shard") \
+            if self.n_workers > 1 else None
+
+    def shards(self, n_rows):
+        """Retourne les bornes (start, stop) des blocs de lignes."""
+        n_shards = max(1, min(self.n_workers, n_rows // self.min_shard_rows))
+        bounds = np.linspace(0, n_rows, n_shards + 1).astype(int)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    @staticmethod
+    def _score_shard(index, query_rows, combined_weights, numeric_weights, top_n, mask, start, stop, components_out):
+        """
+        Distances combinées des requêtes au bloc [start, stop) et top_n local de chaque requête.
+        """
+        combined = combined_weights["epsilon"] * index.numeric_distances(query_rows, numeric_weights, start, stop)
+        for field, weight_name in TEXT_FIELDS.items():
+            field_distances = index.field_distances(field, query_rows, start, stop)
+            if components_out is not None:
+                components_out[field][:, start:stop] = field_distances
+            combined += combined_weights[weight_name] * field_distances
+
+        # Exclure la recette requête (si elle est dans ce bloc) et les recettes hors masque (supprimées, filtrées)
+        in_shard = (query_rows >= start) & (query_rows < stop)
+        combined[np.flatnonzero(in_shard), query_rows[in_shard] - start] = np.inf
+        combined[:, ~mask[start:stop]] = np.inf
+
+        k = min(top_n, stop - start)
+        local = np.argpartition(combined, k - 1, axis=1)[:, :k] if k < stop - start \
+            else np.broadcast_to(np.arange(stop - start), combined.shape)
+        return local + start, np.take_along_axis(combined, local, axis=1)
+
+    def score(self, index, query_rows, combined_weights, numeric_weights, top_n, components_out=None, mask=None):
+        """
+        Trouve les top_n recettes les plus proches de chaque requête.
+
+        :param index: Instantané RecipeIndex.
+        :param query_rows: Lignes (validées) des recettes requêtes.
+        :param components_out: Dictionnaire optionnel {champ: tableau (b, n)} rempli avec les distances
+                               par champ textuel (pour le cache des composantes du RecipeFinder).
+        :param mask: Masque des lignes éligibles (par défaut : les recettes non supprimées).
+        :return: (lignes, distances), deux tableaux (b, k) triés par distance croissante,
+                 avec k = min(top_n, nombre de lignes éligibles). Les distances infinies
+                 (recette requête, moins de k lignes éligibles) sont à ignorer.
+        """
+        query_rows = np.atleast_1d(np.asarray(query_rows, dtype=np.int64))
+        mask = index.alive if mask is None else mask
+        shards = self.shards(len(index))
+        args = (index, query_rows, combined_weights, numeric_weights, top_n, mask)
+        if self._pool is None or len(shards) == 1:
+            results = [self._score_shard(*args, start, stop, components_out) for start, stop in shards]
+        else:
+            futures = [self._pool.submit(self._score_shard, *args, start, stop, components_out)
+                       for start, stop in shards]
+            results = [future.result() for future in futures]
+
+        rows = np.concatenate([shard_rows for shard_rows, _ in results], axis=1)
+        distances = np.concatenate([shard_distances for _, shard_distances in results], axis=1)
+        k = min(top_n, int(np.count_nonzero(mask)))
+        # Fusion : tri par distance puis par ligne, pour un résultat indépendant du découpage
+        order = np.lexsort((rows, distances), axis=1)[:, :k] if rows.shape[1] else rows[:, :0]
+        return np.take_along_axis(rows, order, axis=1), np.take_along_axis(distances, order, axis=1)
+
+    def shutdown(self):
+        """Arrête le pool de threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
@@ -1,16 +1,238 @@
 # vectorizers.py
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer, HashingVectorizer
 
 class Vectorizer:
     @staticmethod
-    def tfidf_vectorize(column_data):
-        vectorizer = TfidfVectorizer()
+    def tfidf_vectorize(column_data, min_df=1, max_df=1.0, max_features=None, dtype=np.float32):
+        """
+        Vectorise une colonne textuelle en TF-IDF.
+        :param min_df: Fréquence documentaire minimale (nombre ou proportion) d'un terme conservé.
+        :param max_df: Fréquence documentaire maximale (nombre ou proportion) d'un terme conservé.
+        :param max_features: Taille maximale du vocabulaire (termes les plus fréquents).
+        :param dtype: Type des valeurs de la matrice (float32 par défaut).
+        """
+        vectorizer = TfidfVectorizer(min_df=min_df, max_df=max_df, max_features=max_features, dtype=dtype)
         tfidf_matrix = vectorizer.fit_transform(column_data)
         return tfidf_matrix, vectorizer  # Retourner la matrice sparse et le vectorizer
 
     @staticmethod
-    def bow_vectorize(column_data):
-        vectorizer = CountVectorizer()
+    def bow_vectorize(column_data, min_df=1, max_df=1.0, max_features=None, dtype=np.float32):
+        """
+        Vectorise une colonne textuelle en sac de mots (comptages).
+        Les paramètres sont ceux de `tfidf_vectorize`.
+        """
+        vectorizer = CountVectorizer(min_df=min_df, max_df=max_df, max_features=max_features, dtype=dtype)
         bow_matrix = vectorizer.fit_transform(column_data)
         return bow_matrix, vectorizer  # Retourner la matrice sparse et le vectorizer
+
+    @staticmethod
+    def matrix_report(matrix):
+        """
+        Retourne la taille d'une matrice creuse : dimensions, nombre de valeurs non nulles et octets occupés.
+        """
+        n_bytes = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        return {
+            "rows": matrix.shape[0],
+            "vocabulary": matrix.shape[1],
+            "nnz": matrix.nnz,
+            "dtype": str(matrix.dtype),
+            "index_dtype": str(matrix.indices.dtype),
+            "bytes": n_bytes,
+        }
+
+
+class IncrementalHashingVectorizer:
+    """
+    Vectoriseur TF-IDF sans état par hachage des termes, pour l'ajout incrémental de recettes.
+
+    Les comptages bruts des recettes sont stockés par blocs (un bloc par ajout) et ne sont
+    jamais réécrits. Les fréquences documentaires sont mises à jour à chaque ajout et l'IDF
+    est appliqué au moment du calcul des distances :
+        cos(q, x) = (q * idf) . (x * idf) / (||q * idf|| ||x * idf||)
+    ce qui donne les mêmes distances cosinus qu'un TfidfVectorizer (idf lissé) réentraîné,
+    aux collisions de hachage près.
+    """
+
+    def __init__(self, n_features=2 ** 20, use_idf=True, dtype=np.float32):
+        """
+        :param n_features: Nombre de colonnes de hachage.
+        :param use_idf: Pondérer par l'IDF (False : sac de mots, comme `bow_vectorize`).
+        :param dtype: Type des valeurs des matrices.
+        """
+        self.n_features = n_features
+        self.use_idf = use_idf
+        self.dtype = np.dtype(dtype)
+        self.hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None, dtype=self.dtype)
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self.blocks = []
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._squared_weights = None
+        self._row_norms = None
+
+    def transform(self, column_data):
+        """
+        Retourne les comptages hachés de textes, sans modifier l'index (ex : requêtes).
+        """
+        return self.hasher.transform(column_data).tocsr()
+
+    def partial_fit(self, column_data):
+        """
+        Ajoute des documents : un nouveau bloc de comptages est créé et les fréquences documentaires
+        sont incrémentées. Les blocs existants ne sont pas modifiés.
+        """
+        counts = self.transform(column_data)
+        counts.sort_indices()
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+        self.blocks.append(counts)
+        self._offsets = np.append(self._offsets, self._offsets[-1] + counts.shape[0])
+        self._squared_weights = None
+        self._row_norms = None
+        return self
+
+    def copy(self):
+        """
+        Copie légère : les blocs de comptages (jamais modifiés) sont partagés,
+        les statistiques documentaires sont copiées.
+        """
+        clone = IncrementalHashingVectorizer.__new__(IncrementalHashingVectorizer)
+        clone.n_features = self.n_features
+        clone.use_idf = self.use_idf
+        clone.dtype = self.dtype
+        clone.hasher = self.hasher
+        clone.document_frequency = self.document_frequency.copy()
+        clone.n_documents = self.n_documents
+        clone.blocks = list(self.blocks)
+        clone._offsets = self._offsets.copy()
+        clone._squared_weights = self._squared_weights
+        clone._row_norms = self._row_norms
+        return clone
+
+    def forget_rows(self, row_indices):
+        """
+        Retire des lignes des statistiques documentaires (recettes supprimées).
+        Les comptages restent dans les blocs jusqu'au compactage.
+        """
+        counts = self.rows(row_indices)
+        self.document_frequency -= np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents -= counts.shape[0]
+        self._squared_weights = None
+        self._row_norms = None
+        return self
+
+    def compacted(self, keep_rows):
+        """
+        Retourne un vectoriseur dont l'unique bloc contient seulement les lignes conservées.
+        """
+        merged = sparse.vstack(self.blocks, format="csr")[keep_rows]
+        merged.sort_indices()
+        compact = IncrementalHashingVectorizer(n_features=self.n_features, use_idf=self.use_idf, dtype=self.dtype)
+        compact.document_frequency = np.bincount(merged.indices, minlength=self.n_features).astype(np.int64)
+        compact.n_documents = merged.shape[0]
+        compact.blocks = [merged]
+        compact._offsets = np.array([0, merged.shape[0]], dtype=np.int64)
+        return compact
+
+    @property
+    def shape(self):
+        return int(self._offsets[-1]), self.n_features
+
+    def idf(self):
+        """
+        IDF lissé, identique à celui de scikit-learn : ln((1 + n) / (1 + df)) + 1.
+        """
+        if not self.use_idf:
+            return np.ones(self.n_features, dtype=self.dtype)
+        return (np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1).astype(self.dtype)
+
+    def squared_weights(self):
+        """Carré des poids IDF, recalculé après chaque ajout."""
+        if self._squared_weights is None:
+            idf = self.idf()
+            self._squared_weights = idf * idf
+        return self._squared_weights
+
+    def row_norms(self):
+        """Normes des lignes pondérées par l'IDF courant (calculées une fois par ajout)."""
+        if self._row_norms is None:
+            weights = self.squared_weights()
+            self._row_norms = np.sqrt(np.concatenate([
+                block.power(2) @ weights for block in self.blocks
+            ])) if self.blocks else np.zeros(0, dtype=self.dtype)
+        return self._row_norms
+
+    def rows(self, row_indices):
+        """Retourne les comptages des lignes demandées, quels que soient leurs blocs."""
+        row_indices = np.atleast_1d(row_indices)
+        if len(self.blocks) == 1:
+            return self.blocks[0][row_indices]
+        # Une extraction par bloc, puis remise dans l'ordre demandé
+        block_ids = np.searchsorted(self._offsets, row_indices, side="right") - 1
+        parts, positions = [], []
+        for block_id in np.unique(block_ids):
+            in_block = np.flatnonzero(block_ids == block_id)
+            parts.append(self.blocks[block_id][row_indices[in_block] - self._offsets[block_id]])
+            positions.append(in_block)
+        return sparse.vstack(parts, format="csr")[np.argsort(np.concatenate(positions))]
+
+    def cosine_distance_counts(self, query_counts, start=0, stop=None):
+        """
+        Distances cosinus entre des comptages requêtes (b, n_features) et les lignes indexées [start, stop).
+        :return: Matrice dense (b, stop - start) des distances.
+        """
+        stop = self.shape[0] if stop is None else stop
+        weights = self.squared_weights()
+        weighted_queries = sparse.csr_matrix(query_counts.multiply(weights))
+        parts = []
+        for block, offset in zip(self.blocks, self._offsets[:-1]):
+            low, high = max(start, offset), min(stop, offset + block.shape[0])
+            if low < high:
+                rows = block if high - low == block.shape[0] else block[low - offset:high - offset]
+                parts.append((rows @ weighted_queries.T).toarray())
+        numerators = np.vstack(parts).T if parts else np.zeros((query_counts.shape[0], 0), dtype=self.dtype)
+        query_norms = np.sqrt(query_counts.power(2) @ weights)
+        denominators = np.outer(query_norms, self.row_norms()[start:stop])
+        similarities = np.divide(numerators, denominators, out=np.zeros_like(numerators),
+                                 where=denominators > 0)
+        return (1 - similarities).astype(self.dtype)
+
+    def cosine_distance_rows(self, row_indices, start=0, stop=None):
+        """
+        Distances cosinus entre des lignes indexées et les lignes [start, stop) (par défaut : toutes).
+        :return: Matrice dense (len(row_indices), stop - start) des distances.
+        """
+        return self.cosine_distance_counts(self.rows(row_indices), start, stop)
+
+    def cosine_distance_to(self, row_index, candidate_rows):
+        """
+        Distances cosinus (len(candidate_rows),) entre une ligne indexée et des lignes candidates.
+        """
+        weights = self.squared_weights()
+        query = self.rows([row_index])
+        numerators = (self.rows(candidate_rows) @ sparse.csr_matrix(query.multiply(weights)).T).toarray()[:, 0]
+        denominators = np.sqrt(query.power(2) @ weights)[0] * self.row_norms()[candidate_rows]
+        similarities = np.divide(numerators, denominators, out=np.zeros_like(numerators),
+                                 where=denominators > 0)
+        return (1 - similarities).astype(self.dtype)
+
+    def counts(self):
+        """Comptages de toutes les lignes indexées, en une seule matrice."""
+        if len(self.blocks) == 1:
+            return self.blocks[0]
+        return sparse.vstack(self.blocks, format="csr")
+
+    def report(self):
+        """Taille cumulée des blocs, au format de `Vectorizer.matrix_report`."""
+        reports = [Vectorizer.matrix_report(block) for block in self.blocks]
+        return {
+            "rows": self.shape[0],
+            "vocabulary": int(np.count_nonzero(self.document_frequency)),
+            "nnz": sum(report["nnz"] for report in reports),
+            "dtype": str(self.dtype),
+            "index_dtype": reports[0]["index_dtype"] if reports else "",
+            "bytes": sum(report["bytes"] for report in reports),
+        }
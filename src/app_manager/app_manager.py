@@ -1,21 +1,24 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import streamlit as st
-import seaborn as sns
 import requests
-import io
-import streamlit as st
-from sklearn.manifold import TSNE
-from sklearn.feature_extraction.text import TfidfVectorizer
 from typing import List
-from PIL import Image
-import plotly.express as px
-import plotly.graph_objects as go
+from src.app_manager.geometry import farthest_pair
+from src.app_manager.image_cache import ImageCache, get_default_image_cache
+from src.monitoring.metrics import timed
 
 
 class AppManager:
 
+    def __init__(self, image_cache: ImageCache = None):
+        """
+        Parameters:
+        ----------
+        image_cache : ImageCache, optional
+            Cache des vignettes d'images. Si None, le cache partagé par le processus est utilisé.
+        """
+        self.image_cache = image_cache if image_cache is not None else get_default_image_cache()
+
     def hide_streamlit_ui_elements(self, hide_menu: bool = True, hide_footer: bool = True, custom_class: str = None):
         """
         Masque certains éléments de l'interface Streamlit, comme le menu, le footer, ou des éléments spécifiques.
@@ -65,6 +68,7 @@ class AppManager:
         except Exception as e:
             st.error(f"Erreur lors du masquage des éléments Streamlit : {e}")
 
+    @timed("app_suggest_similar_ids_seconds")
     def suggest_similar_ids(self,table_recipes : pd.DataFrame, user_input: str, max_suggestions: int = 3) -> List[int]:
         """
         Propose des IDs similaires basés sur la distance de Jaccard entre l'entrée utilisateur
@@ -125,10 +129,11 @@ class AppManager:
     def set_image(self, image_url: str):
         """
         Télécharge une image depuis une URL et l'affiche dans l'application.
+        La vignette redimensionnée est mise en cache : les réexécutions ne la retéléchargent pas.
 
         Parameters:
         ----------
-        url_im : str
+        image_url : str
             URL de l'image à télécharger et afficher.
 
         Returns:
@@ -144,13 +149,8 @@ class AppManager:
             Pour toute autre erreur non prévue.
         """
         try:
-            # Télécharger l'image distante
-            response = requests.get(image_url,timeout=10)
-            response.raise_for_status()  # Vérifie les erreurs HTTP
-
-            # Lire l'image directement depuis les données téléchargées
-            image = Image.open(io.BytesIO(response.content))
-            image = image.resize((200, 100))
+            # Récupérer la vignette (cache mémoire/disque, sinon téléchargement)
+            image = self.image_cache.get(image_url)
 
             # Afficher l'image
             st.image(image, caption="", use_container_width=True)
@@ -159,6 +159,33 @@ class AppManager:
             st.error(f"Erreur lors du téléchargement de l'image : {e}")
         except Exception as e:
             st.error(f"Une erreur est survenue : {e}")
+
+    def set_images(self, image_urls: List[str], n_columns: int = 3):
+        """
+        Télécharge plusieurs images en parallèle et les affiche sur une grille.
+
+        Parameters:
+        ----------
+        image_urls : List[str]
+            URLs des images à afficher.
+        n_columns : int, optional
+            Nombre de colonnes de la grille. Par défaut, 3.
+
+        Returns:
+        -------
+        None
+            Affiche les images dans l'interface utilisateur Streamlit.
+        """
+        try:
+            images, errors = self.image_cache.fetch_many(image_urls)
+            columns = st.columns(n_columns)
+            for position, image_url in enumerate(url for url in image_urls if url in images):
+                with columns[position % n_columns]:
+                    st.image(images[image_url], caption="", use_container_width=True)
+            for image_url, error in errors.items():
+                st.error(f"Erreur lors du téléchargement de l'image {image_url} : {error}")
+        except Exception as e:
+            st.error(f"Une erreur est survenue : {e}")
             
             
     def set_background_image(self, image_url: str):
@@ -235,6 +262,7 @@ class AppManager:
             st.error(f"Erreur lors de l'affichage du titre ajusté : {e}")
 
 
+    @timed("app_tsne_seconds", variant="prev")
     def perform_tsne_prev(self,recipes : pd.DataFrame, selected_ingredients, contributor_id, n_components=2, n_iter=250):
         """
         Effectue une réduction dimensionnelle t-SNE directement sur les données vectorisées sans PCA préalable,
@@ -306,6 +334,13 @@ class AppManager:
             # Appliquer la fonction de l'ingrédient dominant
             filtered_recipes['dominant_ingredient'] = filtered_recipes['filtered_ingredients'].apply(get_dominant_ingredient)
 
+            # Imports locaux : t-SNE et les bibliothèques graphiques ne sont chargés qu'au premier graphique,
+            # pas au démarrage de l'application
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            from sklearn.manifold import TSNE
+
             # Vectorisation avec TF-IDF
             vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)  # Limiter le nombre de features
             X_tfidf = vectorizer.fit_transform(filtered_recipes['filtered_ingredients'])
@@ -327,15 +362,8 @@ class AppManager:
             filtered_recipes['tsne1'] = X_tsne[:, 0]
             filtered_recipes['tsne2'] = X_tsne[:, 1]
 
-            # Calculer la distance euclidienne entre chaque paire de points
-            distances = np.linalg.norm(X_tsne[:, np.newaxis] - X_tsne, axis=2)
-
-            # Trouver les indices des deux points les plus éloignés
-            np.fill_diagonal(distances, 0)  # Ignorer la diagonale (distance d'un point à lui-même)
-            max_dist_indices = np.unravel_index(np.argmax(distances), distances.shape)
-
-            # Récupérer les indices des recettes correspondantes
-            point_1_index, point_2_index = max_dist_indices
+            # Trouver les indices des deux points les plus éloignés (enveloppe convexe, sans matrice n x n)
+            point_1_index, point_2_index = farthest_pair(X_tsne[:, :2])
             recipe_1 = filtered_recipes.iloc[point_1_index]
             recipe_2 = filtered_recipes.iloc[point_2_index]
 
@@ -391,6 +419,7 @@ class AppManager:
             print(f"Erreur lors de la génération du graphique t-SNE : {e}")
             
 
+    @timed("app_tsne_seconds", variant="streamlit")
     def perform_tsne_with_streamlit(self,recipes: pd.DataFrame, selected_ingredients, contributor_id, n_components=2, n_iter=250):
         try:
             # Vérifier si les recettes sont disponibles
@@ -412,6 +441,12 @@ class AppManager:
                 st.warning("Aucune recette ne contient les ingrédients sélectionnés.")
                 return
 
+            # Imports locaux : t-SNE et Plotly ne sont chargés qu'au premier graphique
+            import plotly.express as px
+            import plotly.graph_objects as go
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            from sklearn.manifold import TSNE
+
             vectorizer = TfidfVectorizer(
                 tokenizer=lambda x: x.split(),
                 stop_words='english',
@@ -439,9 +474,7 @@ class AppManager:
             recipes['tsne2'] = X_tsne[:, 1]
 
             # Identifier les points les plus éloignés
-            distances = np.linalg.norm(X_tsne[:, np.newaxis] - X_tsne, axis=2)
-            np.fill_diagonal(distances, 0)
-            max_dist_indices = np.unravel_index(np.argmax(distances), distances.shape)
+            max_dist_indices = farthest_pair(X_tsne[:, :2])
             recipe_1 = recipes.iloc[max_dist_indices[0]]
             recipe_2 = recipes.iloc[max_dist_indices[1]]
 
@@ -0,0 +1,144 @@
+import numpy as np
+from typing import Tuple
+
+
+def _cross(o: np.ndarray, a: np.ndarray, b: np.ndarray) -> float:
+    """Produit vectoriel 2D de (a - o) et (b - o)."""
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _prefilter_extremes(points: np.ndarray) -> np.ndarray:
+    """
+    Heuristique d'Akl-Toussaint : élimine en une passe vectorisée les points situés
+    strictement à l'intérieur du quadrilatère formé par les points extrêmes
+    (min/max de x + y et de x - y). Ces points ne peuvent pas appartenir à l'enveloppe.
+
+    Parameters:
+    ----------
+    points : np.ndarray
+        Tableau (n, 2) des coordonnées.
+
+    Returns:
+    -------
+    np.ndarray
+        Indices des points candidats à l'enveloppe convexe.
+    """
+    s = points[:, 0] + points[:, 1]
+    d = points[:, 0] - points[:, 1]
+    quad = points[[np.argmin(s), np.argmax(d), np.argmax(s), np.argmin(d)]]
+
+    inside = np.ones(len(points), dtype=bool)
+    for k in range(4):
+        o, a = quad[k], quad[(k + 1) % 4]
+        cross = (a[0] - o[0]) * (points[:, 1] - o[1]) - (a[1] - o[1]) * (points[:, 0] - o[0])
+        inside &= cross > 0
+    return np.flatnonzero(~inside)
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """
+    Calcule l'enveloppe convexe d'un nuage de points 2D (algorithme de la chaîne monotone d'Andrew).
+
+    Parameters:
+    ----------
+    points : np.ndarray
+        Tableau (n, 2) des coordonnées.
+
+    Returns:
+    -------
+    np.ndarray
+        Indices (dans `points`) des sommets de l'enveloppe, dans le sens trigonométrique,
+        sans répétition du premier sommet. Les points colinéaires sur les arêtes sont exclus.
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError("Les points doivent être un tableau de forme (n, 2).")
+    if len(points) == 0:
+        return np.array([], dtype=int)
+
+    candidates = _prefilter_extremes(points) if len(points) > 8 else np.arange(len(points))
+    # Tri lexicographique (x, puis y) et suppression des doublons
+    order = candidates[np.lexsort((points[candidates, 1], points[candidates, 0]))]
+    sorted_points = points[order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = np.any(sorted_points[1:] != sorted_points[:-1], axis=1)
+    order = order[keep]
+
+    if len(order) <= 2:
+        return order
+
+    # Tolérance relative à l'étendue du nuage : les points quasi colinéaires (bruit d'arrondi)
+    # sont écartés pour que l'enveloppe reste strictement convexe.
+    extent = np.ptp(points[order], axis=0).max()
+    tolerance = 1e-12 * extent * extent
+
+    def half_hull(indices):
+        chain = []
+        for idx in indices:
+            while len(chain) >= 2 and _cross(points[chain[-2]], points[chain[-1]], points[idx]) <= tolerance:
+                chain.pop()
+            chain.append(idx)
+        return chain
+
+    lower = half_hull(order)
+    upper = half_hull(order[::-1])
+    hull = lower[:-1] + upper[:-1]
+    return np.array(hull, dtype=int)
+
+
+def farthest_pair(points: np.ndarray) -> Tuple[int, int]:
+    """
+    Trouve les deux points les plus éloignés (diamètre) d'un nuage de points 2D.
+
+    Remplace le calcul de la matrice complète des distances (mémoire en O(n²)) par
+    l'enveloppe convexe suivie de la méthode des pieds à coulisse tournants (rotating calipers) :
+    le diamètre d'un nuage est toujours atteint entre deux sommets de son enveloppe.
+
+    Parameters:
+    ----------
+    points : np.ndarray
+        Tableau (n, 2) des coordonnées, par exemple la sortie d'un t-SNE en 2 dimensions.
+
+    Returns:
+    -------
+    Tuple[int, int]
+        Indices (dans `points`) des deux points les plus éloignés. Retourne (0, 0) pour un seul point.
+
+    Raises:
+    ------
+    ValueError
+        Si le nuage de points est vide ou n'est pas en 2 dimensions.
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError("Les points doivent être un tableau de forme (n, 2).")
+    if len(points) == 0:
+        raise ValueError("Impossible de calculer la paire la plus éloignée d'un ensemble vide.")
+
+    hull = convex_hull(points)
+    if len(hull) == 1:
+        return 0, 0
+    if len(hull) == 2:
+        return int(hull[0]), int(hull[1])
+
+    def squared_dist(i, j):
+        diff = points[hull[i]] - points[hull[j]]
+        return diff[0] * diff[0] + diff[1] * diff[1]
+
+    h = len(hull)
+    best, best_pair = -1.0, (0, 1)
+    j = 1
+    for i in range(h):
+        next_i = (i + 1) % h
+        edge_start, edge_end = points[hull[i]], points[hull[next_i]]
+        # Avancer l'antipode tant que l'aire du triangle (arête, antipode) augmente
+        while abs(_cross(edge_start, edge_end, points[hull[(j + 1) % h]])) > abs(
+            _cross(edge_start, edge_end, points[hull[j]])
+        ):
+            j = (j + 1) % h
+        for a, b in ((i, j), (next_i, j), (i, next_i)):
+            dist = squared_dist(a, b)
+            if dist > best:
+                best, best_pair = dist, (a, b)
+
+    return int(hull[best_pair[0]]), int(hull[best_pair[1]])
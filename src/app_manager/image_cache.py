@@ -0,0 +1,189 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+
+
+class ImageCache:
+    """
+    Cache borné des vignettes d'images distantes.
+
+    Les images sont téléchargées une seule fois, redimensionnées, puis conservées en mémoire
+    (éviction LRU) et, si `cache_dir` est fourni, sur disque sous le nom du hash SHA-256 de l'URL.
+    Les téléchargements partagent une même `requests.Session` (pool de connexions HTTP).
+    """
+
+    def __init__(self, max_items: int = 128, thumbnail_size: Tuple[int, int] = (200, 100),
+                 cache_dir: Optional[str] = None, timeout: float = 10, max_workers: int = 8,
+                 session: Optional[requests.Session] = None):
+        """
+        Parameters:
+        ----------
+        max_items : int, optional
+            Nombre maximal de vignettes gardées en mémoire. Par défaut, 128.
+        thumbnail_size : Tuple[int, int], optional
+            Taille (largeur, hauteur) des vignettes stockées. Par défaut, (200, 100).
+        cache_dir : str, optional
+            Dossier du cache disque. Si None, seul le cache mémoire est utilisé.
+        timeout : float, optional
+            Timeout des requêtes HTTP en secondes. Par défaut, 10.
+        max_workers : int, optional
+            Nombre de téléchargements simultanés pour `fetch_many`. Par défaut, 8.
+        session : requests.Session, optional
+            Session HTTP à réutiliser. Si None, une session avec un pool de `max_workers` connexions est créée.
+        """
+        if max_items < 1:
+            raise ValueError("max_items doit être supérieur ou égal à 1.")
+        self.max_items = max_items
+        self.thumbnail_size = thumbnail_size
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.max_workers = max_workers
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        self._images: "OrderedDict[str, Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def url_key(image_url: str) -> str:
+        """Retourne la clé de cache (hash SHA-256) associée à une URL."""
+        return hashlib.sha256(image_url.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, image_url: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{self.url_key(image_url)}.png")
+
+    def _remember(self, image_url: str, image: Image.Image):
+        with self._lock:
+            self._images[image_url] = image
+            self._images.move_to_end(image_url)
+            while len(self._images) > self.max_items:
+                self._images.popitem(last=False)
+
+    def _lookup(self, image_url: str) -> Optional[Image.Image]:
+        with self._lock:
+            image = self._images.get(image_url)
+            if image is not None:
+                self._images.move_to_end(image_url)
+                self.hits += 1
+                return image
+
+        disk_path = self._disk_path(image_url)
+        if disk_path and os.path.exists(disk_path):
+            try:
+                with Image.open(disk_path) as stored:
+                    image = stored.copy()
+            except OSError:
+                # Fichier corrompu ou incomplet : il sera retéléchargé
+                return None
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(image_url, image)
+            return image
+        return None
+
+    def _download(self, image_url: str) -> Image.Image:
+        response = self.session.get(image_url, timeout=self.timeout)
+        response.raise_for_status()  # Vérifie les erreurs HTTP
+        image = Image.open(io.BytesIO(response.content))
+        image = image.resize(self.thumbnail_size)
+        if image.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+            image = image.convert("RGB")  # Modes non enregistrables en PNG (CMYK, YCbCr...)
+
+        disk_path = self._disk_path(image_url)
+        if disk_path:
+            # Écriture atomique pour ne jamais exposer un fichier partiel à un autre processus
+            tmp_path = f"{disk_path}.{threading.get_ident()}.tmp"
+            image.save(tmp_path, format="PNG")
+            os.replace(tmp_path, disk_path)
+        return image
+
+    def get(self, image_url: str) -> Image.Image:
+        """
+        Retourne la vignette d'une image, en la téléchargeant uniquement si elle n'est pas en cache.
+
+        Raises:
+        ------
+        requests.RequestException
+            En cas d'erreur de téléchargement de l'image depuis l'URL.
+        """
+        image = self._lookup(image_url)
+        if image is not None:
+            return image
+        with self._lock:
+            self.misses += 1
+        image = self._download(image_url)
+        self._remember(image_url, image)
+        return image
+
+    def fetch_many(self, image_urls: Iterable[str]) -> Tuple[Dict[str, Image.Image], Dict[str, Exception]]:
+        """
+        Récupère plusieurs vignettes en parallèle (threads partageant la session HTTP).
+
+        Returns:
+        -------
+        Tuple[Dict[str, Image.Image], Dict[str, Exception]]
+            Les vignettes obtenues par URL, et les erreurs rencontrées par URL.
+        """
+        unique_urls = list(dict.fromkeys(image_urls))
+        images, errors = {}, {}
+        if not unique_urls:
+            return images, errors
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_urls))) as executor:
+            futures = {url: executor.submit(self.get, url) for url in unique_urls}
+            for url, future in futures.items():
+                try:
+                    images[url] = future.result()
+                except Exception as e:
+                    errors[url] = e
+        return images, errors
+
+    def clear(self):
+        """Vide le cache mémoire (le cache disque est conservé)."""
+        with self._lock:
+            self._images.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les compteurs du cache et le taux de succès (mémoire + disque)."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._images),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+_default_cache: Optional[ImageCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_image_cache() -> ImageCache:
+    """
+    Retourne le cache d'images partagé par le processus (créé au premier appel),
+    afin qu'il survive aux réexécutions du script Streamlit.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ImageCache()
+        return _default_cache
@@ -0,0 +1,313 @@
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import numpy as np
+
+# Quantiles exposés pour chaque histogramme
+QUANTILES = (0.5, 0.9, 0.99)
+# Fichier des métriques écrit par l'application (format texte Prometheus, lisible par un collecteur local)
+METRICS_FILE = "logs/metrics.prom"
+# Port du point d'accès HTTP /metrics (variable d'environnement, désactivé si absente)
+METRICS_PORT_ENV = "RECIPE_METRICS_PORT"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: LabelKey, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Histogram:
+    """
+    Distribution d'une mesure (ex : une latence en secondes).
+
+    Le nombre et la somme des observations sont cumulés depuis le démarrage ; les quantiles sont
+    calculés sur une fenêtre glissante des `window` dernières observations, qui reflète la latence
+    récente sans croissance de la mémoire.
+    """
+
+    def __init__(self, window: int = 2048):
+        self.count = 0
+        self.sum = 0.0
+        self._recent = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self._recent.append(value)
+
+    def quantiles(self, quantiles: Iterable[float] = QUANTILES) -> Dict[float, float]:
+        """Retourne les quantiles des observations récentes (NaN si aucune observation)."""
+        if not self._recent:
+            return {q: float("nan") for q in quantiles}
+        values = np.quantile(np.fromiter(self._recent, dtype=float), list(quantiles))
+        return dict(zip(quantiles, values.tolist()))
+
+
+class MetricsRegistry:
+    """
+    Registre thread-safe des métriques du processus : compteurs, jauges et histogrammes,
+    identifiés par un nom et des labels optionnels.
+
+    Des collecteurs (fonctions appelées à chaque export) ajoutent des jauges calculées à la demande,
+    comme les taux de succès des caches.
+    """
+
+    def __init__(self, window: int = 2048):
+        """
+        Parameters:
+        ----------
+        window : int, optional
+            Nombre d'observations récentes conservées par histogramme pour le calcul des quantiles.
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def describe(self, name: str, help_text: str):
+        """Associe une description à une métrique (ligne # HELP de l'export Prometheus)."""
+        self._help[name] = help_text
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Incrémente un compteur."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Fixe la valeur d'une jauge."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = float(value)
+
+    def observe(self, name: str, value: float, **labels):
+        """Ajoute une observation à un histogramme."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.window)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+        Mesure la durée (en secondes) du bloc dans l'histogramme `name`.
+        Une exception est comptée dans `<name>_errors_total` puis propagée.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc(f"{name}_errors_total", **labels)
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def register_collector(self, name: str, collector: Callable[[], Dict[str, float]]):
+        """
+        Enregistre une fonction retournant des valeurs à exporter comme jauges `<name>_<clé>`
+        (ex : `ResultCache.stats`). Un collecteur du même nom est remplacé.
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def reset(self):
+        """Supprime toutes les métriques et tous les collecteurs."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._collectors.clear()
+
+    def _collected(self) -> Dict[str, Dict[LabelKey, float]]:
+        with self._lock:
+            collectors = list(self._collectors.items())
+        gauges: Dict[str, Dict[LabelKey, float]] = {}
+        for prefix, collector in collectors:
+            try:
+                values = collector()
+            except Exception:
+                # Un collecteur en échec (ex : cache pas encore créé) ne doit pas bloquer l'export
+                continue
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    gauges.setdefault(f"{prefix}_{key}", {})[()] = float(value)
+        return gauges
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """
+        Retourne l'état agrégé des métriques : compteurs, jauges (dont collecteurs) et,
+        pour chaque histogramme, le nombre, la somme, la moyenne et les quantiles récents.
+        """
+        collected = self._collected()
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            histograms = {
+                name: {key: (h.count, h.sum, h.quantiles()) for key, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+        gauges.update(collected)
+
+        def series_name(name, key):
+            return name + _format_labels(key)
+
+        return {
+            "counters": {series_name(n, k): v for n, series in counters.items() for k, v in series.items()},
+            "gauges": {series_name(n, k): v for n, series in gauges.items() for k, v in series.items()},
+            "histograms": {
+                series_name(n, k): {
+                    "count": count,
+                    "sum": total,
+                    "mean": total / count if count else float("nan"),
+                    **{f"p{round(q * 100)}": value for q, value in quantiles.items()},
+                }
+                for n, series in histograms.items() for k, (count, total, quantiles) in series.items()
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Retourne les métriques au format texte d'exposition Prometheus. Les histogrammes sont
+        exportés comme des `summary` (quantiles récents, somme et nombre d'observations).
+        """
+        collected = self._collected()
+        lines = []
+        with self._lock:
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            gauges.update(collected)
+            for name, series in sorted(self._counters.items()):
+                lines += self._header(name, "counter")
+                lines += [f"{name}{_format_labels(key)} {_format_value(value)}" for key, value in series.items()]
+            for name, series in sorted(gauges.items()):
+                lines += self._header(name, "gauge")
+                lines += [f"{name}{_format_labels(key)} {_format_value(value)}" for key, value in series.items()]
+            for name, series in sorted(self._histograms.items()):
+                lines += self._header(name, "summary")
+                for key, histogram in series.items():
+                    for quantile, value in histogram.quantiles().items():
+                        lines.append(f"{name}{_format_labels(key, [('quantile', str(quantile))])} "
+                                     f"{_format_value(value)}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, name: str, metric_type: str):
+        header = [f"# HELP {name} {self._help[name]}"] if name in self._help else []
+        return header + [f"# TYPE {name} {metric_type}"]
+
+    def write(self, path: str = METRICS_FILE):
+        """
+        Écrit les métriques dans un fichier, au format Prometheus (ou JSON si le chemin se termine
+        par .json). L'écriture est atomique : un collecteur ne lit jamais un fichier partiel.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        content = json.dumps(self.snapshot(), indent=2) if path.endswith(".json") else self.to_prometheus()
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w") as f:
+            f.write(content)
+        os.replace(temporary_path, path)
+
+
+_default_registry: Optional[MetricsRegistry] = None
+_default_registry_lock = threading.Lock()
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def get_registry() -> MetricsRegistry:
+    """
+    Retourne le registre de métriques partagé par le processus (créé au premier appel),
+    afin qu'il survive aux réexécutions du script Streamlit.
+    """
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = MetricsRegistry()
+        return _default_registry
+
+
+def timed(name: str, registry: Optional[MetricsRegistry] = None, **labels):
+    """
+    Décorateur : mesure la durée de chaque appel dans l'histogramme `name` (en secondes)
+    et compte les appels en erreur dans `<name>_errors_total`.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with (registry or get_registry()).timer(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def counted(name: str, registry: Optional[MetricsRegistry] = None, **labels):
+    """Décorateur : compte les appels dans le compteur `name`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            (registry or get_registry()).inc(name, **labels)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1",
+                         registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """
+    Démarre (une seule fois par processus) un point d'accès HTTP local exposant les métriques
+    au format Prometheus sur `/metrics`, dans un thread démon.
+    """
+    global _server
+    with _default_registry_lock:
+        if _server is not None:
+            return _server
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = (registry or get_registry()).to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Pas de journalisation de chaque requête du collecteur
+
+        _server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
@@ -0,0 +1,54 @@
+import ast
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.DataPreprocess.contributor_cube import ContributorCube, ContributorCubeBuilder
+
+
+class TestContributorCube(unittest.TestCase):
+    """Tests unitaires pour la matrice contributeur x élément pré-agrégée."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        ingredients = [f"ingredient {index}" for index in range(40)]
+        self.recipes = pd.DataFrame({
+            "id": np.arange(300),
+            "contributor_id": rng.integers(1, 25, size=300),
+            # Listes sérialisées, comme dans les fichiers CSV
+            "ingredients": [repr(rng.choice(ingredients, size=rng.integers(1, 8)).tolist()) for _ in range(300)],
+        })
+
+    def test_matches_explode_counts(self):
+        """Test que les top-k et la popularité sont ceux du comptage direct des recettes."""
+        cube = ContributorCube.from_recipes(self.recipes, "ingredients")
+        exploded = self.recipes.assign(ingredients=self.recipes["ingredients"].apply(ast.literal_eval)).explode("ingredients")
+        for contributor_id, group in exploded.groupby("contributor_id"):
+            expected = group["ingredients"].value_counts()
+            top = cube.top_k(contributor_id, k=5)
+            self.assertEqual(top["count"].tolist(), expected.head(5).tolist())
+            self.assertTrue(all(expected[item] == count for item, count in zip(top["item"], top["count"])))
+            self.assertEqual(cube.recipe_count(contributor_id), self.recipes["contributor_id"].eq(contributor_id).sum())
+        popularity = cube.popularity(column="Ingredient")
+        self.assertEqual(dict(zip(popularity["Ingredient"], popularity["count"])),
+                         exploded["ingredients"].value_counts().to_dict())
+        self.assertTrue(cube.top_k(999).empty)
+        self.assertEqual(cube.recipe_count(999), 0)
+
+    def test_builder_saves_cubes(self):
+        """Test que l'étape du prétraitement sauvegarde une matrice par colonne, relue à l'identique."""
+        recipes = self.recipes.assign(tags=[["easy", "dessert"] if index % 2 else ["easy"] for index in range(300)])
+        with tempfile.TemporaryDirectory() as output_dir:
+            builder = ContributorCubeBuilder(recipes, output_dir).build_cubes(["ingredients", "tags"])
+            self.assertIs(builder.data, recipes)
+            tags = ContributorCube.load(os.path.join(output_dir, "contributor_tags.npz"))
+            ingredients = ContributorCube.load(os.path.join(output_dir, "contributor_ingredients.npz"))
+        self.assertEqual(tags.popularity().values.tolist(), [["easy", 300], ["dessert", 150]])
+        expected = ContributorCube.from_recipes(recipes, "ingredients")
+        for name in ("contributors", "items", "indptr", "indices", "counts", "recipe_counts"):
+            np.testing.assert_array_equal(getattr(ingredients, name), getattr(expected, name))
+
+
+if __name__ == "__main__":
+    unittest.main()
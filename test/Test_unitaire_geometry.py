@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from src.app_manager.geometry import convex_hull, farthest_pair
+
+
+class TestFarthestPair(unittest.TestCase):
+    """Tests unitaires pour le calcul de la paire de points la plus éloignée."""
+
+    @staticmethod
+    def brute_force_diameter(points):
+        """Diamètre calculé avec la matrice complète des distances."""
+        return np.linalg.norm(points[:, np.newaxis] - points, axis=2).max()
+
+    def test_matches_brute_force(self):
+        """Test que le diamètre trouvé est celui de la matrice complète des distances."""
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            points = rng.normal(size=(rng.integers(2, 100), 2))
+            i, j = farthest_pair(points)
+            self.assertAlmostEqual(np.linalg.norm(points[i] - points[j]), self.brute_force_diameter(points))
+
+    def test_degenerate_clouds(self):
+        """Test des cas dégénérés : points colinéaires, doublons et point unique."""
+        x = np.linspace(-3, 5, 50)
+        collinear = np.c_[x, 2 * x + 1]
+        self.assertEqual(sorted(farthest_pair(collinear)), [0, 49])
+
+        duplicates = np.array([[1.0, 1.0], [1.0, 1.0], [4.0, 5.0], [4.0, 5.0]])
+        i, j = farthest_pair(duplicates)
+        self.assertAlmostEqual(np.linalg.norm(duplicates[i] - duplicates[j]), 5.0)
+
+        self.assertEqual(farthest_pair(np.array([[2.0, 3.0]])), (0, 0))
+
+    def test_empty_input_raises(self):
+        """Test qu'une erreur est levée pour un nuage vide ou mal formé."""
+        with self.assertRaises(ValueError):
+            farthest_pair(np.empty((0, 2)))
+        with self.assertRaises(ValueError):
+            farthest_pair(np.zeros((5, 3)))
+
+    def test_convex_hull_square(self):
+        """Test que l'enveloppe d'un carré avec des points intérieurs ne garde que les coins."""
+        points = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [0.5, 0.5], [0.2, 0.7], [0.5, 0]], dtype=float)
+        self.assertEqual(sorted(convex_hull(points).tolist()), [0, 1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import io
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from PIL import Image
+from src.app_manager.image_cache import ImageCache
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    """Serveur HTTP local qui sert une image PNG par chemin et compte les requêtes."""
+    requests_count = 0
+
+    def do_GET(self):
+        type(self).requests_count += 1
+        if self.path.startswith("/missing"):
+            self.send_error(404)
+            return
+        buffer = io.BytesIO()
+        Image.new("RGB", (640, 480), color=(len(self.path) * 10 % 255, 80, 40)).save(buffer, format="PNG")
+        payload = buffer.getvalue()
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestImageCache(unittest.TestCase):
+    """Tests unitaires pour le cache des vignettes d'images."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _ImageHandler.requests_count = 0
+
+    def test_get_downloads_once_and_resizes(self):
+        """Test que l'image est téléchargée une seule fois et stockée redimensionnée."""
+        cache = ImageCache(max_items=4)
+        first = cache.get(f"{self.base_url}/a.png")
+        second = cache.get(f"{self.base_url}/a.png")
+        self.assertEqual(first.size, (200, 100))
+        self.assertIs(first, second)
+        self.assertEqual(_ImageHandler.requests_count, 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_lru_eviction(self):
+        """Test que l'entrée la moins récemment utilisée est évincée."""
+        cache = ImageCache(max_items=2)
+        cache.get(f"{self.base_url}/a.png")
+        cache.get(f"{self.base_url}/b.png")
+        cache.get(f"{self.base_url}/a.png")
+        cache.get(f"{self.base_url}/c.png")
+        cache.get(f"{self.base_url}/a.png")
+        self.assertEqual(_ImageHandler.requests_count, 3)
+        cache.get(f"{self.base_url}/b.png")
+        self.assertEqual(_ImageHandler.requests_count, 4)
+
+    def test_disk_cache_survives_new_instance(self):
+        """Test que le cache disque évite un nouveau téléchargement dans une autre instance."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            ImageCache(cache_dir=cache_dir).get(f"{self.base_url}/disk.png")
+            other = ImageCache(cache_dir=cache_dir)
+            image = other.get(f"{self.base_url}/disk.png")
+            self.assertEqual(image.size, (200, 100))
+            self.assertEqual(_ImageHandler.requests_count, 1)
+            self.assertEqual(other.stats()["disk_hits"], 1)
+
+    def test_fetch_many_reports_errors(self):
+        """Test que le téléchargement groupé retourne les images et les erreurs par URL."""
+        cache = ImageCache(max_workers=4)
+        urls = [f"{self.base_url}/{name}.png" for name in "abcdef"] + [f"{self.base_url}/missing.png"]
+        images, errors = cache.fetch_many(urls + urls[:2])
+        self.assertEqual(set(images), set(urls[:-1]))
+        self.assertEqual(list(errors), [urls[-1]])
+        self.assertEqual(_ImageHandler.requests_count, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+from src.monitoring.metrics import MetricsRegistry, start_metrics_server, timed, counted
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Tests unitaires pour le registre de métriques et son export."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry(window=100)
+
+    def test_decorators_and_quantiles(self):
+        """Test que les décorateurs mesurent les appels et que les quantiles portent sur la fenêtre récente."""
+        @timed("work_seconds", registry=self.registry, step="test")
+        @counted("work_calls_total", registry=self.registry)
+        def work(fail=False):
+            if fail:
+                raise ValueError("échec")
+            return 42
+
+        self.assertEqual(work(), 42)
+        with self.assertRaises(ValueError):
+            work(fail=True)
+        for value in range(1, 201):
+            self.registry.observe("latency_seconds", value)
+
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot["counters"]["work_calls_total"], 2)
+        self.assertEqual(snapshot["counters"]['work_seconds_errors_total{step="test"}'], 1)
+        self.assertEqual(snapshot["histograms"]['work_seconds{step="test"}']["count"], 2)
+        latency = snapshot["histograms"]["latency_seconds"]
+        self.assertEqual(latency["count"], 200)
+        self.assertAlmostEqual(latency["p50"], 150.5)  # Fenêtre des 100 dernières observations
+
+    def test_prometheus_text_and_file(self):
+        """Test le format d'exposition Prometheus, les collecteurs et l'écriture du fichier."""
+        self.registry.describe("queries_total", "Nombre de requêtes.")
+        self.registry.inc("queries_total", mode="text")
+        self.registry.observe("query_seconds", 0.25)
+        self.registry.register_collector("cache", lambda: {"hits": 3, "hit_rate": 0.75})
+        self.registry.register_collector("broken", lambda: 1 / 0)
+
+        text = self.registry.to_prometheus()
+        self.assertIn("# HELP queries_total Nombre de requêtes.", text)
+        self.assertIn('queries_total{mode="text"} 1', text)
+        self.assertIn("# TYPE query_seconds summary", text)
+        self.assertIn('query_seconds{quantile="0.99"} 0.25', text)
+        self.assertIn("query_seconds_count 1", text)
+        self.assertIn("cache_hit_rate 0.75", text)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.registry.write(os.path.join(tmp, "metrics", "app.prom"))
+            with open(os.path.join(tmp, "metrics", "app.prom")) as f:
+                self.assertEqual(f.read(), text)
+            self.registry.write(os.path.join(tmp, "metrics.json"))
+            with open(os.path.join(tmp, "metrics.json")) as f:
+                self.assertEqual(json.load(f)["gauges"]["cache_hits"], 3)
+
+    def test_metrics_endpoint(self):
+        """Test le point d'accès HTTP /metrics."""
+        self.registry.inc("endpoint_checks_total")
+        server = start_metrics_server(0, registry=self.registry)
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            self.assertIn("endpoint_checks_total 1", response.read().decode())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from scipy import sparse
+from src.FindingCloseRecipes.minhash import MinHashLSH, MinHashIndex, EMPTY_SIGNATURE
+
+
+class TestMinHash(unittest.TestCase):
+    """Tests unitaires pour les signatures MinHash et l'index LSH."""
+
+    def setUp(self):
+        self.lsh = MinHashLSH(n_permutations=128, n_bands=32, seed=0)
+
+    def test_signature_estimates_jaccard(self):
+        """Test que la proportion de composantes égales estime la similarité de Jaccard."""
+        first = [f"ingredient {i}" for i in range(100)]
+        second = [f"ingredient {i}" for i in range(50, 150)]  # Jaccard = 1/3
+        signatures = self.lsh.signatures_from_sets([first, second, first[::-1], []])
+        self.assertEqual(signatures.dtype, np.uint32)
+        self.assertEqual(signatures.shape, (4, 128))
+        self.assertAlmostEqual(np.mean(signatures[0] == signatures[1]), 1 / 3, delta=0.12)
+        np.testing.assert_array_equal(signatures[0], signatures[2])
+        self.assertTrue(np.all(signatures[3] == EMPTY_SIGNATURE))
+
+    def test_matrix_signatures_match_column_sets(self):
+        """Test que la signature d'une ligne de matrice est celle de l'ensemble de ses colonnes."""
+        matrix = sparse.csr_matrix(np.array([[1, 0, 2, 0], [0, 0, 0, 0], [0, 3, 1, 1]]))
+        signatures = self.lsh.signatures_from_matrix(matrix)
+        values = self.lsh.hash_values(np.arange(4))
+        np.testing.assert_array_equal(signatures[0], values[[0, 2]].min(axis=0))
+        np.testing.assert_array_equal(signatures[2], values[[1, 2, 3]].min(axis=0))
+        self.assertTrue(np.all(signatures[1] == EMPTY_SIGNATURE))
+
+    def test_lsh_candidates_and_query(self):
+        """Test que les ensembles proches sont candidats et que la requête trie par similarité."""
+        rng = np.random.default_rng(0)
+        sets = [[str(token) for token in rng.choice(1000, 10, replace=False)] for _ in range(500)]
+        sets.append(sets[7][:9] + ["new"])  # Très proche de l'ensemble 7
+        index = MinHashIndex(self.lsh, self.lsh.signatures_from_sets(sets))
+        self.assertIn(500, index.candidates(index.signatures[7]))
+        rows, similarities = index.query(index.signatures[7], top_n=3, exclude=7)
+        self.assertEqual(rows[0], 500)
+        self.assertTrue(np.all(np.diff(similarities) <= 0))
+        alive = np.ones(len(index), dtype=bool)
+        alive[500] = False
+        self.assertNotIn(500, index.query(index.signatures[7], top_n=3, exclude=7, alive=alive)[0])
+
+    def test_invalid_bands_raise(self):
+        """Test qu'un nombre de bandes ne divisant pas la largeur des signatures est refusé."""
+        with self.assertRaises(ValueError):
+            MinHashLSH(n_permutations=100, n_bands=32)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+import nltk
+from src.DataPreprocess import nltk_resources
+
+
+class TestNltkResources(unittest.TestCase):
+    """Tests unitaires pour la résolution locale des ressources NLTK."""
+
+    def test_local_directory_without_network(self):
+        """Test qu'une ressource du dossier local est trouvée et qu'une ressource absente échoue sans téléchargement."""
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.dict(os.environ, {nltk_resources.NLTK_DATA_ENV: directory}), \
+                patch.dict(nltk_resources.RESOURCES, {"recipes_test": "corpora/recipes_test",
+                                                      "absent_test": "corpora/absent_test"}), \
+                patch.object(nltk, "download") as download, \
+                patch.object(nltk.data, "path", list(nltk.data.path)):
+            os.makedirs(os.path.join(directory, "corpora", "recipes_test"))
+            nltk_resources.require("recipes_test")
+            self.assertEqual(nltk.data.path[0], os.path.abspath(directory))
+            with self.assertRaisesRegex(LookupError, "absent_test.*python -m src.DataPreprocess.nltk_resources"):
+                nltk_resources.require("recipes_test", "absent_test")
+            download.assert_not_called()
+
+    def test_import_does_not_download(self):
+        """Test que l'import du VectorizerPreparator ne déclenche aucun téléchargement."""
+        sys.modules.pop("src.DataPreprocess.vectorizer_preparator", None)
+        with patch.object(nltk, "download") as download:
+            importlib.import_module("src.DataPreprocess.vectorizer_preparator")
+        download.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from src.DataPreprocess.normalizer import Normalizer, COLUMNS_TO_NORMALIZE
+
+
+class TestNormalizer(unittest.TestCase):
+    """Tests unitaires pour la normalisation incrémentale des variables numériques."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = pd.DataFrame(rng.lognormal(3, 1, size=(1000, len(COLUMNS_TO_NORMALIZE))),
+                                 columns=COLUMNS_TO_NORMALIZE)
+        self.data['id'] = np.arange(1000)
+        self.data['calories'] = 250.0  # Colonne constante : écart-type nul
+
+    def test_chunks_match_standard_scaler(self):
+        """Test que la normalisation par lots donne le résultat de StandardScaler sur toute la table."""
+        expected = StandardScaler().fit_transform(self.data[COLUMNS_TO_NORMALIZE])
+        normalized = Normalizer().normalize(self.data.copy(), chunk_size=128)
+        self.assertTrue((normalized[COLUMNS_TO_NORMALIZE].dtypes == np.float32).all())
+        np.testing.assert_allclose(normalized[COLUMNS_TO_NORMALIZE].to_numpy(), expected, rtol=1e-5, atol=1e-5)
+        self.assertEqual(normalized['id'].tolist(), list(range(1000)))
+
+    def test_saved_parameters_normalize_new_rows(self):
+        """Test que les paramètres sauvegardés normalisent de nouvelles lignes comme celles du dataset."""
+        normalizer = Normalizer().fit([self.data.iloc[:600], self.data.iloc[600:]])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "normalizer.npz")
+            normalizer.save(path)
+            loaded = Normalizer.load(path)
+        self.assertEqual(loaded.columns, COLUMNS_TO_NORMALIZE)
+        new_rows = self.data.iloc[:5].copy()
+        pd.testing.assert_frame_equal(loaded.transform(new_rows.copy()), normalizer.transform(new_rows.copy()))
+        with self.assertRaises(ValueError):
+            Normalizer().transform(new_rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.DataPreprocess.data_cleaning import DataCleaning
+from src.DataPreprocess.pipeline import INLINE, PROCESS, Pipeline, Stage, builder_step
+from src.DataPreprocess.stage_profiler import StageProfiler
+
+
+def upper_name(frame):
+    return frame.assign(name=frame["name"].str.upper())
+
+
+def name_length(frame):
+    return pd.DataFrame({"name_length": frame["name"].str.len()}, index=frame.index)
+
+
+def double_minutes(frame):
+    return frame.assign(minutes=frame["minutes"] * 2)
+
+
+def center_minutes(frame):
+    return frame.assign(minutes=frame["minutes"] - frame["minutes"].mean())
+
+
+def allocate_minutes(frame):
+    """Étape allouant un tableau temporaire d'environ 8 Mo."""
+    buffer = np.ones(1_000_000)
+    return frame.assign(minutes=frame["minutes"] + buffer[:len(frame)].astype(int) - 1)
+
+
+def make_pipeline():
+    """Pipeline de test : filtres de lignes, colonnes indépendantes et étape non ligne à ligne."""
+    return Pipeline([
+        Stage("double", double_minutes, inputs=["minutes"], outputs=["minutes"], executor=INLINE),
+        Stage("length", name_length, inputs=["name"], outputs=["name_length"], executor=PROCESS),
+        Stage("upper", upper_name, inputs=["name"], outputs=["name"], executor=PROCESS),
+        Stage("long", builder_step(DataCleaning, "remove_long_recipes", max_minutes=100),
+              inputs=["minutes"], filters_rows=True),
+        Stage("center", center_minutes, inputs=["minutes"], outputs=["minutes"], row_wise=False),
+        Stage("drop", lambda frame: frame, inputs=[], drops=["name_length"]),
+    ])
+
+
+class TestPipeline(unittest.TestCase):
+    """Tests unitaires pour le pipeline de prétraitement en DAG."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = pd.DataFrame({
+            "name": [f"recipe {i}" for i in range(200)],
+            "minutes": rng.integers(1, 100, size=200),
+        })
+
+    def test_dependencies(self):
+        """Test les dépendances déduites des colonnes lues et écrites."""
+        pipeline = make_pipeline()
+        self.assertEqual(pipeline.dependencies["length"], set())
+        self.assertEqual(pipeline.dependencies["upper"], {"length"})   # écrit une colonne lue par 'length'
+        self.assertEqual(pipeline.dependencies["long"], {"double"})
+        self.assertEqual(pipeline.dependencies["center"], {"double", "long"})
+        self.assertEqual(pipeline.dependencies["drop"], {"length"})
+        self.assertEqual(pipeline.levels()[0], ["double", "length"])
+        with self.assertRaises(ValueError):
+            Pipeline([Stage("a", upper_name, inputs=["name"], after=["unknown"])])
+
+    def test_parallel_run_matches_sequential(self):
+        """Test que l'exécution parallèle donne le même résultat que l'exécution séquentielle."""
+        sequential = make_pipeline().run(self.data, n_workers=1)
+        profiler = StageProfiler()
+        parallel = make_pipeline().run(self.data, n_workers=3, profiler=profiler)
+        pd.testing.assert_frame_equal(sequential, parallel)
+        self.assertEqual(list(parallel.columns), ["name", "minutes"])
+        self.assertTrue((parallel["name"].str.isupper()).all())
+        self.assertAlmostEqual(parallel["minutes"].mean(), 0.0)
+        self.assertEqual(len(parallel), int((self.data["minutes"] * 2 <= 100).sum()))
+        self.assertEqual(sorted(record.name for record in profiler.records),
+                         sorted(stage.name for stage in make_pipeline().stages))
+
+    def test_traced_memory_per_stage(self):
+        """Test que le pic d'allocations est mesuré par étape (et non le pic du processus) avec trace_memory."""
+        pipeline = Pipeline([
+            Stage("allocate", allocate_minutes, inputs=["minutes"], outputs=["minutes"], executor=INLINE),
+            Stage("upper", upper_name, inputs=["name"], outputs=["name"], executor=PROCESS),
+        ])
+        for n_workers in (1, 2):
+            profiler = StageProfiler(trace_memory=True)
+            pipeline.run(self.data, n_workers=n_workers, profiler=profiler)
+            peaks = {record.name: record.peak_traced_mb for record in profiler.records}
+            self.assertGreater(peaks["allocate"], 7)
+            self.assertLess(peaks["upper"], 7)
+
+    def test_subset(self):
+        """Test l'exécution d'un sous-ensemble d'étapes, avec ou sans leurs dépendances."""
+        pipeline = make_pipeline()
+        self.assertEqual([stage.name for stage in pipeline.subset(["center"]).stages], ["double", "long", "center"])
+        result = pipeline.subset(["upper"], include_dependencies=False).run(self.data, n_workers=2)
+        self.assertEqual(result["minutes"].tolist(), self.data["minutes"].tolist())
+        self.assertEqual(result["name"].iloc[0], "RECIPE 0")
+        with self.assertRaises(ValueError):
+            pipeline.subset(["unknown"])
+
+
+if __name__ == '__main__':
+    unittest.main()
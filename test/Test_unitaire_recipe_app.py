@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from recipe_app import RecipeApp, IngredientDataError
+from recipe_app import RecipeApp, IngredientDataError, PantryIndex, IngredientBitmapIndex, RecipeSortOrders
 
 
 class TestRecipeApp(unittest.TestCase):
@@ -70,6 +70,94 @@ class TestRecipeApp(unittest.TestCase):
         result = self.app.filter_recipes(['chocolate'])
         self.assertTrue(result.empty)
 
+    def test_ingredient_bitmap_modes(self):
+        """Test des combinaisons de bitmaps (tous, au moins un, aucun, au moins k) et des comptes."""
+        index = IngredientBitmapIndex(pd.DataFrame({
+            'id': [10, 11, 12, 13, 14],
+            'ingredients': ['["sugar", "unsalted butter"]', '["butter", "milk"]', '["sugar", "milk", "eggs"]',
+                            '["beef"]', 'not a list'],
+        }), vocabulary=['sugar', 'butter'])
+        terms = ['sugar', 'butter', 'milk']
+        self.assertEqual(index.ids[index.rows(index.match(terms[:2], 'all'))].tolist(), [10])
+        self.assertEqual(index.ids[index.rows(index.match(terms, 'any'))].tolist(), [10, 11, 12])
+        self.assertEqual(index.ids[index.rows(index.match(terms, 'none'))].tolist(), [13, 14])
+        self.assertEqual(index.ids[index.rows(index.match(terms, 'at_least', 2))].tolist(), [10, 11, 12])
+        self.assertEqual(index.count(index.match(terms, 'at_least', 4)), 0)
+        self.assertEqual(index.facet_counts(terms), {'sugar': 2, 'butter': 2, 'milk': 2})
+        self.assertEqual(index.facet_counts(terms, within=index.match(['milk'])), {'sugar': 1, 'butter': 1, 'milk': 2})
+        with self.assertRaises(ValueError):
+            index.match(terms, 'at_least')
+
+    def test_filter_recipes_modes(self):
+        """Test du filtrage des recettes selon le mode de combinaison des ingrédients."""
+        self.app.ingredient_index = IngredientBitmapIndex(pd.DataFrame({
+            'id': [1, 2],
+            'ingredients': ['["sugar", "flour"]', '["butter", "milk"]']
+        }))
+        self.app.recipes_clean = pd.DataFrame({'id': [1, 2], 'name': ['Recipe 1', 'Recipe 2']})
+        self.assertEqual(self.app.filter_recipes(['sugar', 'milk'], mode='any')['id'].tolist(), [1, 2])
+        self.assertEqual(self.app.filter_recipes(['sugar'], mode='none')['id'].tolist(), [2])
+        self.assertTrue(self.app.filter_recipes(['sugar', 'milk'], mode='at_least', min_matches=2).empty)
+
+    def test_search_recipes_pages_and_sort(self):
+        """Test du curseur de résultats : nombre total, pages matérialisées à la demande et tri."""
+        self.app.ingredient_index = IngredientBitmapIndex(pd.DataFrame({
+            'id': range(1, 26),
+            'ingredients': ['["sugar", "flour"]'] * 24 + ['["beef"]'],
+        }))
+        self.app.recipes_clean = pd.DataFrame({
+            'id': range(1, 26),
+            'average_rating': [float(i % 5) for i in range(25)],
+            'minutes': [None] + list(range(24, 0, -1)),
+        })
+        self.app.sort_orders = RecipeSortOrders(self.app.recipes_clean)
+        cursor = self.app.search_recipes(['sugar'], page_size=10)
+        self.assertEqual((cursor.total, cursor.n_pages), (24, 3))
+        self.assertEqual(cursor.page(0)['id'].tolist(), list(range(1, 11)))
+        self.assertEqual(cursor.page(2)['id'].tolist(), [21, 22, 23, 24])
+        self.assertTrue(cursor.page(3).empty)
+
+        by_minutes = self.app.search_recipes(['sugar'], sort_by='minutes', page_size=10)
+        self.assertEqual(by_minutes.page(0)['minutes'].tolist(), [float(m) for m in range(2, 12)])
+        self.assertEqual(by_minutes.page(2)['id'].tolist(), [4, 3, 2, 1])  # Temps manquant en dernier
+        by_rating = self.app.search_recipes(['sugar'], sort_by='average_rating', ascending=False, page_size=5)
+        self.assertEqual(by_rating.page(0)['id'].tolist(), [5, 10, 15, 20, 4])
+        self.assertEqual(self.app.search_recipes([]).total, 0)
+        with self.assertRaises(ValueError):
+            self.app.search_recipes(['sugar'], sort_by='name')
+
+    def test_search_recipes_relevance(self):
+        """Test du classement par pertinence : couverture de la sélection, peu d'ingrédients en plus, puis note."""
+        self.app.ingredient_index = IngredientBitmapIndex(pd.DataFrame({
+            'id': range(1, 7),
+            'ingredients': ['["sugar", "flour"]', '["sugar", "flour", "eggs", "milk"]', '["sugar"]',
+                            '["flour", "sugar"]', '["beef"]', '["salt", "flour"]'],
+        }), vocabulary=['sugar', 'flour', 'eggs'])
+        self.app.recipes_clean = pd.DataFrame({'id': range(1, 7), 'average_rating': [3, 5, 5, 4, 5, None]})
+        self.app.sort_orders = RecipeSortOrders(self.app.recipes_clean)
+        cursor = self.app.search_recipes(['sugar', 'flour'], mode='any', sort_by='relevance', page_size=2)
+        self.assertEqual(cursor.total, 5)
+        self.assertEqual(cursor.page(0)['id'].tolist(), [4, 1])
+        self.assertEqual(cursor.page(1)['id'].tolist(), [2, 3])
+        self.assertEqual(cursor.page(2)['id'].tolist(), [6])
+        scores = cursor.page(0)['relevance'].tolist()
+        self.assertGreater(scores[0], scores[1])
+        self.assertAlmostEqual(scores[0], 0.6 + 0.25 + 0.15 * 4 / 5)
+
+    @patch('streamlit.slider')
+    @patch('streamlit.radio', return_value='at_least')
+    def test_display_filter_mode_menu_at_least(self, mock_radio, mock_slider):
+        """Test du mode « au moins k » : pas de curseur avec 0 ou 1 ingrédient, valeur mémorisée bornée."""
+        self.assertEqual(self.app.display_filter_mode_menu(0), ('at_least', 1))
+        self.assertEqual(self.app.display_filter_mode_menu(1), ('at_least', 1))
+        mock_slider.assert_not_called()
+
+        mock_slider.return_value = 2
+        with patch('streamlit.session_state', {'ingredient_min_matches': 5}) as session_state:
+            self.assertEqual(self.app.display_filter_mode_menu(3), ('at_least', 2))
+            self.assertEqual(session_state['ingredient_min_matches'], 3)
+        self.assertEqual(mock_slider.call_args.kwargs['max_value'], 3)
+
     @patch('streamlit.multiselect')
     def test_display_macro_ingredients_menu(self, mock_multiselect):
         """Test que la méthode retourne les ingrédients sélectionnés par l'utilisateur."""
@@ -77,6 +165,21 @@ class TestRecipeApp(unittest.TestCase):
         result = self.app.display_macro_ingredients_menu()
         self.assertEqual(result, ['sugar', 'flour'])
 
+    def test_similar_pantry_recipes(self):
+        """Test que les recettes au garde-manger le plus proche sont retournées en premier."""
+        ingredients_data = pd.DataFrame({
+            'id': [1, 2, 3],
+            'ingredients': ['["sugar", "flour", "unsalted butter", "eggs"]',
+                            '["sugar", "flour", "butter", "eggs", "milk"]',
+                            '["beef", "onion", "garlic"]'],
+        })
+        self.app.recipes_clean = pd.DataFrame({'id': [1, 2, 3], 'name': ['Cake', 'Crepes', 'Stew']})
+        self.app.pantry_index = PantryIndex(ingredients_data)
+        result = self.app.similar_pantry_recipes(["sugar", "flour", "butter", "eggs"], top_n=2, exclude_id=1)
+        self.assertEqual(result['id'].tolist(), [2, 3])
+        self.assertGreater(result['pantry_similarity'].iloc[0], result['pantry_similarity'].iloc[1])
+        self.assertTrue(self.app.similar_pantry_recipes([]).empty)
+
 
 if __name__ == '__main__':
     unittest.main()
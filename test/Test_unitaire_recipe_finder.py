@@ -0,0 +1,380 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from src.DataPreprocess.normalizer import Normalizer
+from src.FindingCloseRecipes.config import NUMERIC_FEATURES
+from src.FindingCloseRecipes.distances import DistanceCalculator
+from src.FindingCloseRecipes.filters import RecipeFilter
+from src.FindingCloseRecipes.id_lookup import IdLookup
+from src.FindingCloseRecipes.recipe_finder import RecipeFinder
+from src.FindingCloseRecipes.recipe_index import RecipeIndex
+from src.FindingCloseRecipes.result_cache import ResultCache
+from src.FindingCloseRecipes import run_recipe_finder
+
+
+def make_recipes(n_recipes=300, seed=0):
+    """Génère un petit jeu de recettes prétraitées synthétique."""
+    rng = np.random.default_rng(seed)
+    words = ["chicken", "garlic", "lemon", "butter", "sugar", "flour", "onion", "rice", "beef", "cream"]
+    tags = ["quick", "dessert", "main-dish", "easy", "vegetarian", "60-minutes-or-less"]
+    recipes = pd.DataFrame({
+        'id': rng.choice(np.arange(1, 50 * n_recipes), size=n_recipes, replace=False),
+        'name': [" ".join(rng.choice(words, 3)) for _ in range(n_recipes)],
+        'tags': [" ".join(rng.choice(tags, 3)) for _ in range(n_recipes)],
+        'steps': [" ".join(rng.choice(words + ["bake", "stir", "mix", "20", "minut"], 12)) for _ in range(n_recipes)],
+        'ingredients': [" ".join(rng.choice(words, 5)) for _ in range(n_recipes)],
+    })
+    for feature in NUMERIC_FEATURES:
+        recipes[feature] = rng.normal(size=n_recipes)
+    return recipes
+
+
+class TestRecipeFinder(unittest.TestCase):
+    """Tests unitaires pour la recherche de recettes proches."""
+
+    def setUp(self):
+        self.recipes = make_recipes()
+        self.finder = RecipeFinder(self.recipes)
+        self.finder.preprocess()
+
+    def test_find_similar_recipes(self):
+        """Test que les recettes proches sont triées et excluent la recette de référence."""
+        recipe_id = self.recipes['id'].iloc[5]
+        result = self.finder.find_similar_recipes(recipe_id)
+        self.assertEqual(len(result), 100)
+        self.assertNotIn(recipe_id, result['id'].values)
+        self.assertTrue(result['combined_distance'].is_monotonic_increasing)
+
+    def test_unknown_recipe_raises(self):
+        """Test qu'une erreur est levée pour un identifiant inconnu."""
+        with self.assertRaises(ValueError):
+            self.finder.find_similar_recipes(-1)
+
+    def test_result_cache_hit(self):
+        """Test qu'une recherche répétée est servie par le cache avec le même résultat."""
+        recipe_id = self.recipes['id'].iloc[7]
+        first = self.finder.find_similar_recipes(recipe_id)
+        second = self.finder.find_similar_recipes(recipe_id)
+        pd.testing.assert_frame_equal(first, second)
+        stats = self.finder.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+        self.finder.preprocess()  # Nouvelle version de l'index : l'entrée n'est plus valide
+        self.finder.find_similar_recipes(recipe_id)
+        self.assertEqual(self.finder.cache_stats()['misses'], 2)
+
+    def test_weight_overrides_reuse_text_distances(self):
+        """Test que changer les poids ne recalcule pas les distances textuelles."""
+        recipe_id = self.recipes['id'].iloc[3]
+        default = self.finder.find_similar_recipes(recipe_id)
+        with patch.object(RecipeIndex, 'field_distances', side_effect=AssertionError("distances recalculées")):
+            tuned = self.finder.find_similar_recipes(recipe_id, combined_weights={"alpha": 1.0, "epsilon": 0.0},
+                                                     top_n=10)
+        self.assertEqual(len(tuned), 10)
+        self.assertFalse(default['id'].head(10).equals(tuned['id']))
+
+    def test_invalid_weight_raises(self):
+        """Test qu'un poids inconnu ou négatif est refusé."""
+        recipe_id = self.recipes['id'].iloc[0]
+        with self.assertRaises(ValueError):
+            self.finder.find_similar_recipes(recipe_id, combined_weights={"zeta": 1.0})
+        with self.assertRaises(ValueError):
+            self.finder.find_similar_recipes(recipe_id, numeric_weights={"calories": -1.0})
+
+    def test_numeric_distances_match_reference(self):
+        """Test que les distances float32 (GEMM) correspondent au calcul de référence en float64."""
+        indices = np.array([0, 4, 9])
+        for weights in (None, {'calories': 1.0, 'log_minutes': 0.0}):
+            _, numeric_weights, _ = self.finder._resolve_weights(numeric_weights=weights)
+            weights_array = np.array([numeric_weights[feature] for feature in NUMERIC_FEATURES])
+            batch = self.finder._numeric_distances(self.finder.index, indices, numeric_weights)
+            for row, index in enumerate(indices):
+                reference = DistanceCalculator.euclidean_distance(
+                    self.recipes[NUMERIC_FEATURES], index, weights_array
+                )
+                np.testing.assert_allclose(batch[row], reference, atol=1e-3)
+                np.testing.assert_allclose(self.finder._numeric_distances(self.finder.index, index, numeric_weights),
+                                           batch[row], atol=1e-3)
+
+    def test_batch_matches_single_queries(self):
+        """Test que la recherche groupée retourne les mêmes recettes que les recherches unitaires."""
+        recipe_ids = self.recipes['id'].iloc[[1, 2, 3]].tolist()
+        batch = self.finder.find_similar_recipes_batch(recipe_ids, top_n=20)
+        self.finder.result_cache.clear()
+        for recipe_id in recipe_ids:
+            single = self.finder.find_similar_recipes(recipe_id, top_n=20)
+            np.testing.assert_allclose(batch[recipe_id]['combined_distance'], single['combined_distance'], rtol=1e-5)
+
+    def test_vectorizer_pruning_and_report(self):
+        """Test que l'élagage du vocabulaire réduit la matrice et que le rapport est en float32."""
+        pruned = RecipeFinder(self.recipes, vectorizer_params={'steps': {'max_features': 5}})
+        pruned.preprocess()
+        report = pruned.vectorizer_report()
+        self.assertEqual(report.loc['steps', 'vocabulary'], 5)
+        self.assertEqual(report.loc['name', 'dtype'], 'float32')
+        self.assertLess(report.loc['steps', 'bytes'], self.finder.vectorizer_report().loc['steps', 'bytes'])
+        with self.assertRaisesRegex(ValueError, 'description'):
+            RecipeFinder(self.recipes, vectorizer_params={'description': {'min_df': 2}})
+
+    def test_hashing_mode_matches_vocabulary_mode(self):
+        """Test que le mode par hachage donne les mêmes distances que le vocabulaire appris."""
+        hashing = RecipeFinder(self.recipes, vectorizer_mode="hashing", vectorizer_params={'steps': {'min_df': 1}})
+        hashing.preprocess()
+        vocabulary = RecipeFinder(self.recipes, vectorizer_params={'steps': {'min_df': 1}})
+        vocabulary.preprocess()
+        recipe_id = self.recipes['id'].iloc[11]
+        np.testing.assert_allclose(hashing.find_similar_recipes(recipe_id)['combined_distance'],
+                                   vocabulary.find_similar_recipes(recipe_id)['combined_distance'], atol=1e-5)
+
+    def test_add_recipes_without_refit(self):
+        """Test que des recettes ajoutées sont indexées comme lors d'une reconstruction complète."""
+        incremental = RecipeFinder(self.recipes.iloc[:250], vectorizer_mode="hashing")
+        incremental.preprocess()
+        incremental.add_recipes(self.recipes.iloc[250:])
+        rebuilt = RecipeFinder(self.recipes.reset_index(drop=True), vectorizer_mode="hashing")
+        rebuilt.preprocess()
+
+        for derived in ('numeric_squared', 'scaled_numeric', 'scaled_numeric_norms'):
+            np.testing.assert_allclose(getattr(incremental.index, derived), getattr(rebuilt.index, derived), rtol=1e-6)
+        new_id = self.recipes['id'].iloc[260]
+        pd.testing.assert_frame_equal(incremental.find_similar_recipes(new_id).reset_index(drop=True),
+                                      rebuilt.find_similar_recipes(new_id).reset_index(drop=True))
+        with self.assertRaises(ValueError):
+            incremental.add_recipes(self.recipes.iloc[:1])
+        with self.assertRaises(ValueError):
+            self.finder.add_recipes(self.recipes.iloc[:1])
+
+    def test_ingest_preprocessed_recipes_keeps_numeric_values(self):
+        """Test qu'une recette au format pp_recipes (déjà normalisée) est ingérée sans seconde normalisation."""
+        raw = self.recipes.copy()
+        raw[NUMERIC_FEATURES] = raw[NUMERIC_FEATURES] * 10 + 50
+        normalizer = Normalizer(NUMERIC_FEATURES).fit([raw])
+        pp_recipes = normalizer.transform(raw.copy())
+        finder = RecipeFinder(pp_recipes.iloc[:250], vectorizer_mode="hashing", normalizer=normalizer)
+        finder.preprocess()
+        with patch("src.FindingCloseRecipes.run_recipe_finder._finder", finder):
+            run_recipe_finder.ingest_recipes(pp_recipes.iloc[[250]])
+        np.testing.assert_array_equal(finder.index.numeric_matrix[-1],
+                                      pp_recipes.iloc[250][NUMERIC_FEATURES].to_numpy(dtype=np.float32))
+
+    def test_add_raw_recipes_normalized_with_dataset_parameters(self):
+        """Test que des recettes ajoutées brutes sont normalisées avec les paramètres du dataset."""
+        normalizer = Normalizer(NUMERIC_FEATURES)
+        raw = self.recipes.copy()
+        raw[NUMERIC_FEATURES] = raw[NUMERIC_FEATURES] * 10 + 50
+        normalizer.partial_fit(raw.iloc[:250])
+        finder = RecipeFinder(normalizer.transform(raw.iloc[:250].copy()), vectorizer_mode="hashing",
+                              normalizer=normalizer)
+        finder.preprocess()
+        finder.add_recipes(raw.iloc[250:], normalized=False)
+        np.testing.assert_allclose(finder.index.numeric_matrix[250:],
+                                   normalizer.transform(raw.iloc[250:].copy())[NUMERIC_FEATURES].to_numpy(), rtol=1e-6)
+        with self.assertRaises(ValueError):
+            RecipeFinder(self.recipes.iloc[:10], vectorizer_mode="hashing").add_recipes(raw.iloc[250:], normalized=False)
+
+    def test_delete_and_compact(self):
+        """Test que les recettes supprimées ne sont plus retournées, avant et après compactage."""
+        finder = RecipeFinder(self.recipes, vectorizer_mode="hashing", compaction_threshold=0.5)
+        finder.preprocess()
+        recipe_id = self.recipes['id'].iloc[0]
+        snapshot = finder.index
+        neighbours = finder.find_similar_recipes(recipe_id, top_n=10)['id'].tolist()
+
+        finder.delete_recipes(neighbours[:3])
+        self.assertEqual(snapshot.n_deleted, 0)  # L'instantané des requêtes en cours est inchangé
+        self.assertIs(finder.index.scaled_numeric, snapshot.scaled_numeric)  # Tableaux dérivés partagés
+        after_delete = finder.find_similar_recipes(recipe_id, top_n=7)['id'].tolist()
+        self.assertEqual(after_delete, neighbours[3:])
+        with self.assertRaises(ValueError):
+            finder.find_similar_recipes(neighbours[0])
+
+        finder.compact()
+        self.assertEqual(len(finder.index), len(self.recipes) - 3)
+        self.assertEqual(finder.find_similar_recipes(recipe_id, top_n=7)['id'].tolist(), after_delete)
+
+    def test_automatic_compaction(self):
+        """Test que l'index est compacté quand trop de recettes sont supprimées."""
+        self.finder.compaction_threshold = 0.1
+        self.finder.delete_recipes(self.recipes['id'].iloc[:40])
+        self.assertEqual(self.finder.index.n_deleted, 0)
+        self.assertEqual(len(self.finder.index), len(self.recipes) - 40)
+
+    def test_sharded_scoring_matches_sequential(self):
+        """Test que la recherche répartie par blocs donne les mêmes résultats que la recherche séquentielle."""
+        for mode in ("vocabulary", "hashing"):
+            sequential = RecipeFinder(self.recipes, vectorizer_mode=mode)
+            sharded = RecipeFinder(self.recipes, vectorizer_mode=mode, n_workers=3)
+            sharded.scorer.min_shard_rows = 64
+            for finder in (sequential, sharded):
+                finder.preprocess()
+                finder.delete_recipes(self.recipes['id'].iloc[10:15])
+            self.assertEqual(len(sharded.scorer.shards(len(sharded.index))), 3)
+            recipe_ids = self.recipes['id'].iloc[[0, 50, 299]].tolist()
+            for recipe_id in recipe_ids:
+                expected = sequential.find_similar_recipes(recipe_id, top_n=20)
+                result = sharded.find_similar_recipes(recipe_id, top_n=20)
+                np.testing.assert_allclose(result['combined_distance'], expected['combined_distance'], atol=1e-5)
+                # Les distances par champ sont mises en cache : un changement de poids réutilise le chemin séquentiel
+                reweighted = sharded.find_similar_recipes(recipe_id, combined_weights={"beta": 0.9}, top_n=20)
+                expected = sequential.find_similar_recipes(recipe_id, combined_weights={"beta": 0.9}, top_n=20)
+                np.testing.assert_allclose(reweighted['combined_distance'], expected['combined_distance'], atol=1e-5)
+            batch = sharded.find_similar_recipes_batch(recipe_ids, numeric_weights={"log_minutes": 3.0}, top_n=20)
+            for recipe_id in recipe_ids:
+                expected = sequential.find_similar_recipes(recipe_id, numeric_weights={"log_minutes": 3.0}, top_n=20)
+                np.testing.assert_allclose(batch[recipe_id]['combined_distance'], expected['combined_distance'],
+                                           atol=1e-5)
+            sharded.n_workers = 1
+            self.assertIsNone(sharded.scorer)
+
+    def test_minhash_prefilter(self):
+        """Test que le préfiltre MinHash ne retourne que des candidats LSH, triés, et suit les mises à jour."""
+        for mode in ("vocabulary", "hashing"):
+            finder = RecipeFinder(self.recipes, vectorizer_mode=mode, minhash_permutations=64, minhash_bands=32)
+            finder.preprocess()
+            recipe_id = self.recipes['id'].iloc[3]
+            row = finder.id_to_index.row(recipe_id)
+            candidates = set(self.recipes['id'].values[finder.index.minhash_candidates(row)])
+            self.assertGreaterEqual(len(candidates), 5)
+            result = finder.find_similar_recipes(recipe_id, top_n=5, prefilter=True)
+            self.assertTrue(set(result['id']) <= candidates)
+            self.assertTrue(result['combined_distance'].is_monotonic_increasing)
+            # Les distances des candidats sont les distances exactes
+            exact = finder.find_similar_recipes(recipe_id, top_n=len(self.recipes))
+            exact = exact.set_index('id')['combined_distance']
+            np.testing.assert_allclose(result['combined_distance'], exact[result['id']], atol=1e-5)
+
+            finder.delete_recipes(result['id'].iloc[:2])
+            self.assertFalse(set(result['id'].iloc[:2]) & set(finder.find_similar_recipes(
+                recipe_id, top_n=5, prefilter=True)['id']))
+            finder.compact()
+            self.assertEqual(len(finder.index.ingredient_minhash), len(finder.index))
+
+        with self.assertRaises(ValueError):
+            self.finder.find_similar_recipes(recipe_id, prefilter=True)
+
+    def test_filtered_search(self):
+        """Test que le filtre est appliqué avant la sélection des top_n, dans tous les chemins de recherche."""
+        recipe_filter = RecipeFilter(numeric_ranges={"log_minutes": (None, 0.0)},
+                                     required_ingredients=["garlic"], excluded_ingredients=["sugar"],
+                                     excluded_tags=["dessert"])
+        recipes = self.recipes.set_index('id')
+        eligible = recipes[(recipes['log_minutes'] <= 0.0)
+                           & recipes['ingredients'].str.contains("garlic")
+                           & ~recipes['ingredients'].str.contains("sugar")
+                           & ~recipes['tags'].str.contains("dessert")].index
+        recipe_id = self.recipes['id'].iloc[1]
+        expected_ids = set(eligible) - {recipe_id}
+        exact = self.finder.find_similar_recipes(recipe_id, top_n=len(self.recipes)).set_index('id')
+        expected = exact.loc[list(expected_ids), 'combined_distance'].sort_values()[:10]
+
+        for mode in ("vocabulary", "hashing"):
+            for n_workers in (1, 3):
+                finder = RecipeFinder(self.recipes, vectorizer_mode=mode, n_workers=n_workers)
+                if finder.scorer is not None:
+                    finder.scorer.min_shard_rows = 64
+                finder.preprocess()
+                result = finder.find_similar_recipes(recipe_id, top_n=10, recipe_filter=recipe_filter)
+                self.assertTrue(set(result['id']) <= expected_ids)
+                np.testing.assert_allclose(result['combined_distance'], expected.values, atol=1e-5)
+                batch = finder.find_similar_recipes_batch([recipe_id], top_n=10, recipe_filter=recipe_filter)
+                self.assertEqual(batch[recipe_id]['id'].tolist(), result['id'].tolist())
+
+        # Un filtre plus sélectif que top_n retourne toutes les recettes éligibles
+        result = self.finder.find_similar_recipes(recipe_id, top_n=len(self.recipes), recipe_filter=recipe_filter)
+        self.assertEqual(set(result['id']), expected_ids)
+        with self.assertRaises(ValueError):
+            RecipeFilter(numeric_ranges={"unknown": (0, 1)})
+
+    def test_filter_from_raw_ranges(self):
+        """Test qu'un intervalle en unités brutes (minutes) sélectionne les recettes de l'index normalisé."""
+        raw = self.recipes.copy()
+        raw['minutes'] = np.random.default_rng(1).integers(1, 120, size=len(raw))
+        raw['log_minutes'] = np.log(raw['minutes'])
+        raw['calories'] = raw['calories'] * 100 + 400
+        normalizer = Normalizer(NUMERIC_FEATURES).fit([raw])
+        finder = RecipeFinder(normalizer.transform(raw.copy()))
+        finder.preprocess()
+        recipe_filter = RecipeFilter.from_raw_ranges({"minutes": (None, 30), "calories": (300, None)}, normalizer)
+        eligible = set(raw.loc[(raw['minutes'] <= 30) & (raw['calories'] >= 300), 'id']) - {raw['id'].iloc[0]}
+        result = finder.find_similar_recipes(raw['id'].iloc[0], top_n=len(raw), recipe_filter=recipe_filter)
+        self.assertEqual(set(result['id']), eligible)
+        with self.assertRaises(ValueError):
+            RecipeFilter.from_raw_ranges({"minutes": (0, 30)}, normalizer)
+
+    def test_find_recipes_by_text(self):
+        """Test la recherche en texte libre : une requête égale aux textes d'une recette la place en tête."""
+        recipe = self.recipes.iloc[5]
+        query = {field: recipe[field] for field in ("name", "tags", "steps", "ingredients")}
+        for mode in ("vocabulary", "hashing"):
+            finder = RecipeFinder(self.recipes, vectorizer_mode=mode, query_preparator=dict)
+            finder.preprocess()
+            result = finder.find_recipes_by_text(query, top_n=5)
+            self.assertEqual(len(result), 5)
+            self.assertAlmostEqual(result['combined_distance'].iloc[0], 0.0, places=5)
+            self.assertIn(recipe['id'], result[result['combined_distance'] < 1e-5]['id'].tolist())
+            self.assertTrue(result['combined_distance'].is_monotonic_increasing)
+
+        # Une chaîne est appliquée à tous les champs ; le filtre est appliqué avant les top_n
+        finder = RecipeFinder(self.recipes, query_preparator=lambda q: dict.fromkeys(query, q))
+        finder.preprocess()
+        result = finder.find_recipes_by_text("garlic lemon quick", top_n=10,
+                                             recipe_filter=RecipeFilter(excluded_ingredients=["garlic"]))
+        self.assertEqual(len(result), 10)
+        self.assertFalse(result['ingredients'].str.contains("garlic").any())
+        with self.assertRaises(ValueError):
+            finder.find_recipes_by_text("   ")
+        with self.assertRaises(ValueError):
+            finder.find_recipes_by_text({"unknown": "garlic"})
+
+
+class TestResultCache(unittest.TestCase):
+    """Tests unitaires pour le cache de résultats."""
+
+    def test_byte_limit_and_ttl(self):
+        """Test l'éviction LRU par taille en octets et l'expiration des entrées."""
+        now = [0.0]
+        cache = ResultCache(max_bytes=2 * 100 * 8, ttl=10, clock=lambda: now[0])
+        for key in range(3):
+            cache.put(key, np.arange(100), np.zeros(100))
+        self.assertIsNone(cache.get(0))
+        self.assertIsNotNone(cache.get(2))
+        self.assertEqual(cache.stats()['bytes'], 1600)
+        now[0] = 11.0
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+
+class TestIdLookup(unittest.TestCase):
+    """Tests unitaires pour la correspondance identifiant -> ligne."""
+
+    def test_direct_and_sorted_lookups_agree(self):
+        """Test que l'adressage direct et la recherche dichotomique donnent les mêmes lignes."""
+        ids = np.array([12, 3, 40, 7, 25])
+        direct = IdLookup(ids)
+        sparse_ids = IdLookup(ids, max_direct_ratio=0)
+        self.assertTrue(direct.direct)
+        self.assertFalse(sparse_ids.direct)
+        queries = np.array([7, 8, 40, -1, 10 ** 9, 12])
+        expected = [3, -1, 2, -1, -1, 0]
+        self.assertEqual(direct.lookup(queries).tolist(), expected)
+        self.assertEqual(sparse_ids.lookup(queries).tolist(), expected)
+        self.assertIn(25, direct)
+        self.assertNotIn("25", direct)
+
+    def test_validation_and_updates(self):
+        """Test la validation groupée des identifiants, l'ajout et la suppression."""
+        lookup = IdLookup([5, 6, 9])
+        self.assertEqual(lookup.row(9), 2)
+        with self.assertRaises(ValueError):
+            lookup.rows_of([5, 11, 12])
+        with self.assertRaises(ValueError):
+            IdLookup([1, 2, 1])
+        for max_direct_ratio in (4, 0):                 # Adressage direct et recherche dichotomique
+            updated = IdLookup([5, 6, 9], max_direct_ratio=max_direct_ratio).with_added([11], [3]).without([6, 40])
+            self.assertEqual(updated.lookup([5, 6, 11]).tolist(), [0, -1, 3])
+            self.assertEqual(len(updated), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
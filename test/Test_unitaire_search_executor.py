@@ -0,0 +1,86 @@
+import threading
+import unittest
+import pandas as pd
+from src.FindingCloseRecipes.search_executor import RecipeSearchExecutor
+
+
+class TestRecipeSearchExecutor(unittest.TestCase):
+    """Tests unitaires pour l'exécution des recherches en arrière-plan."""
+
+    def setUp(self):
+        self.calls = []
+        self.release = threading.Event()
+
+        def slow_search(recipe_id):
+            self.calls.append(recipe_id)
+            self.release.wait(timeout=5)
+            if recipe_id < 0:
+                raise ValueError("Identifiant de recette introuvable.")
+            return pd.DataFrame({'id': [recipe_id + 1], 'combined_distance': [0.1]})
+
+        self.executor = RecipeSearchExecutor(slow_search, max_workers=1)
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown()
+
+    def test_identical_requests_are_coalesced(self):
+        """Test que deux sessions demandant la même recette partagent un seul calcul."""
+        first = self.executor.submit("session-a", 10)
+        second = self.executor.submit("session-b", 10)
+        self.assertIs(first, second)
+        self.assertEqual(self.executor.poll("session-a")[0], RecipeSearchExecutor.PENDING)
+        self.release.set()
+        first.result(timeout=5)
+        status, result = self.executor.poll("session-b")
+        self.assertEqual(status, RecipeSearchExecutor.DONE)
+        self.assertEqual(result['id'].tolist(), [11])
+        self.assertEqual(self.calls, [10])
+
+    def test_superseded_request_is_cancelled(self):
+        """Test qu'une requête remplacée avant son démarrage est annulée."""
+        self.executor.submit("busy", 1)          # Occupe l'unique thread
+        superseded = self.executor.submit("session-a", 2)
+        latest = self.executor.submit("session-a", 3)
+        self.assertTrue(superseded.cancelled())
+        self.release.set()
+        latest.result(timeout=5)
+        self.assertEqual(self.calls, [1, 3])
+
+    def test_shared_request_is_not_cancelled(self):
+        """Test qu'une requête encore attendue par une autre session n'est pas annulée."""
+        self.executor.submit("busy", 1)
+        shared = self.executor.submit("session-a", 2)
+        self.executor.submit("session-b", 2)
+        self.executor.submit("session-a", 3)
+        self.assertFalse(shared.cancelled())
+        self.release.set()
+        self.assertEqual(shared.result(timeout=5)['id'].tolist(), [3])
+
+    def test_errors_are_reported(self):
+        """Test qu'une erreur de recherche est retournée par poll."""
+        self.release.set()
+        self.executor.submit("session-a", -1).exception(timeout=5)
+        status, error = self.executor.poll("session-a")
+        self.assertEqual(status, RecipeSearchExecutor.ERROR)
+        self.assertIsInstance(error, ValueError)
+        self.assertEqual(self.executor.poll("unknown"), (None, None))
+
+    def test_sessions_are_bounded(self):
+        """Test que seules les sessions les plus récemment actives gardent leur recherche."""
+        executor = RecipeSearchExecutor(lambda recipe_id: pd.DataFrame({'id': [recipe_id]}), max_workers=1,
+                                        max_sessions=2)
+        try:
+            for session, recipe_id in (("session-a", 1), ("session-b", 2)):
+                executor.submit(session, recipe_id).result(timeout=5)
+            executor.poll("session-a")                      # session-a redevient la plus récente
+            executor.submit("session-c", 3).result(timeout=5)
+            self.assertEqual(executor.poll("session-b"), (None, None))
+            self.assertEqual(executor.poll("session-a")[0], RecipeSearchExecutor.DONE)
+            self.assertEqual(len(executor._sessions), 2)
+        finally:
+            executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.DataPreprocess.data_cleaning import DataCleaning
+from src.DataPreprocess.stage_profiler import StageProfiler
+
+
+class TestStageProfiler(unittest.TestCase):
+    """Tests unitaires pour le profileur des étapes du prétraitement."""
+
+    def setUp(self):
+        self.data = pd.DataFrame({"minutes": [0, 10, 50000, 30], "calories": [100.0, 20000.0, 300.0, 50.0]})
+
+    def test_records_rows_and_times(self):
+        """Test que chaque étape enregistre ses lignes en entrée et en sortie et ses temps."""
+        profiler = StageProfiler(trace_memory=True)
+        cleaner = DataCleaning(self.data)
+        result = profiler.run("cleaning.remove_long_recipes", cleaner, "remove_long_recipes", max_minutes=24 * 60)
+        self.assertIs(result, cleaner)
+        with profiler.stage("custom", rows_in=len(cleaner.data)) as stage:
+            cleaner.remove_high_calories_recipes(max_calories=10000)
+            stage.rows_out = len(cleaner.data)
+
+        stages = profiler.report()["stages"]
+        self.assertEqual([stage["stage"] for stage in stages], ["cleaning.remove_long_recipes", "custom"])
+        self.assertEqual((stages[0]["rows_in"], stages[0]["rows_out"]), (4, 3))
+        self.assertEqual((stages[1]["rows_in"], stages[1]["rows_out"]), (3, 2))
+        for stage in stages:
+            self.assertGreaterEqual(stage["wall_seconds"], 0)
+            self.assertGreaterEqual(stage["peak_traced_mb"], 0)
+            self.assertGreater(stage["peak_rss_mb"], 0)
+
+    def test_failed_stage_and_json_report(self):
+        """Test qu'une étape en échec est tout de même mesurée et que le rapport est sérialisable."""
+        profiler = StageProfiler()
+        with self.assertRaises(KeyError):
+            profiler.run("cleaning.replace_zero_minutes", DataCleaning(self.data[["calories"]]),
+                         "replace_zero_minutes")
+        self.assertEqual(len(profiler.records), 1)
+        self.assertIsNone(profiler.records[0].rows_out)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            profiler.save_report(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["stages"][0]["rows_in"], 4)
+        self.assertIn("cleaning.replace_zero_minutes", profiler.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import re
+import unittest
+import nltk
+from nltk.tokenize.destructive import NLTKWordTokenizer
+from src.DataPreprocess.tokenizers import regex_tokenize
+
+# Étapes de recettes représentatives : nombres, fractions, dimensions, contractions, ponctuation, guillemets
+SAMPLE_STEPS = [
+    "preheat oven to 350 degrees f. grease a 9x13-inch pan",
+    "in a large bowl , mix flour , sugar and 1/2 tsp salt ; don't overmix !",
+    "bake 25-30 minutes , or until a toothpick comes out clean ( about 1 hour at 3,000 ft )",
+    "it's best served warm... let it cool 10:00 minutes -- then slice",
+    "whisk eggs & milk until frothy ? add the cook's \"secret\" spice blend , 2 tbsp .",
+    "can't find fresh basil ? you cannot go wrong with dried : 1 1/2 teaspoons",
+    "stir in the 'chopped' onions , you're almost done ! serve with rock'n'roll sauce",
+    "gonna need 2 cups of broth ( low-sodium ) , i'll use chicken . season to taste",
+    "cook on high 4-6 hrs . crème fraîche , jalapeño & café au lait optional",
+    "cut into 1-inch cubes ; set aside . in a skillet , brown the meat 5 min",
+]
+
+
+def nltk_reference(text):
+    """Tokens de nltk.word_tokenize filtrés par str.isalnum, phrase par phrase (sans le modèle Punkt)."""
+    tokenizer = NLTKWordTokenizer()
+    sentences = re.split(r"(?<=[.?!])\s+|(?<=[.?!][\"')\]»”’])\s+", text)
+    return [token for sentence in sentences for token in tokenizer.tokenize(sentence) if token.isalnum()]
+
+
+def has_punkt():
+    try:
+        nltk.data.find("tokenizers/punkt_tab/english/")
+        return True
+    except LookupError:
+        return False
+
+
+class TestRegexTokenizer(unittest.TestCase):
+    """Tests unitaires pour le tokenizer par expression régulière."""
+
+    def test_matches_nltk_tokenizer(self):
+        """Test que les tokens alphanumériques sont ceux du tokenizer de NLTK, étape par étape et joints."""
+        for text in SAMPLE_STEPS + [" ".join(SAMPLE_STEPS)]:
+            with self.subTest(text=text):
+                self.assertEqual(regex_tokenize(text), nltk_reference(text))
+
+    def test_filtered_tokens(self):
+        """Test des tokens conservés : mots et nombres, contractions découpées, mots composés écartés."""
+        self.assertEqual(regex_tokenize("don't bake 1/2 of the 9x13-inch pan at 350 , it's 2 hrs."),
+                         ["do", "bake", "of", "the", "pan", "at", "350", "it", "2", "hrs"])
+        self.assertEqual(regex_tokenize("you cannot go wrong"), ["you", "can", "not", "go", "wrong"])
+        self.assertEqual(regex_tokenize(""), [])
+
+    @unittest.skipUnless(has_punkt(), "ressource NLTK 'punkt_tab' indisponible")
+    def test_matches_word_tokenize(self):
+        """Test de l'équivalence avec nltk.word_tokenize (découpage en phrases par le modèle Punkt)."""
+        for text in SAMPLE_STEPS:
+            with self.subTest(text=text):
+                expected = [token for token in nltk.word_tokenize(text) if token.isalnum()]
+                self.assertEqual(regex_tokenize(text), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
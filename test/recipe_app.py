@@ -1,8 +1,13 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 import ast
 import logging
-from typing import List, Optional
+import threading
+from typing import Iterable, List, Optional, Set, Tuple
+from src.FindingCloseRecipes.id_lookup import IdLookup
+from src.FindingCloseRecipes.minhash import MinHashLSH, MinHashIndex
+from src.monitoring.metrics import timed
 
 # Configurer les loggers
 logging.basicConfig(level=logging.DEBUG, filename='logs/debug.log', filemode='w',
@@ -12,10 +17,344 @@ error_handler = logging.FileHandler('logs/error.log')
 error_handler.setLevel(logging.ERROR)
 error_logger.addHandler(error_handler)
 
+# Poids du score de pertinence de la recherche classée : couverture TF-IDF des ingrédients sélectionnés,
+# peu d'ingrédients supplémentaires à acheter, note moyenne de la recette
+RANKING_WEIGHTS = {"coverage": 0.6, "extra": 0.25, "rating": 0.15}
+MAX_RATING = 5.0
+
 class IngredientDataError(Exception):
     """Exception personnalisée pour les erreurs liées aux données des ingrédients."""
     pass
 
+def parse_ingredients(recipe_ingredients: str) -> List[str]:
+    """Convertit la représentation texte d'une liste d'ingrédients en liste Python."""
+    try:
+        ingredients = ast.literal_eval(recipe_ingredients)
+    except (ValueError, SyntaxError) as e:
+        error_logger.error(f"Erreur lors de l'analyse des ingrédients : {e}")
+        return []
+    return list(ingredients) if isinstance(ingredients, (list, tuple, set)) else []
+
+class PantryIndex:
+    """
+    Index MinHash/LSH des « garde-manger » des recettes : l'ensemble des mots de leurs ingrédients
+    ("unsalted butter" donne {"unsalted", "butter"}), pour retrouver les recettes qui utilisent
+    à peu près les mêmes ingrédients (similarité de Jaccard estimée).
+    """
+
+    def __init__(self, ingredients_data: pd.DataFrame, lsh: Optional[MinHashLSH] = None):
+        """
+        Args:
+            ingredients_data (pd.DataFrame): Colonnes 'id' et 'ingredients' (listes au format texte).
+            lsh (MinHashLSH, optional): Paramètres des signatures. Par défaut, 128 permutations en 64 bandes
+                (candidats à partir d'une similarité d'environ 0.12).
+        """
+        self.lsh = lsh or MinHashLSH(n_permutations=128, n_bands=64)
+        ingredients_data = ingredients_data.drop_duplicates('id')
+        self.ids = ingredients_data['id'].to_numpy()
+        self.rows = IdLookup(self.ids)
+        pantries = [self.tokenize(parse_ingredients(ingredients)) for ingredients in ingredients_data['ingredients']]
+        self.index = MinHashIndex(self.lsh, self.lsh.signatures_from_sets(pantries))
+
+    @staticmethod
+    def tokenize(ingredients: Iterable[str]) -> Set[str]:
+        """Ensemble des mots (en minuscules) d'une liste d'ingrédients."""
+        return {word for ingredient in ingredients for word in str(ingredient).lower().split()}
+
+    def query(self, ingredients: Iterable[str], top_n: int = 10,
+              exclude_id: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retourne les identifiants des recettes au garde-manger le plus proche et leur similarité.
+
+        Args:
+            ingredients (Iterable[str]): Ingrédients du garde-manger requête.
+            top_n (int): Nombre de recettes à retourner.
+            exclude_id (int, optional): Recette à exclure (ex : la recette requête elle-même).
+        """
+        signature = self.lsh.signatures_from_sets([self.tokenize(ingredients)])[0]
+        exclude = None
+        if exclude_id is not None and exclude_id in self.rows:
+            exclude = self.rows.row(exclude_id)
+        rows, similarities = self.index.query(signature, top_n, exclude=exclude)
+        return self.ids[rows], similarities
+
+class IngredientBitmapIndex:
+    """
+    Bitmaps des ingrédients sur les lignes des recettes : pour chaque terme (ex : "butter"), un tableau
+    de bits compacté (`np.packbits`, 1 bit par recette) indiquant les recettes dont un ingrédient contient
+    le terme ("unsalted butter" contient "butter"). Les combinaisons (tous, au moins un, aucun, au moins k)
+    sont des opérations bit à bit vectorisées, et les comptes des popcounts.
+    Les bitmaps du vocabulaire sont construits à l'initialisation, ceux des autres termes à la première demande.
+    """
+
+    MODES = ("all", "any", "none", "at_least")
+
+    def __init__(self, ingredients_data: pd.DataFrame, vocabulary: Iterable[str] = ()):
+        """
+        Args:
+            ingredients_data (pd.DataFrame): Colonnes 'id' et 'ingredients' (listes au format texte).
+            vocabulary (Iterable[str]): Termes indexés immédiatement (ex : les ingrédients macro).
+        """
+        self.data = ingredients_data
+        self.ids = ingredients_data['id'].to_numpy()
+        self.n_rows = len(self.ids)
+        ingredient_lists = [parse_ingredients(ingredients) for ingredients in ingredients_data['ingredients']]
+        self.n_ingredients = np.fromiter(map(len, ingredient_lists), dtype=np.int32, count=self.n_rows)
+        # Ingrédients d'une recette joints par un séparateur absent des termes : une recherche
+        # de sous-chaîne ne peut pas chevaucher deux ingrédients
+        self._text = pd.Series(["\x00".join(map(str, ingredients)) for ingredients in ingredient_lists],
+                               dtype=object)
+        self._bitmaps = {}
+        self._lock = threading.Lock()
+        self._all = np.packbits(np.ones(self.n_rows, dtype=bool))
+        self.vocabulary = list(dict.fromkeys(vocabulary))
+        self._matrix = None
+        for term in self.vocabulary:
+            self.bitmap(term)
+
+    def bitmap(self, term: str) -> np.ndarray:
+        """Bitmap compacté des recettes dont un ingrédient contient `term`."""
+        with self._lock:
+            bitmap = self._bitmaps.get(term)
+        if bitmap is None:
+            bitmap = np.packbits(self._text.str.contains(term, regex=False).to_numpy(dtype=bool))
+            with self._lock:
+                self._bitmaps[term] = bitmap
+        return bitmap
+
+    @staticmethod
+    def count(bitmap: np.ndarray) -> int:
+        """Nombre de recettes d'un bitmap (popcount)."""
+        return int(np.bitwise_count(bitmap).sum(dtype=np.int64))
+
+    def match(self, terms: Iterable[str], mode: str = "all", min_matches: Optional[int] = None) -> np.ndarray:
+        """
+        Retourne le bitmap des recettes satisfaisant une condition sur des termes.
+
+        Args:
+            terms (Iterable[str]): Termes recherchés.
+            mode (str): 'all' (tous les termes), 'any' (au moins un), 'none' (aucun)
+                ou 'at_least' (au moins `min_matches` termes).
+            min_matches (int, optional): Nombre minimal de termes pour le mode 'at_least'.
+
+        Raises:
+            ValueError: Si le mode est inconnu ou si `min_matches` manque pour le mode 'at_least'.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode de filtrage inconnu : {mode} (valeurs possibles : {', '.join(self.MODES)})")
+        bitmaps = [self.bitmap(term) for term in dict.fromkeys(terms)]
+        if mode == "all":
+            return np.bitwise_and.reduce(np.stack([self._all] + bitmaps))
+        if mode == "at_least":
+            if min_matches is None:
+                raise ValueError("Le mode 'at_least' nécessite min_matches.")
+            if min_matches <= 0:
+                return self._all.copy()
+            if not bitmaps or min_matches > len(bitmaps):
+                return np.zeros_like(self._all)
+            # Nombre de termes présents par recette : somme des bits dépaquetés de chaque terme
+            matches = np.unpackbits(np.stack(bitmaps), axis=1, count=self.n_rows).sum(axis=0, dtype=np.int32)
+            return np.packbits(matches >= min_matches)
+        any_bitmap = np.bitwise_or.reduce(np.stack([np.zeros_like(self._all)] + bitmaps))
+        return any_bitmap if mode == "any" else self._all & ~any_bitmap
+
+    def rows(self, bitmap: np.ndarray) -> np.ndarray:
+        """Positions des recettes d'un bitmap, dans l'ordre des lignes."""
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.n_rows))
+
+    def facet_counts(self, terms: Iterable[str], within: Optional[np.ndarray] = None) -> dict:
+        """
+        Nombre de recettes contenant chaque terme, parmi les recettes du bitmap `within` (par défaut : toutes).
+        """
+        within = self._all if within is None else within
+        return {term: self.count(self.bitmap(term) & within) for term in terms}
+
+    def _term_matrix(self, terms: List[str]):
+        """Matrice creuse binaire (CSC) recettes x termes, construite à partir des bitmaps."""
+        # Import local : SciPy n'est chargé qu'à la première recherche classée
+        from scipy import sparse
+        columns = [np.flatnonzero(np.unpackbits(self.bitmap(term), count=self.n_rows)) for term in terms]
+        indptr = np.concatenate([[0], np.cumsum([len(rows) for rows in columns])])
+        indices = np.concatenate(columns) if columns else np.empty(0, dtype=np.int64)
+        return sparse.csc_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr),
+                                 shape=(self.n_rows, len(terms)))
+
+    def term_matrix(self, terms: Iterable[str] = ()):
+        """
+        Retourne la matrice creuse recettes x termes du vocabulaire, pré-construite au premier appel,
+        complétée par les colonnes des termes hors vocabulaire, et la liste des termes des colonnes.
+        """
+        with self._lock:
+            matrix = self._matrix
+        if matrix is None:
+            matrix = self._term_matrix(self.vocabulary)
+            with self._lock:
+                self._matrix = matrix
+        extra_terms = [term for term in dict.fromkeys(terms) if term not in self.vocabulary]
+        if not extra_terms:
+            return matrix, self.vocabulary
+        from scipy import sparse
+        return sparse.hstack([matrix, self._term_matrix(extra_terms)], format="csc"), self.vocabulary + extra_terms
+
+    def relevance(self, terms: Iterable[str], rows: np.ndarray, ratings: Optional[np.ndarray] = None,
+                  weights: Optional[dict] = None) -> np.ndarray:
+        """
+        Score de pertinence des recettes candidates pour une sélection d'ingrédients (plus grand = meilleur).
+
+        Le score combine (voir RANKING_WEIGHTS) :
+        - la couverture TF-IDF de la sélection : produit de la matrice creuse recettes x termes par le vecteur
+          creux des IDF des termes sélectionnés, normalisé (1 si la recette contient tous les termes) ;
+          un ingrédient rare compte plus qu'un ingrédient présent partout (sel, eau...) ;
+        - les ingrédients de la recette hors sélection (à acheter en plus) : 1 / (1 + leur nombre) ;
+        - la note moyenne de la recette, ramenée entre 0 et 1 (0 si inconnue).
+
+        Args:
+            terms (Iterable[str]): Ingrédients sélectionnés.
+            rows (np.ndarray): Positions des recettes candidates.
+            ratings (np.ndarray, optional): Notes moyennes des recettes candidates (NaN si inconnues).
+            weights (dict, optional): Poids des composantes. Par défaut, RANKING_WEIGHTS.
+        """
+        weights = weights or RANKING_WEIGHTS
+        terms = list(dict.fromkeys(terms))
+        rows = np.asarray(rows, dtype=np.int64)
+        matrix, columns = self.term_matrix(terms)
+        # Le vecteur requête n'a de valeurs non nulles que sur les termes sélectionnés :
+        # le produit se limite aux colonnes correspondantes des recettes candidates
+        selected = matrix[:, [columns.index(term) for term in terms]]
+        candidates = selected.tocsr()[rows]
+        # IDF lissé (comme TfidfVectorizer) calculé sur toutes les recettes
+        idf = np.log((1 + self.n_rows) / (1 + np.diff(selected.indptr))) + 1
+        coverage = candidates @ idf / idf.sum() if terms else np.zeros(len(rows))
+        matched = np.diff(candidates.indptr)
+        extra = np.maximum(self.n_ingredients[rows] - matched, 0)
+        rating = np.zeros(len(rows)) if ratings is None else np.nan_to_num(np.asarray(ratings, dtype=float))
+        rating = rating / MAX_RATING
+        return weights["coverage"] * coverage + weights["extra"] / (1 + extra) + weights["rating"] * rating
+
+
+class RecipeSortOrders:
+    """
+    Ordres de tri des recettes pré-calculés une fois : pour chaque colonne triable et chaque sens,
+    le rang de chaque recette dans la permutation triée (les valeurs manquantes en dernier).
+    Trier un ensemble de résultats revient alors à trier les rangs entiers de ses recettes.
+    """
+
+    COLUMNS = ("average_rating", "minutes")
+
+    def __init__(self, recipes: pd.DataFrame):
+        """
+        Args:
+            recipes (pd.DataFrame): Recettes (colonne 'id' et colonnes triables), la première ligne
+                d'un identifiant en double faisant foi.
+        """
+        recipes = recipes.drop_duplicates('id')
+        self.rows = IdLookup(recipes['id'].to_numpy())
+        self.ranks = {}
+        self.values = {}
+        for column in self.COLUMNS:
+            if column not in recipes.columns:
+                continue
+            values = pd.to_numeric(recipes[column], errors='coerce').to_numpy(dtype=float)
+            # Valeur supplémentaire en dernière position : NaN pour les identifiants absents (ligne -1)
+            self.values[column] = np.append(values, np.nan)
+            for ascending in (True, False):
+                order = np.argsort(values if ascending else -values, kind='stable')
+                # Rang supplémentaire en dernière position : celui des identifiants absents (ligne -1)
+                ranks = np.empty(len(order) + 1, dtype=np.int64)
+                ranks[order] = np.arange(len(order))
+                ranks[-1] = len(order)
+                self.ranks[(column, ascending)] = ranks
+
+    def order(self, recipe_ids: np.ndarray, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Permutation triant un lot d'identifiants de recettes selon une colonne (tri stable).
+
+        Raises:
+            ValueError: Si la colonne n'est pas triable.
+        """
+        if (column, ascending) not in self.ranks:
+            raise ValueError(f"Colonne de tri indisponible : {column}")
+        return np.argsort(self.ranks[(column, ascending)][self.rows.lookup(recipe_ids)], kind='stable')
+
+    def values_of(self, recipe_ids: np.ndarray, column: str) -> np.ndarray:
+        """Valeurs d'une colonne triable pour un lot d'identifiants (NaN si inconnues)."""
+        if column not in self.values:
+            return np.full(len(recipe_ids), np.nan)
+        return self.values[column][self.rows.lookup(recipe_ids)]
+
+class RecipeResultCursor:
+    """
+    Curseur sur les résultats d'un filtrage : seules les positions des lignes d'ingrédients
+    correspondantes sont conservées ; une page n'est matérialisée (jointure avec les recettes) qu'à la demande.
+    Avec des scores (recherche classée), les résultats ne sont pas triés entièrement : chaque page
+    sélectionne les meilleurs scores nécessaires (sélection partielle top-k).
+    """
+
+    def __init__(self, recipes: pd.DataFrame, ingredients_data: pd.DataFrame, rows: np.ndarray,
+                 page_size: int = 10, ordered: bool = False, scores: Optional[np.ndarray] = None):
+        """
+        Args:
+            recipes (pd.DataFrame): Recettes (colonne 'id').
+            ingredients_data (pd.DataFrame): Colonnes 'id' et 'ingredients' indexées par `rows`.
+            rows (np.ndarray): Positions des lignes d'ingrédients correspondantes, dans l'ordre des résultats.
+            page_size (int): Nombre de résultats par page.
+            ordered (bool): Si True, les lignes d'une page suivent l'ordre de `rows` (résultats triés) ;
+                sinon, celui des recettes.
+            scores (np.ndarray, optional): Score de pertinence de chaque ligne de `rows` : les résultats sont
+                alors classés par score décroissant (ordre des données en cas d'égalité), dans la colonne 'relevance'.
+        """
+        if page_size < 1:
+            raise ValueError("La taille de page doit être positive.")
+        self.recipes = recipes
+        self.ingredients_data = ingredients_data
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.page_size = page_size
+        self.ordered = ordered or scores is not None
+        self.scores = None if scores is None else np.asarray(scores, dtype=float)
+
+    @property
+    def total(self) -> int:
+        """Nombre total de résultats."""
+        return len(self.rows)
+
+    @property
+    def n_pages(self) -> int:
+        """Nombre de pages (au moins 1)."""
+        return max(1, -(-self.total // self.page_size))
+
+    def _page_positions(self, number: int) -> np.ndarray:
+        """Positions (dans `rows`) des résultats d'une page."""
+        start, end = number * self.page_size, min((number + 1) * self.page_size, self.total)
+        if start >= end:
+            return np.empty(0, dtype=np.int64)
+        if self.scores is None:
+            return np.arange(start, end)
+        # Sélection partielle des `end` meilleurs scores, seuls triés (score décroissant, puis ordre des données)
+        best = np.argpartition(-self.scores, end - 1)[:end] if end < self.total else np.arange(self.total)
+        best = best[np.lexsort((best, -self.scores[best]))]
+        return best[start:end]
+
+    def page(self, number: int = 0) -> pd.DataFrame:
+        """
+        Matérialise une page de résultats : les recettes de la page, avec leurs ingrédients.
+
+        Args:
+            number (int): Numéro de la page (à partir de 0). Une page au-delà de la dernière est vide.
+        """
+        positions = self._page_positions(number)
+        page_ingredients = self.ingredients_data.iloc[self.rows[positions]]
+        if page_ingredients.empty:
+            return pd.DataFrame()
+        if self.scores is not None:
+            page_ingredients = page_ingredients.assign(relevance=self.scores[positions])
+        page = self.recipes[self.recipes['id'].isin(page_ingredients['id'])]
+        page = pd.merge(page, page_ingredients, on='id', how='left')
+        if self.ordered:
+            position = pd.Series(np.arange(len(page_ingredients)), index=page_ingredients['id'].to_numpy())
+            position = position[~position.index.duplicated()]
+            page = page.iloc[np.argsort(page['id'].map(position).to_numpy(), kind='stable')].reset_index(drop=True)
+        return page
+
 class RecipeApp:
     def __init__(self):
         """Initialise les données de l'application de recettes."""
@@ -31,9 +370,13 @@ class RecipeApp:
         self.file_part2: str = 'data/id_ingredients_up_to_537716.csv'
         self.main_file: str = 'data/base_light_V3.csv'
         self.recipes_clean: pd.DataFrame = self.load_main_data()
+        self.pantry_index: Optional[PantryIndex] = None
+        self.ingredient_index: Optional[IngredientBitmapIndex] = None
+        self.sort_orders: Optional[RecipeSortOrders] = None
 
     @staticmethod
     @st.cache_data
+    @timed("app_data_load_seconds", dataset="recipes")
     def load_main_data() -> pd.DataFrame:
         """Charge les données principales depuis base_light_V3."""
         try:
@@ -42,6 +385,7 @@ class RecipeApp:
             error_logger.error(f"Erreur lors du chargement des données principales : {e}")
             raise IngredientDataError("Impossible de charger les données principales.")
 
+    @timed("app_data_load_seconds", dataset="ingredients")
     def get_ingredients_data(self) -> pd.DataFrame:
         """Charge et combine les données des deux fichiers d'ingrédients."""
         try:
@@ -52,54 +396,199 @@ class RecipeApp:
             error_logger.error(f"Erreur lors du chargement des données des ingrédients : {e}")
             raise IngredientDataError("Erreur lors du chargement des fichiers d'ingrédients.")
 
-    def filter_recipes(self, selected_ingredients: List[str]) -> pd.DataFrame:
+    @staticmethod
+    @st.cache_resource(show_spinner="Indexation des ingrédients...")
+    def load_ingredient_index(_app: "RecipeApp", file_part1: str, file_part2: str) -> IngredientBitmapIndex:
+        """Construit les bitmaps des ingrédients une seule fois par processus (par couple de fichiers)."""
+        return IngredientBitmapIndex(_app.get_ingredients_data(), vocabulary=_app.ingredients_macro)
+
+    def get_ingredient_index(self) -> IngredientBitmapIndex:
+        """Retourne les bitmaps des ingrédients, construits au premier appel."""
+        if self.ingredient_index is None:
+            self.ingredient_index = self.load_ingredient_index(self, self.file_part1, self.file_part2)
+        return self.ingredient_index
+
+    @staticmethod
+    @st.cache_resource
+    def load_sort_orders(_app: "RecipeApp", main_file: str) -> RecipeSortOrders:
+        """Pré-calcule les ordres de tri des recettes une seule fois par processus."""
+        return RecipeSortOrders(_app.recipes_clean)
+
+    def get_sort_orders(self) -> RecipeSortOrders:
+        """Retourne les ordres de tri des recettes, calculés au premier appel."""
+        if self.sort_orders is None:
+            self.sort_orders = self.load_sort_orders(self, self.main_file)
+        return self.sort_orders
+
+    @timed("app_search_recipes_seconds")
+    def search_recipes(self, selected_ingredients: List[str], mode: str = "all", min_matches: Optional[int] = None,
+                       sort_by: Optional[str] = None, ascending: bool = True,
+                       page_size: int = 10) -> RecipeResultCursor:
         """
-        Filtre les recettes contenant tous les ingrédients sélectionnés
-        (recherche partielle sur les noms d'ingrédients).
+        Filtre les recettes selon les ingrédients sélectionnés (recherche partielle sur les noms
+        d'ingrédients), par combinaison des bitmaps des ingrédients, et retourne un curseur paginé.
 
         Args:
             selected_ingredients (List[str]): Liste des ingrédients sélectionnés.
+            mode (str): 'all' (tous les ingrédients, par défaut), 'any' (au moins un), 'none' (aucun)
+                ou 'at_least' (au moins `min_matches` ingrédients).
+            min_matches (int, optional): Nombre minimal d'ingrédients pour le mode 'at_least'.
+            sort_by (str, optional): Colonne de tri ('average_rating' ou 'minutes'), ou 'relevance' : classement
+                par pertinence (couverture TF-IDF des ingrédients sélectionnés, peu d'ingrédients en plus,
+                note moyenne ; voir `IngredientBitmapIndex.relevance`). Par défaut, l'ordre des données.
+            ascending (bool): Sens du tri (ignoré pour 'relevance' : meilleurs scores en premier).
+            page_size (int): Nombre de recettes par page.
 
         Returns:
-            pd.DataFrame: Recettes filtrées correspondant aux critères.
+            RecipeResultCursor: Curseur donnant le nombre total de résultats et les pages à la demande.
         """
         if not selected_ingredients:
-            return pd.DataFrame()
+            return RecipeResultCursor(self.recipes_clean, pd.DataFrame(columns=['id', 'ingredients']),
+                                      np.empty(0, dtype=np.int64), page_size)
 
-        ingredients_data = self.get_ingredients_data()
+        index = self.get_ingredient_index()
+        rows = index.rows(index.match(selected_ingredients, mode, min_matches))
+        if sort_by == "relevance":
+            ratings = self.get_sort_orders().values_of(index.ids[rows], "average_rating")
+            scores = index.relevance(selected_ingredients, rows, ratings)
+            return RecipeResultCursor(self.recipes_clean, index.data, rows, page_size, scores=scores)
+        if sort_by is not None:
+            rows = rows[self.get_sort_orders().order(index.ids[rows], sort_by, ascending)]
+        return RecipeResultCursor(self.recipes_clean, index.data, rows, page_size, ordered=sort_by is not None)
 
-        def contains_all_selected_ingredients(recipe_ingredients: str) -> bool:
-            """Vérifie si les ingrédients de la recette contiennent tous les ingrédients sélectionnés."""
-            try:
-                recipe_ingredients_set = set(ast.literal_eval(recipe_ingredients))
-                return all(
-                    any(selected in ingredient for ingredient in recipe_ingredients_set)
-                    for selected in selected_ingredients
-                )
-            except (ValueError, SyntaxError) as e:
-                error_logger.error(f"Erreur lors de l'analyse des ingrédients : {e}")
-                return False
+    @timed("app_filter_recipes_seconds")
+    def filter_recipes(self, selected_ingredients: List[str], mode: str = "all",
+                       min_matches: Optional[int] = None) -> pd.DataFrame:
+        """
+        Filtre les recettes selon les ingrédients sélectionnés et retourne la première page
+        de 10 résultats (voir `search_recipes`).
+
+        Args:
+            selected_ingredients (List[str]): Liste des ingrédients sélectionnés.
+            mode (str): 'all' (tous les ingrédients, par défaut), 'any' (au moins un), 'none' (aucun)
+                ou 'at_least' (au moins `min_matches` ingrédients).
+            min_matches (int, optional): Nombre minimal d'ingrédients pour le mode 'at_least'.
+
+        Returns:
+            pd.DataFrame: Recettes filtrées correspondant aux critères.
+        """
+        return self.search_recipes(selected_ingredients, mode, min_matches).page(0)
+
+    @staticmethod
+    @st.cache_resource(show_spinner="Indexation des ingrédients...")
+    def load_pantry_index(_app: "RecipeApp", file_part1: str, file_part2: str) -> PantryIndex:
+        """Construit l'index des garde-manger une seule fois par processus (par couple de fichiers)."""
+        return PantryIndex(_app.get_ingredients_data())
+
+    def get_pantry_index(self) -> PantryIndex:
+        """Retourne l'index des garde-manger, construit au premier appel."""
+        if self.pantry_index is None:
+            self.pantry_index = self.load_pantry_index(self, self.file_part1, self.file_part2)
+        return self.pantry_index
 
-        filtered_ingredients = ingredients_data[
-            ingredients_data['ingredients'].apply(contains_all_selected_ingredients)
-        ]
+    def similar_pantry_recipes(self, ingredients: List[str], top_n: int = 10,
+                               exclude_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Trouve les recettes dont les ingrédients ressemblent le plus à un garde-manger
+        (similarité de Jaccard estimée par MinHash, candidats obtenus par LSH).
+
+        Args:
+            ingredients (List[str]): Ingrédients du garde-manger.
+            top_n (int): Nombre de recettes à retourner.
+            exclude_id (int, optional): Recette à exclure des résultats.
 
-        filtered_ids = filtered_ingredients['id'].head(10)
-        filtered_recipes = self.recipes_clean[self.recipes_clean['id'].isin(filtered_ids)]
-        filtered_recipes = pd.merge(filtered_recipes, filtered_ingredients, on='id', how='left')
-        return filtered_recipes
+        Returns:
+            pd.DataFrame: Recettes triées par similarité décroissante (colonne 'pantry_similarity').
+        """
+        if not ingredients:
+            return pd.DataFrame()
+        ids, similarities = self.get_pantry_index().query(ingredients, top_n, exclude_id)
+        scores = pd.DataFrame({'id': ids, 'pantry_similarity': similarities})
+        return pd.merge(scores, self.recipes_clean, on='id', how='inner')
+
+    def display_similar_pantry(self, recipe_ingredients: str, recipe_id: int):
+        """Affiche les recettes au garde-manger similaire à celui de la recette sélectionnée."""
+        try:
+            similar = self.similar_pantry_recipes(parse_ingredients(recipe_ingredients), exclude_id=recipe_id)
+            if not similar.empty:
+                st.subheader("Recettes avec un garde-manger similaire :")
+                columns = [column for column in ['id', 'name', 'pantry_similarity'] if column in similar.columns]
+                st.dataframe(similar[columns], use_container_width=True)
+        except Exception as e:
+            error_logger.error(f"Erreur lors de la recherche de garde-manger similaires : {e}")
+            st.warning("Impossible de trouver des recettes au garde-manger similaire.")
+
+    def ingredient_facet_counts(self, selected_ingredients: List[str], mode: str = "all",
+                                min_matches: Optional[int] = None) -> dict:
+        """
+        Nombre de recettes contenant chaque ingrédient macro parmi les recettes de la sélection courante
+        (toutes les recettes si aucun ingrédient n'est sélectionné).
+        """
+        index = self.get_ingredient_index()
+        within = index.match(selected_ingredients, mode, min_matches) if selected_ingredients else None
+        return index.facet_counts(self.ingredients_macro, within)
 
     def display_macro_ingredients_menu(self) -> List[str]:
-        """Affiche un menu déroulant pour choisir plusieurs ingrédients macro."""
+        """
+        Affiche un menu déroulant pour choisir plusieurs ingrédients macro, avec à côté de chaque
+        ingrédient le nombre de recettes qui le contiennent parmi les résultats de la sélection courante.
+        """
+        try:
+            counts = self.ingredient_facet_counts(
+                st.session_state.get("macro_ingredients", []),
+                st.session_state.get("ingredient_filter_mode", "all"),
+                st.session_state.get("ingredient_min_matches"),
+            )
+        except (IngredientDataError, ValueError) as e:
+            error_logger.error(f"Erreur lors du calcul des comptes des ingrédients : {e}")
+            counts = {}
         return st.multiselect(
             "Sélectionnez les ingrédients parmi la liste triée :",
-            options=self.ingredients_macro
+            options=self.ingredients_macro,
+            format_func=lambda ingredient: f"{ingredient} ({counts[ingredient]})" if ingredient in counts else ingredient,
+            key="macro_ingredients"
         )
 
-    def display_filtered_recipes(self, selected_ingredients: List[str]):
-        """Affiche les recettes filtrées en fonction des ingrédients sélectionnés."""
+    def display_filter_mode_menu(self, n_selected: int) -> Tuple[str, Optional[int]]:
+        """
+        Affiche le choix de la combinaison des ingrédients sélectionnés.
+
+        Args:
+            n_selected (int): Nombre d'ingrédients sélectionnés (borne du curseur « au moins k »).
+
+        Returns:
+            Tuple[str, Optional[int]]: Le mode de filtrage et, pour le mode 'at_least', le nombre minimal d'ingrédients.
+        """
+        labels = {"all": "Tous", "any": "Au moins un", "none": "Aucun", "at_least": "Au moins k"}
+        mode = st.radio("Recettes contenant :", options=list(labels), format_func=labels.get,
+                        horizontal=True, key="ingredient_filter_mode")
+        min_matches = None
+        if mode == "at_least":
+            if n_selected < 2:
+                # Curseur impossible (min == max) : k vaut le seul nombre possible
+                return mode, max(n_selected, 1)
+            # Valeur initiale 1 ; ingrédients désélectionnés : la valeur mémorisée reste dans les bornes du curseur
+            st.session_state["ingredient_min_matches"] = min(st.session_state.get("ingredient_min_matches", 1),
+                                                             n_selected)
+            min_matches = st.slider("Nombre minimal d'ingrédients (k)", min_value=1,
+                                    max_value=n_selected, key="ingredient_min_matches")
+        return mode, min_matches
+
+    def display_filtered_recipes(self, selected_ingredients: List[str], mode: str = "all",
+                                 min_matches: Optional[int] = None):
+        """
+        Affiche les recettes filtrées en fonction des ingrédients sélectionnés et du mode de filtrage,
+        page par page : seule la page affichée est matérialisée et mise en forme.
+        """
         try:
-            filtered_recipes = self.filter_recipes(selected_ingredients)
+            sort_by, ascending = self.display_sort_menu()
+            cursor = self.search_recipes(selected_ingredients, mode, min_matches, sort_by, ascending)
+            filtered_recipes = pd.DataFrame()
+            if cursor.total:
+                st.caption(f"{cursor.total} recettes trouvées")
+                page_number = st.number_input("Page", min_value=1, max_value=cursor.n_pages, value=1, step=1,
+                                              help=f"{cursor.n_pages} pages de {cursor.page_size} recettes")
+                filtered_recipes = cursor.page(int(page_number) - 1)
 
             if not filtered_recipes.empty:
                 info_options = ['id', 'name', 'contributor_id', 'steps_category', 'palmarès', 'ingredients']
@@ -126,6 +615,24 @@ class RecipeApp:
             error_logger.error(f"Erreur lors de l'affichage des recettes filtrées : {e}")
             st.error("Une erreur s'est produite lors de l'affichage des recettes.")
 
+    def display_sort_menu(self) -> Tuple[Optional[str], bool]:
+        """
+        Affiche le choix du tri des résultats.
+
+        Returns:
+            Tuple[Optional[str], bool]: La colonne de tri (None : ordre des données) et le sens du tri.
+        """
+        labels = {None: "Aucun", "relevance": "Pertinence", "average_rating": "Note moyenne",
+                  "minutes": "Temps de préparation"}
+        sort_by = st.selectbox("Trier par :", options=list(labels), format_func=labels.get, key="recipe_sort_by")
+        ascending = True
+        if sort_by in RecipeSortOrders.COLUMNS:
+            # Par défaut : les mieux notées et les plus rapides en premier
+            ascending = st.radio("Ordre :", options=[sort_by == "minutes", sort_by != "minutes"],
+                                 format_func=lambda value: "Croissant" if value else "Décroissant",
+                                 horizontal=True, key=f"recipe_sort_ascending_{sort_by}")
+        return sort_by, ascending
+
     def display_recipe_details(self, filtered_recipes: pd.DataFrame, selected_info: List[str]):
         """
         Affiche les détails d'une recette sélectionnée par ID.
@@ -146,11 +653,15 @@ class RecipeApp:
             use_container_width=True
         )
 
+        if not selected_recipe_data.empty and 'ingredients' in selected_recipe_data.columns:
+            self.display_similar_pantry(selected_recipe_data['ingredients'].iloc[0], selected_recipe_id)
+
     def run(self):
         """Exécute l'application Streamlit."""
         st.title("Qu'est ce que tu as dans ton frigo ?")
         selected_ingredients = self.display_macro_ingredients_menu()
-        self.display_filtered_recipes(selected_ingredients)
+        mode, min_matches = self.display_filter_mode_menu(len(selected_ingredients))
+        self.display_filtered_recipes(selected_ingredients, mode, min_matches)
 
 if __name__ == "__main__":
     try: